@@ -0,0 +1,78 @@
+"""Scoring throughput of arena worker processes versus one in-process manager
+
+Every arena applies the same synthetic hit load at once. With ArenaManager
+all arenas share one interpreter; with ArenaWorkerPool each arena scores in
+its own process, so throughput should grow with the number of cores.
+
+Run from the repository root:
+    python -m benchmarks.bench_arena_pool
+"""
+import argparse
+import os
+import time
+
+from src.models.arena_manager import ArenaManager
+from src.models.arena_pool import ArenaWorkerPool, _synthetic_load
+from benchmarks.common import make_teams, print_table
+
+
+def run_in_process(arenas: int, hits: int, players: int) -> float:
+    """Hits/s with every arena in one ArenaManager"""
+    manager = ArenaManager()
+    manager.on_error = lambda message: None
+    for arena_id in range(1, arenas + 1):
+        red_team, green_team = make_teams(players, arena_id)
+        manager.add_arena(arena_id, red_team, green_team, rx_port=0)
+        manager.start_game(arena_id)
+    begin = time.perf_counter()
+    applied = 0
+    for arena in manager.arenas.values():
+        _synthetic_load(arena, hits, arena.arena_id)
+        applied += arena.events
+    elapsed = time.perf_counter() - begin
+    manager.stop()
+    return applied / elapsed
+
+
+def run_pool(arenas: int, hits: int, players: int) -> float:
+    """Hits/s with one worker process per arena, all loaded at once"""
+    pool = ArenaWorkerPool()
+    for arena_id in range(1, arenas + 1):
+        red_team, green_team = make_teams(players, arena_id)
+        pool.add_arena(arena_id, red_team, green_team)
+        pool.start_game(arena_id)
+    pool.poll(0.1)
+
+    begin = time.perf_counter()
+    for arena_id in pool.workers:
+        pool.run_synthetic_load(arena_id, hits, arena_id)
+    while len(pool.load_results) < arenas:
+        pool.poll(0.05)
+    elapsed = time.perf_counter() - begin
+    applied = sum(count for count, _ in pool.load_results.values())
+    pool.stop()
+    return applied / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Arena worker pool scaling benchmark')
+    parser.add_argument('--arenas', type=int, nargs='+', default=[1, 2, 4, 8, 16], help='Arena counts to run')
+    parser.add_argument('--hits', type=int, default=100000, help='Hits applied per arena')
+    parser.add_argument('--players', type=int, default=30, help='Players per arena')
+    args = parser.parse_args()
+
+    rows = []
+    pool_base = None
+    for count in args.arenas:
+        in_process = run_in_process(count, args.hits, args.players)
+        pooled = run_pool(count, args.hits, args.players)
+        if pool_base is None:
+            pool_base = pooled / count
+        rows.append([count, f"{in_process:.0f}", f"{pooled:.0f}", f"{pooled / pool_base:.2f}x"])
+
+    print_table(f"Scoring throughput, hits/s ({os.cpu_count()} cores)",
+                ['arenas', 'in-process', 'worker pool', 'pool speedup'], rows)
+
+
+if __name__ == "__main__":
+    main()
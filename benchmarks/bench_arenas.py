@@ -0,0 +1,114 @@
+"""Per-arena latency with several arenas hosted by one ArenaManager
+
+A separate process sends timestamped v2 hits to every arena at the same
+per-arena rate. Latency is measured from the sender's timestamp to the hit
+being applied to the arena's GameModel, and should stay flat as arenas are
+added. Both routing modes are covered: one rx port per arena, and one shared
+port routed by the arena ID in the v2 flags byte.
+
+Run from the repository root:
+    python -m benchmarks.bench_arenas
+"""
+import argparse
+import multiprocessing
+import socket
+import time
+from statistics import quantiles
+
+from src.models.arena_manager import ArenaManager
+from src.models.game_model import GameSettings
+from src.models.protocol import OP_PLAYER_HIT, now_us, pack_v2
+from benchmarks.common import make_teams, print_table
+
+
+def _send(targets, rate: int, duration: float, players: int):
+    """Send hits to each (port, arena_id) target at `rate` packets/s per arena (child process)"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    red_ids = [1000 + i for i in range(0, players, 2)]
+    green_ids = [1000 + i for i in range(1, players, 2)]
+    seq = {}
+    total = int(rate * duration)
+    start = time.perf_counter()
+    for i in range(total):
+        target_time = start + i / rate
+        while time.perf_counter() < target_time:
+            pass
+        shooter = red_ids[i % len(red_ids)]
+        target = green_ids[(i // 3) % len(green_ids)]
+        for port, arena_id in targets:
+            key = (arena_id, shooter)
+            seq[key] = seq.get(key, -1) + 1
+            sock.sendto(pack_v2(OP_PLAYER_HIT, shooter, target, seq[key], now_us(), arena=arena_id),
+                        ('127.0.0.1', port))
+    sock.close()
+
+
+def run(arenas: int, shared: bool, rate: int, duration: float, players: int):
+    """Return per-arena (sent, applied, p50 us, p99 us) for one scenario"""
+    manager = ArenaManager(shared_port=0 if shared else None)
+    latencies = {}
+
+    def on_applied(arena, events, sounds):
+        now = now_us()
+        samples = latencies[arena.arena_id]
+        for event in events:
+            samples.append(now - event.device_ts)
+
+    manager.on_applied = on_applied
+    manager.on_error = lambda message: None
+    targets = []
+    for arena_id in range(1, arenas + 1):
+        red_team, green_team = make_teams(players, arena_id)
+        arena = manager.add_arena(arena_id, red_team, green_team, rx_port=None if shared else 0,
+                                  settings=GameSettings(game_duration=int(duration) + 60))
+        latencies[arena_id] = []
+        port = manager.shared_sock.getsockname()[1] if shared else arena.rx_port
+        targets.append((port, arena_id))
+        manager.start_game(arena_id)
+    manager.start()
+
+    sender = multiprocessing.Process(target=_send, args=(targets, rate, duration, players))
+    sender.start()
+    sender.join()
+    time.sleep(0.3)
+    manager.stop()
+
+    sent = int(rate * duration)
+    results = []
+    for arena_id in sorted(latencies):
+        samples = latencies[arena_id]
+        if len(samples) >= 2:
+            cuts = quantiles(samples, n=100)
+            results.append((sent, len(samples), cuts[49], cuts[98]))
+        else:
+            results.append((sent, len(samples), 0, 0))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Multi-arena latency benchmark')
+    parser.add_argument('--arenas', type=int, nargs='+', default=[1, 2, 4, 8], help='Arena counts to run')
+    parser.add_argument('--rate', type=int, default=500, help='Hits per second per arena')
+    parser.add_argument('--duration', type=float, default=3.0, help='Seconds of traffic per scenario')
+    parser.add_argument('--players', type=int, default=30, help='Players per arena')
+    args = parser.parse_args()
+
+    rows = []
+    for shared in (False, True):
+        for count in args.arenas:
+            results = run(count, shared, args.rate, args.duration, args.players)
+            sent = sum(r[0] for r in results)
+            applied = sum(r[1] for r in results)
+            p50s = [r[2] for r in results]
+            p99s = [r[3] for r in results]
+            rows.append([
+                'arena ID' if shared else 'port', count, args.rate, sent, applied,
+                f"{min(p50s):.0f}-{max(p50s):.0f}", f"{min(p99s):.0f}-{max(p99s):.0f}",
+            ])
+
+    print_table("ArenaManager per-arena latency (us, min-max across arenas)",
+                ['routing', 'arenas', 'hits/s/arena', 'sent', 'applied', 'p50', 'p99'], rows)
+
+
+if __name__ == "__main__":
+    main()
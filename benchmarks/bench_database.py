@@ -0,0 +1,89 @@
+"""get_player latency against a large players table
+
+Compares DatabaseModel's persistent per-thread connection with the previous
+access pattern, which opened a new sqlite3 connection (and ran makedirs)
+for every lookup, then compares registering a squad one get_player call at
+a time with one get_players call, with and without the code-name cache.
+
+Run from the repository root:
+    python -m benchmarks.bench_database
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from src.models.database_model import DatabaseModel
+from benchmarks.common import time_per_call, print_table
+
+
+def legacy_get_player(db_path: str, player_id: int):
+    """Lookup as DatabaseModel did it before: a fresh connection per call"""
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    with sqlite3.connect(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT id, code_name FROM players WHERE id = ?', (player_id,))
+        return cursor.fetchone()
+
+
+def populate(database: DatabaseModel, players: int):
+    conn = database._get_connection()
+    with conn:
+        conn.executemany('INSERT INTO players (id, code_name, team) VALUES (?, ?, ?)',
+                         ((i, f"Player-{i}", 'red' if i % 2 else 'green') for i in range(1, players + 1)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DatabaseModel lookup benchmark')
+    parser.add_argument('--players', type=int, default=100000, help='Rows in the players table')
+    parser.add_argument('--lookups', type=int, default=20000, help='get_player calls per variant')
+    parser.add_argument('--squad', type=int, default=30, help='Players registered together')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, 'data', 'laser_tag.db')
+        begin = time.perf_counter()
+        database = DatabaseModel(db_path, cache_size=0)
+        init_ms = (time.perf_counter() - begin) * 1000
+        populate(database, args.players)
+
+        rng = random.Random(1234)
+        ids = [rng.randint(1, args.players * 11 // 10) for _ in range(args.lookups)]  # ~10% misses
+        legacy_ids = iter(ids)
+        pooled_ids = iter(ids)
+
+        legacy_ns = time_per_call(lambda: legacy_get_player(db_path, next(legacy_ids)), args.lookups)
+        pooled_ns = time_per_call(lambda: database.get_player(next(pooled_ids)), args.lookups)
+
+        begin = time.perf_counter()
+        DatabaseModel(db_path, cache_size=0).close()
+        reopen_ms = (time.perf_counter() - begin) * 1000
+
+        squads = [rng.sample(range(1, args.players + 1), args.squad) for _ in range(200)]
+        squad_rows = []
+        for label, cache_size in (('no cache', 0), ('LRU cache', 8192)):
+            cached = DatabaseModel(db_path, cache_size=cache_size)
+            for squad in squads:  # Warm-up pass: with a cache every later pass is all hits
+                cached.get_players(squad)
+            singles = iter(squads * 5)
+            bulks = iter(squads * 5)
+            single_ns = time_per_call(lambda: [cached.get_player(i) for i in next(singles)], len(squads) * 5)
+            bulk_ns = time_per_call(lambda: cached.get_players(next(bulks)), len(squads) * 5)
+            squad_rows.append([label, f"{single_ns / 1000:.1f}", f"{bulk_ns / 1000:.1f}"])
+            cached.close()
+        database.close()
+
+    print_table(f"get_player latency ({args.players} players, {args.lookups} lookups)",
+                ['variant', 'us/lookup', 'lookups/s'],
+                [['connection per call', f"{legacy_ns / 1000:.1f}", f"{1e9 / legacy_ns:.0f}"],
+                 ['persistent connection', f"{pooled_ns / 1000:.1f}", f"{1e9 / pooled_ns:.0f}"]])
+    print_table(f"Registering a squad of {args.squad} (us per squad)",
+                ['cache', f'{args.squad} x get_player', 'get_players'], squad_rows)
+    print(f"\nSchema setup: first DatabaseModel {init_ms:.2f} ms, later ones {reopen_ms:.3f} ms "
+          f"(speedup {legacy_ns / pooled_ns:.1f}x on lookups)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Micro-benchmark for GameModel hit resolution
+
+Run from the repository root:
+    python -m benchmarks.bench_game_model
+"""
+import argparse
+import random
+
+from src.models.game_model import GameModel
+from benchmarks.common import make_teams, time_per_call, print_table
+
+DEFAULT_SIZES = (30, 300, 3000, 10000)
+
+
+def bench_register_hit(total_players: int, iterations: int, seed: int = 1234) -> float:
+    """Mean ns per register_hit call for a roster of `total_players` units"""
+    red_team, green_team = make_teams(total_players, seed)
+    game = GameModel(red_team, green_team)
+    game.start_game()
+    
+    rng = random.Random(seed)
+    ids = [p.equipment_id for p in red_team + green_team]
+    pairs = [tuple(rng.sample(ids, 2)) for _ in range(1024)]
+    state = {'i': 0}
+    
+    def hit():
+        shooter_id, target_id = pairs[state['i'] & 1023]
+        state['i'] += 1
+        game.register_hit(shooter_id, target_id)
+    
+    return time_per_call(hit, iterations)
+
+
+def bench_roster_lookup(total_players: int, iterations: int, seed: int = 1234) -> float:
+    """Mean ns to resolve a shooter/target pair through the roster index"""
+    red_team, green_team = make_teams(total_players, seed)
+    game = GameModel(red_team, green_team)
+    
+    rng = random.Random(seed)
+    ids = [p.equipment_id for p in red_team + green_team]
+    pairs = [tuple(rng.sample(ids, 2)) for _ in range(1024)]
+    lookup = game.get_player_by_equipment_id
+    state = {'i': 0}
+    
+    def resolve():
+        shooter_id, target_id = pairs[state['i'] & 1023]
+        state['i'] += 1
+        lookup(shooter_id)
+        lookup(target_id)
+    
+    return time_per_call(resolve, iterations)
+
+
+def bench_register_base_hit(total_players: int, iterations: int, seed: int = 1234) -> float:
+    """Mean ns per register_base_hit call (mostly repeat hits, which are rejected)"""
+    red_team, green_team = make_teams(total_players, seed)
+    game = GameModel(red_team, green_team)
+    game.start_game()
+    
+    ids = [p.equipment_id for p in red_team + green_team]
+    state = {'i': 0}
+    
+    def base_hit():
+        game.register_base_hit(ids[state['i'] % len(ids)])
+        state['i'] += 1
+    
+    return time_per_call(base_hit, iterations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='GameModel hit resolution benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help='Total registered units per run')
+    parser.add_argument('--iterations', type=int, default=50000, help='Calls per measurement')
+    args = parser.parse_args()
+    
+    rows = []
+    for size in args.sizes:
+        rows.append([
+            size,
+            f"{bench_roster_lookup(size, args.iterations):.0f}",
+            f"{bench_register_hit(size, args.iterations):.0f}",
+            f"{bench_register_base_hit(size, args.iterations):.0f}",
+        ])
+    print_table("GameModel per-call cost (ns)", ['units', 'lookup', 'register_hit', 'register_base_hit'], rows)
+
+
+if __name__ == "__main__":
+    main()
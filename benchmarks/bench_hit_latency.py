@@ -0,0 +1,125 @@
+"""Hit-to-screen latency through the real receive path and Play Action screen
+
+Opens a PlayActionScreen on Qt's offscreen platform, points the traffic
+generator's load mode at it (v2, so every record carries its send time and
+a per-device sequence number) and follows each hit through the network
+receive thread, the view model and the scoreboard update with a
+LatencyTracer. Reports p50/p95/p99/max per stage and can save the results
+as JSON, or compare them with a saved run.
+
+Run from the repository root:
+    python -m benchmarks.bench_hit_latency --rate 200 --duration 10 --json latency.json
+    python -m benchmarks.bench_hit_latency --compare latency.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+
+from benchmarks.common import free_udp_port, print_table
+from traffic_generator import LoadConfig, make_players, run_load
+
+
+def stage_rows(stages: dict, baseline: dict = None) -> list:
+    rows = []
+    for stage, summary in stages.items():
+        if not summary['count']:
+            rows.append([stage, 0, '-', '-', '-', '-'])
+            continue
+        row = [stage, summary['count']]
+        for key in ('p50_us', 'p95_us', 'p99_us', 'max_us'):
+            cell = f"{summary[key] / 1000:.2f}"
+            before = (baseline or {}).get(stage, {}).get(key)
+            if before:
+                cell += f" ({(summary[key] - before) / before:+.0%})"
+            row.append(cell)
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Hit-to-screen latency benchmark')
+    parser.add_argument('--rate', type=float, default=200.0, help='Hits per second sent to the screen')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds of traffic')
+    parser.add_argument('--players', type=int, default=20, help='Players in the game')
+    parser.add_argument('--engine', choices=['thread', 'asyncio'], default='thread', help='Network engine')
+    parser.add_argument('--update-rate', type=float, default=20, help='Scoreboard refreshes per second')
+    parser.add_argument('--port', type=int, default=0, help='UDP port (default: a free one)')
+    parser.add_argument('--label', default='', help='Name stored with the results, e.g. a version')
+    parser.add_argument('--json', help='Write the results to this file')
+    parser.add_argument('--compare', help='Results file of an earlier run to compare against')
+    args = parser.parse_args()
+
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    sys.path.append(os.path.join(os.getcwd(), 'src'))
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QApplication
+    from models.latency import LatencyTracer
+    from models.player_model import Player
+    from models.result_writer import ResultWriter
+    from viewmodels.play_action_viewmodel import PlayActionViewModel
+    from src.views.play_action_screen import PlayActionScreen
+
+    port = args.port or free_udp_port()
+    players = [Player(p.id, p.name, p.equipment_id, p.team) for p in make_players(args.players)]
+    red_team = [p for p in players if p.team == 'red']
+    green_team = [p for p in players if p.team == 'green']
+
+    app = QApplication([])
+    tracer = LatencyTracer()
+    with tempfile.TemporaryDirectory() as directory:
+        viewmodel = PlayActionViewModel(red_team, green_team, network_engine=args.engine,
+                                        update_rate_hz=args.update_rate, journal_path=None,
+                                        result_writer=ResultWriter(os.path.join(directory, 'results.db')),
+                                        port=port, tracer=tracer)
+        screen = PlayActionScreen(viewmodel)
+        screen.show()
+
+        # The sender runs in its own process so it does not compete with the UI thread for the GIL
+        config = LoadConfig(rate=args.rate, duration=args.duration, players=args.players, mix=(1.0, 0.0, 0.0),
+                            workers=1, processes=True, port=port, protocol='v2')
+        send_report = {}
+        sender = threading.Thread(target=lambda: send_report.update(run_load(config)), daemon=True)
+
+        def finish_when_sent():
+            if sender.is_alive():
+                return
+            poll.stop()
+            # Give the last frame time to render before stopping
+            QTimer.singleShot(int(1000 / args.update_rate) + 200, app.quit)
+
+        poll = QTimer()
+        poll.timeout.connect(finish_when_sent)
+        QTimer.singleShot(200, lambda: (sender.start(), poll.start(50)))
+        app.exec()
+
+        screen.audio_player.stop()
+        screen.close()
+        viewmodel.result_writer.stop()
+
+    metadata = {'label': args.label, 'rate': args.rate, 'duration': args.duration, 'players': args.players,
+                'engine': args.engine, 'update_rate': args.update_rate, 'python': sys.version.split()[0],
+                'sent': send_report.get('sent', 0), 'achieved_rate': send_report.get('achieved_rate', 0.0)}
+    stages = tracer.stats()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['stages']
+    title = (f"Hit-to-screen latency in ms ({metadata['sent']} hits at {metadata['achieved_rate']:.0f}/s, "
+             f"{args.engine} engine, {args.update_rate:g} Hz scoreboard)")
+    if baseline is not None:
+        title += f", change vs {args.compare}"
+    print_table(title, ['stage', 'events', 'p50', 'p95', 'p99', 'max'], stage_rows(stages, baseline))
+    print(f"\nNot rendered: {tracer.in_flight} in flight, {tracer.untracked} untracked, "
+          f"{tracer.overflow} over the sample limit")
+
+    if args.json:
+        tracer.export(args.json, **metadata)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
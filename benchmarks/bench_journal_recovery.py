@@ -0,0 +1,95 @@
+"""Benchmark for the game journal: hit overhead and crash recovery time
+
+Journals a full game at a stress-test hit rate, then measures how long it
+takes to detect the unfinished journal and rebuild the GameModel from it.
+
+Run from the repository root:
+    python -m benchmarks.bench_journal_recovery
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from src.models.game_model import GameModel, GameSettings
+from src.models.game_journal import GameJournal
+from benchmarks.common import make_teams, print_table
+
+
+def play_game(path, total_players: int, hits: int, duration: int, seed: int = 1234):
+    """Play `hits` hits spread over `duration` seconds of game time
+
+    Returns:
+        tuple: (game model, mean ns per register_hit)
+    """
+    red_team, green_team = make_teams(total_players, seed)
+    settings = GameSettings(game_duration=duration, journal_path=path)
+    game = GameModel(red_team, green_team, settings)
+    game.start_game()
+
+    rng = random.Random(seed)
+    ids = [p.equipment_id for p in red_team + green_team]
+    pairs = [tuple(rng.sample(ids, 2)) for _ in range(4096)]
+    base_ids = rng.sample(ids, min(len(ids), 8))
+    start = game.start_time.timestamp()
+    step = duration / hits
+
+    register_hit = game.register_hit
+    begin = time.perf_counter_ns()
+    for i in range(hits):
+        shooter_id, target_id = pairs[i & 4095]
+        register_hit(shooter_id, target_id, start + i * step)
+    elapsed = time.perf_counter_ns() - begin
+    for player_id in base_ids:
+        game.register_base_hit(player_id, start + duration - 1)
+    return game, elapsed / hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Game journal recovery benchmark')
+    parser.add_argument('--players', type=int, default=30, help='Total players in the game')
+    parser.add_argument('--rate', type=int, default=1000, help='Hits per second of game time')
+    parser.add_argument('--duration', type=int, default=360, help='Game length in seconds')
+    args = parser.parse_args()
+
+    hits = args.rate * args.duration
+    with tempfile.TemporaryDirectory() as directory:
+        baseline, baseline_ns = play_game(None, args.players, hits, args.duration)
+
+        # Simulate a crash: the journal is never closed, only its last fsync is guaranteed
+        path = os.path.join(directory, 'game.journal')
+        game, journaled_ns = play_game(path, args.players, hits, args.duration)
+        game.journal.flush()
+        size = game.journal._offset
+
+        begin = time.perf_counter()
+        unfinished = GameJournal.is_unfinished(path)
+        detect_s = time.perf_counter() - begin
+
+        begin = time.perf_counter()
+        recovered = GameModel.from_journal(path)
+        recover_s = time.perf_counter() - begin
+
+        exact = (
+            (recovered.red_score, recovered.green_score) == (game.red_score, game.green_score)
+            and recovered.base_hitters == game.base_hitters
+            and recovered.end_time == game.end_time
+            and list(recovered.game_log) == list(game.game_log)
+            and [p.equipment_id for p in recovered.overall_leaderboard.top()]
+            == [p.equipment_id for p in game.overall_leaderboard.top()]
+            and {p.equipment_id: p.score for p in recovered.red_team + recovered.green_team}
+            == {p.equipment_id: p.score for p in game.red_team + game.green_team}
+        )
+        game.journal.close()
+
+    print_table(
+        f"Journal for a {args.duration}s game at {args.rate} hits/s ({hits} hits, {args.players} players)",
+        ['register_hit ns', 'journaled ns', 'journal MB', 'detect ms', 'recover ms', 'recover hits/s', 'exact state'],
+        [[f"{baseline_ns:.0f}", f"{journaled_ns:.0f}", f"{size / 1e6:.1f}", f"{detect_s * 1e3:.1f}",
+          f"{recover_s * 1e3:.0f}", f"{hits / recover_s:.0f}", 'yes' if unfinished and exact else 'NO']],
+    )
+
+
+if __name__ == "__main__":
+    main()
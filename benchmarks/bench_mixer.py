@@ -0,0 +1,43 @@
+"""Cost of mixing one output block with the NumPy mixer
+
+Mixes a looping music track plus a growing number of effect voices and
+reports the time per block against the block's playback time. The mixer
+keeps up with the sound card while the load stays well under 100%.
+
+Run from the repository root:
+    python -m benchmarks.bench_mixer
+"""
+import argparse
+
+from generate_sounds import SYNTHESIZERS
+from src.utils.mixer import Mixer, MUSIC, EFFECTS
+from benchmarks.common import time_per_call, print_table
+
+
+def run(voices: int, block_frames: int, iterations: int) -> list:
+    mixer = Mixer(block_frames=block_frames, polyphony=voices + 1)
+    for name, synthesize in SYNTHESIZERS.items():
+        mixer.add_sound(name, synthesize())
+    mixer.play('game_over', group=MUSIC, loop=True)
+    names = list(SYNTHESIZERS)
+    for i in range(voices):
+        mixer.play(names[i % len(names)], group=EFFECTS, loop=True)
+
+    ns = time_per_call(mixer.mix_block, iterations)
+    block_us = mixer.latency * 1e6
+    return [voices, block_frames, f"{block_us:.0f}", f"{ns / 1000:.1f}", f"{ns / 1000 / block_us * 100:.2f}%"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='NumPy mixer benchmark')
+    parser.add_argument('--voices', type=int, nargs='+', default=[0, 4, 16, 64], help='Effect voices over the music')
+    parser.add_argument('--blocks', type=int, nargs='+', default=[256, 512, 1024], help='Block sizes in frames')
+    parser.add_argument('--iterations', type=int, default=2000, help='Blocks mixed per scenario')
+    args = parser.parse_args()
+
+    rows = [run(voices, block, args.iterations) for block in args.blocks for voices in args.voices]
+    print_table("Mixer cost per block", ['voices', 'frames', 'block us', 'mix us', 'load'], rows)
+
+
+if __name__ == "__main__":
+    main()
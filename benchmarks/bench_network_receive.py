@@ -0,0 +1,117 @@
+"""Loopback throughput benchmark for the NetworkModel receive path
+
+Blasts hit datagrams from a separate process at increasing rates and counts
+how many events reach a slot on the Qt main thread. The highest rate that
+arrives without loss is reported for per-packet and batch receive modes.
+
+Run from the repository root:
+    python -m benchmarks.bench_network_receive
+"""
+import argparse
+import multiprocessing
+import socket
+import time
+
+from PyQt6.QtCore import QCoreApplication, QObject, pyqtSlot
+
+from src.models.network_model import NetworkModel
+from benchmarks.common import print_table
+
+DEFAULT_RATES = (5000, 10000, 20000, 40000, 80000, 160000)
+
+
+def _send_at_rate(host: str, port: int, rate: int, duration: float):
+    """Send hit datagrams at `rate` packets/s for `duration` seconds (child process)"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    total = int(rate * duration)
+    payloads = [f"{1000 + i % 30}:{1030 + i % 30}".encode('utf-8') for i in range(64)]
+    start = time.perf_counter()
+    for i in range(total):
+        # Pace in small bursts against the wall clock
+        if i % 64 == 0:
+            target = start + i / rate
+            while time.perf_counter() < target:
+                pass
+        sock.sendto(payloads[i & 63], (host, port))
+    sock.close()
+
+
+class _Counter(QObject):
+    """Counts events delivered to the main thread"""
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    @pyqtSlot(object)
+    def on_event(self, event):
+        self.count += 1
+
+    @pyqtSlot(list)
+    def on_batch(self, events):
+        self.count += len(events)
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def run_rate(app: QCoreApplication, batch_mode: bool, rate: int, duration: float) -> tuple:
+    """Return (sent, delivered, elapsed_seconds) for one rate"""
+    port = _free_port()
+    network = NetworkModel(host='127.0.0.1', tx_port=port, rx_port=port, batch_mode=batch_mode)
+    counter = _Counter()
+    network.data_received.connect(counter.on_event)
+    network.batch_received.connect(counter.on_batch)
+    network.start()
+
+    sent = int(rate * duration)
+    sender = multiprocessing.Process(target=_send_at_rate, args=('127.0.0.1', port, rate, duration))
+    start = time.perf_counter()
+    sender.start()
+
+    # Keep the main thread's event loop turning while the sender runs, then
+    # allow a short grace period for queued events to drain
+    deadline = None
+    while True:
+        app.processEvents()
+        if deadline is None and not sender.is_alive():
+            deadline = time.perf_counter() + 0.5
+        if counter.count >= sent or (deadline is not None and time.perf_counter() > deadline):
+            break
+    elapsed = time.perf_counter() - start
+    sender.join()
+    network.stop()
+    app.processEvents()
+    return sent, counter.count, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='NetworkModel loopback throughput benchmark')
+    parser.add_argument('--rates', type=int, nargs='+', default=list(DEFAULT_RATES),
+                        help='Offered loads in packets/s')
+    parser.add_argument('--duration', type=float, default=1.0, help='Seconds per offered load')
+    args = parser.parse_args()
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    rows = []
+    best = {}
+    for batch_mode in (False, True):
+        mode = 'batch' if batch_mode else 'per-packet'
+        best[mode] = 0
+        for rate in args.rates:
+            sent, delivered, elapsed = run_rate(app, batch_mode, rate, args.duration)
+            loss = 100.0 * (sent - delivered) / sent if sent else 0.0
+            rows.append([mode, rate, sent, delivered, f"{loss:.2f}", f"{delivered / elapsed:.0f}"])
+            if delivered == sent:
+                best[mode] = rate
+
+    print_table("NetworkModel loopback receive", ['mode', 'offered/s', 'sent', 'delivered', 'loss %', 'delivered/s'], rows)
+    for mode, rate in best.items():
+        print(f"{mode}: sustained {rate} packets/s without loss")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Parser micro-benchmark: legacy str/elif/dict parser vs the bytes-level PacketParser
+
+Run from the repository root:
+    python -m benchmarks.bench_parser
+"""
+import argparse
+import random
+import time
+
+from src.models.protocol import (
+    CODE_GAME_START, CODE_GAME_END, CODE_RED_BASE, OP_PLAYER_HIT, PacketParser, pack_v2, pack_v2_records
+)
+from benchmarks.common import print_table
+
+
+def legacy_parse(data: bytes):
+    """The original NetworkModel._process_received_data parse, returning the dict it emitted"""
+    data = data.decode('utf-8').strip()
+    if ':' in data:
+        parts = data.split(':')
+        if len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit():
+            return {
+                'type': 'player_hit',
+                'shooter_id': int(parts[0]),
+                'target_id': int(parts[1])
+            }
+    elif data == '202':
+        return {'type': 'game_start'}
+    elif data == '221':
+        return {'type': 'game_end'}
+    elif data == '53':
+        return {'type': 'base_hit', 'base_team': 'red'}
+    elif data == '43':
+        return {'type': 'base_hit', 'base_team': 'green'}
+    return None
+
+
+def make_v1_stream(count: int, seed: int, players: int = 30) -> list:
+    """Mostly hits with a sprinkling of control and base codes, as text datagrams"""
+    rng = random.Random(seed)
+    stream = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.9:
+            stream.append(f"{rng.randint(1, players)}:{rng.randint(1, players)}".encode('utf-8'))
+        else:
+            stream.append(rng.choice([b'202', b'221', b'53', b'43']))
+    return stream
+
+
+def make_v2_stream(count: int, seed: int, players: int = 30, per_datagram: int = 1) -> list:
+    """The same mix as make_v1_stream encoded as v2 records"""
+    rng = random.Random(seed)
+    sequence = {}
+    records = []
+    for _ in range(count):
+        if rng.random() < 0.9:
+            opcode, shooter, target = OP_PLAYER_HIT, rng.randint(1, players), rng.randint(1, players)
+        else:
+            opcode, shooter, target = rng.choice([CODE_GAME_START, CODE_GAME_END, CODE_RED_BASE]), 0, 0
+        seq = sequence.get(shooter, 0)
+        sequence[shooter] = seq + 1
+        records.append((opcode, shooter, target, seq, 0))
+    if per_datagram == 1:
+        return [pack_v2(*record) for record in records]
+    return [pack_v2_records(records[i:i + per_datagram]) for i in range(0, len(records), per_datagram)]
+
+
+def throughput(parse, stream: list, records: int) -> float:
+    """Parsed records per second, one call per datagram"""
+    start = time.perf_counter()
+    for data in stream:
+        parse(data)
+    return records / (time.perf_counter() - start)
+
+
+def batch_throughput(stream: list, records: int) -> float:
+    """Parsed records per second through PacketParser.parse_into, as the batch receive path uses it"""
+    parser = PacketParser()
+    events = []
+    start = time.perf_counter()
+    for data in stream:
+        parser.parse_into(events, data)
+    return records / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Network parser micro-benchmark')
+    parser.add_argument('--count', type=int, default=200000, help='Records per run')
+    parser.add_argument('--players', type=int, default=30, help='Distinct equipment IDs in the stream')
+    parser.add_argument('--seed', type=int, default=1234)
+    args = parser.parse_args()
+
+    v1_stream = make_v1_stream(args.count, args.seed, args.players)
+    v2_stream = make_v2_stream(args.count, args.seed, args.players)
+    v2_packed = make_v2_stream(args.count, args.seed, args.players, per_datagram=16)
+    # Fresh parser per run so v2 sequence tracking starts clean
+    rows = [
+        ['legacy (v1 text)', f"{throughput(legacy_parse, v1_stream, args.count):,.0f}"],
+        ['PacketParser.parse (v1 text)', f"{throughput(PacketParser().parse, v1_stream, args.count):,.0f}"],
+        ['PacketParser.parse_into (v1 text)', f"{batch_throughput(v1_stream, args.count):,.0f}"],
+        ['PacketParser.parse_into (v2, 1/datagram)', f"{batch_throughput(v2_stream, args.count):,.0f}"],
+        ['PacketParser.parse_into (v2, 16/datagram)', f"{batch_throughput(v2_packed, args.count):,.0f}"],
+    ]
+    print_table("Parser throughput (records/s)", ['parser', 'records/s'], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Headless replay throughput and scoring regression check
+
+Replays a set of game journals through the ReplayEngine and compares each
+game's final-state checksum with the one the live game produced. Without
+--journals, an archive of synthetic games is recorded first.
+
+Run from the repository root:
+    python -m benchmarks.bench_replay
+    python -m benchmarks.bench_replay --journals archive/*.journal
+"""
+import argparse
+import os
+import random
+import tempfile
+
+from src.models.game_model import GameModel, GameSettings
+from src.models.replay import ReplayClock, replay_journal, state_checksum
+from benchmarks.common import make_teams, print_table
+
+
+def record_archive(directory: str, games: int, players: int, hits: int, seed: int = 1234) -> dict:
+    """Play and journal `games` synthetic games
+
+    Returns:
+        dict: Journal path -> checksum of the live game
+    """
+    archive = {}
+    rng = random.Random(seed)
+    for index in range(games):
+        path = os.path.join(directory, f"game-{index:05d}.journal")
+        red_team, green_team = make_teams(players, seed + index)
+        clock = ReplayClock(1_700_000_000.0 + index * 3600)
+        game = GameModel(red_team, green_team, GameSettings(journal_path=path), clock)
+        game.start_game()
+
+        ids = [p.equipment_id for p in red_team + green_team]
+        step = game.settings.game_duration / hits
+        for _ in range(hits):
+            clock.now += step * rng.random() * 2
+            if rng.random() < 0.01:
+                game.register_base_hit(rng.choice(ids))
+            else:
+                shooter_id, target_id = rng.sample(ids, 2)
+                game.register_hit(shooter_id, target_id)
+        game.end_game()
+        archive[path] = state_checksum(game)
+    return archive
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Headless replay benchmark')
+    parser.add_argument('--journals', nargs='*', help='Replay these journals instead of a synthetic archive')
+    parser.add_argument('--games', type=int, default=1000, help='Synthetic games to record')
+    parser.add_argument('--players', type=int, default=30, help='Players per synthetic game')
+    parser.add_argument('--hits', type=int, default=2000, help='Hits per synthetic game')
+    parser.add_argument('--speed', type=float, default=None, help='Replay speed (default: as fast as possible)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        if args.journals:
+            # Archived games have no recorded checksum: replay twice and check determinism
+            archive = {path: replay_journal(path).checksum for path in args.journals}
+        else:
+            archive = record_archive(directory, args.games, args.players, args.hits)
+
+        events = 0
+        elapsed = 0.0
+        mismatches = []
+        for path, expected in archive.items():
+            result = replay_journal(path, args.speed)
+            events += result.events
+            elapsed += result.elapsed
+            if result.checksum != expected:
+                mismatches.append(path)
+
+    print_table(
+        "Replay of recorded games",
+        ['games', 'events', 'seconds', 'events/s', 'checksum mismatches'],
+        [[len(archive), events, f"{elapsed:.2f}", f"{events / elapsed:.0f}" if elapsed else '-', len(mismatches)]],
+    )
+    for path in mismatches[:10]:
+        print(f"  mismatch: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Saving finished games through the background ResultWriter
+
+Plays one synthetic game, then submits it many times back to back, the way
+a tournament station ends games in bursts. Reports what submitting costs
+the calling (UI) thread and how the writer thread batched and committed
+the burst.
+
+Run from the repository root:
+    python -m benchmarks.bench_result_writer
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from src.models.game_model import GameModel, GameSettings
+from src.models.result_writer import ResultWriter, match_result
+from benchmarks.common import make_teams, print_table
+
+
+def play_game(players: int, hits: int) -> GameModel:
+    red_team, green_team = make_teams(players)
+    game_model = GameModel(red_team, green_team, GameSettings(event_log_capacity=hits + 10))
+    game_model.start_game()
+    rng = random.Random(1234)
+    for _ in range(hits):
+        shooter, target = rng.choice(red_team), rng.choice(green_team)
+        if rng.random() < 0.5:
+            shooter, target = target, shooter
+        game_model.register_hit(shooter.equipment_id, target.equipment_id)
+    game_model.end_game()
+    return game_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Game result writer benchmark')
+    parser.add_argument('--games', type=int, nargs='+', default=[1, 10, 100], help='Games per burst')
+    parser.add_argument('--players', type=int, default=30, help='Players per game')
+    parser.add_argument('--hits', type=int, default=2000, help='Hits logged per game')
+    args = parser.parse_args()
+
+    game_model = play_game(args.players, args.hits)
+    begin = time.perf_counter()
+    result = match_result(game_model)
+    snapshot_us = (time.perf_counter() - begin) * 1e6
+
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for games in args.games:
+            writer = ResultWriter(os.path.join(directory, f"burst-{games}.db"))
+            writer.record_game(game_model)  # Create the schema and start the thread outside the timing
+            writer.flush()
+            writer.batches = writer.written = 0
+            writer.commit_latencies.clear()
+
+            begin = time.perf_counter()
+            for _ in range(games):
+                writer.submit(result)
+            submit_s = time.perf_counter() - begin
+            writer.flush()
+            drain_s = time.perf_counter() - begin
+            stats = writer.stats()
+            writer.stop()
+            rows.append([games, f"{submit_s / games * 1e6:.1f}", stats['max_queue_depth'], stats['batches'],
+                         f"{stats['commit_ms_median']:.1f}", f"{stats['commit_ms_max']:.1f}",
+                         f"{games / drain_s:.0f}"])
+
+    print_table(f"ResultWriter bursts ({args.players} players, {len(result.events)} events per game)",
+                ['games', 'submit us/game', 'max queue', 'commits', 'commit ms p50', 'commit ms max', 'games/s'],
+                rows)
+    print(f"\nSnapshotting a finished game on the UI thread: {snapshot_us:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Cost and latency of triggering sound effects at game hit rates
+
+Triggers the hit and base hit effects at several rates with the Qt event
+loop running, and reports how long play() holds the caller, the
+trigger-to-playback latency, and how many effects were merged or dropped.
+Needs a working audio backend for QtMultimedia.
+
+Run from the repository root:
+    python -m benchmarks.bench_sound_effects
+"""
+import argparse
+import time
+
+from PyQt6.QtCore import QCoreApplication
+
+from src.utils.sound_effects import SoundEffectEngine
+from benchmarks.common import print_table
+
+
+def run_rate(app: QCoreApplication, engine: SoundEffectEngine, rate: int, duration: float) -> list:
+    """Trigger effects at `rate` per second and return one result row"""
+    engine.latencies.clear()
+    engine.played = engine.merged = engine.dropped = 0
+    call_ns = []
+    total = int(rate * duration)
+    start = time.perf_counter()
+    for i in range(total):
+        target_time = start + i / rate
+        while time.perf_counter() < target_time:
+            app.processEvents()
+        sound = 'base_hit' if i % 10 == 0 else 'hit'
+        begin = time.perf_counter_ns()
+        engine.play(sound)
+        call_ns.append(time.perf_counter_ns() - begin)
+
+    # Let the last effects start so their latency is recorded
+    settle = time.perf_counter() + 0.5
+    while time.perf_counter() < settle:
+        app.processEvents()
+
+    stats = engine.latency_stats()
+    call_ns.sort()
+    return [rate, total, stats['played'], stats['merged'], stats['dropped'],
+            f"{call_ns[len(call_ns) // 2] / 1000:.1f}", f"{call_ns[-1] / 1000:.1f}",
+            f"{stats.get('p50_ms', 0):.1f}", f"{stats.get('p95_ms', 0):.1f}"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sound effect engine benchmark')
+    parser.add_argument('--rates', type=int, nargs='+', default=[5, 50, 500], help='Effects triggered per second')
+    parser.add_argument('--duration', type=float, default=3.0, help='Seconds per rate')
+    parser.add_argument('--polyphony', type=int, default=8, help='Maximum simultaneous effects')
+    args = parser.parse_args()
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    engine = SoundEffectEngine(polyphony=args.polyphony)
+    # Give the voices time to load their WAV data
+    ready = time.perf_counter() + 1.0
+    while time.perf_counter() < ready:
+        app.processEvents()
+
+    rows = [run_rate(app, engine, rate, args.duration) for rate in args.rates]
+    print_table(f"Sound effects (polyphony {args.polyphony})",
+                ['rate/s', 'triggered', 'played', 'merged', 'dropped', 'play() p50 us', 'play() max us',
+                 'latency p50 ms', 'latency p95 ms'], rows)
+
+
+if __name__ == "__main__":
+    main()
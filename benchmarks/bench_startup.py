@@ -0,0 +1,100 @@
+"""Startup time and memory of the headless server versus the GUI
+
+Each target is started in a fresh interpreter that builds everything needed
+to run a game and then reports its peak RSS. Wall time is measured from
+process launch until the target is ready, including interpreter startup.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import print_table
+
+READY = 'READY'
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB"""
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return rss / (1 << 20) if sys.platform == 'darwin' else rss / 1024
+
+
+def start_server():
+    """Build a headless game session, bound and ready to receive"""
+    from src import server
+    args = server.build_parser().parse_args([
+        '--player', 'red:11:Alpha', '--player', 'green:21:Bravo', '--rx-port', '0', '--no-journal',
+    ])
+    session = server.build_session(args)
+    session.network.start()
+    session.network.stop()
+    return 'PyQt6' in sys.modules
+
+
+def start_gui():
+    """Create the QApplication and show the splash screen, as src/main.py does"""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    sys.path.append(os.path.join(os.getcwd(), 'src'))
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication([])
+    from src.views.splash_screen import SplashScreen
+    from src.viewmodels.splash_screen_viewmodel import SplashScreenViewModel
+    splash = SplashScreen(SplashScreenViewModel())
+    splash.show()
+    app.processEvents()
+    return True
+
+
+TARGETS = {'server': start_server, 'gui': start_gui}
+
+
+def measure(target: str, runs: int):
+    """Launch `target` `runs` times; return (best seconds, peak RSS MB, imports PyQt6)"""
+    best = None
+    rss = 0.0
+    uses_qt = False
+    for _ in range(runs):
+        begin = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, '-m', 'benchmarks.bench_startup', '--child', target],
+                                stdout=subprocess.PIPE, text=True)
+        for line in proc.stdout:
+            if line.startswith(READY):
+                elapsed = time.perf_counter() - begin
+                _, child_rss, child_qt = line.split()
+                rss = max(rss, float(child_rss))
+                uses_qt = child_qt == 'True'
+                best = elapsed if best is None else min(best, elapsed)
+        proc.wait()
+    return best, rss, uses_qt
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Startup time and RSS benchmark')
+    parser.add_argument('--runs', type=int, default=5, help='Launches per target (best time is kept)')
+    parser.add_argument('--child', choices=sorted(TARGETS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        uses_qt = TARGETS[args.child]()
+        print(f"{READY} {peak_rss_mb():.1f} {uses_qt}", flush=True)
+        os._exit(0)
+
+    rows = []
+    for target in TARGETS:
+        seconds, rss, uses_qt = measure(target, args.runs)
+        if seconds is None:
+            rows.append([target, 'failed', '-', '-'])
+        else:
+            rows.append([target, f"{seconds * 1e3:.0f}", f"{rss:.1f}", 'yes' if uses_qt else 'no'])
+    print_table("Startup to ready", ['target', 'ms', 'peak RSS MB', 'imports PyQt6'], rows)
+
+
+if __name__ == "__main__":
+    main()
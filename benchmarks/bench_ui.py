@@ -0,0 +1,237 @@
+"""Widget-side cost of the Play Action and Player Entry screens
+
+Runs the real screens on Qt's offscreen platform and feeds them synthetic
+score streams:
+  * per update: update_scores, update_log, one timer-label flash and the
+    repaint they cause, with the Python memory each update allocates and
+    any QObjects left behind
+  * live: hits arrive at a fixed rate through the view model for a few
+    seconds while a 5 ms heartbeat timer measures how long the event loop
+    is blocked
+  * player entry: adding players one by one (every add rebuilds both team
+    lists) and a single update_team_lists at full size
+
+Run from the repository root:
+    python -m benchmarks.bench_ui
+    python -m benchmarks.bench_ui --sizes 30 300 --rates 20 60 --duration 5
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from statistics import mean
+
+from benchmarks.common import free_udp_port, make_teams, print_table
+
+DEFAULT_SIZES = (2, 30, 300, 3000)
+DEFAULT_RATES = (10, 20, 60)
+HEARTBEAT_MS = 5
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+# Imported once the offscreen platform is set and src/ is on sys.path
+QApplication = QMessageBox = QObject = QTimer = Qt = None
+DatabaseModel = ResultWriter = NetworkEvent = EVENT_PLAYER_HIT = None
+PlayActionViewModel = PlayerEntryViewModel = PlayActionScreen = PlayerEntryScreen = None
+
+
+def _import_qt():
+    global QApplication, QMessageBox, QObject, QTimer, Qt
+    global DatabaseModel, ResultWriter, NetworkEvent, EVENT_PLAYER_HIT
+    global PlayActionViewModel, PlayerEntryViewModel, PlayActionScreen, PlayerEntryScreen
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    sys.path.append(os.path.join(os.getcwd(), 'src'))
+    from PyQt6.QtCore import QObject, QTimer, Qt
+    from PyQt6.QtWidgets import QApplication, QMessageBox
+    from models.database_model import DatabaseModel
+    from models.protocol import NetworkEvent, EVENT_PLAYER_HIT
+    from models.result_writer import ResultWriter
+    from viewmodels.play_action_viewmodel import PlayActionViewModel
+    from viewmodels.player_entry_viewmodel import PlayerEntryViewModel
+    from src.views.play_action_screen import PlayActionScreen
+    from src.views.player_entry_screen import PlayerEntryScreen
+    return QApplication.instance() or QApplication([])
+
+
+class PlayScreenBench:
+    """A PlayActionScreen over a running game of `players` players"""
+
+    def __init__(self, app, players: int, directory: str, update_rate: float = 20, seed: int = 1234):
+        self.app = app
+        self.red_team, self.green_team = make_teams(players, seed)
+        self.rng = random.Random(seed)
+        self.ids = [p.equipment_id for p in self.red_team + self.green_team]
+        self.viewmodel = PlayActionViewModel(
+            self.red_team, self.green_team, update_rate_hz=update_rate, journal_path=None, port=free_udp_port(),
+            result_writer=ResultWriter(os.path.join(directory, f'results-{players}.db')))
+        self.screen = PlayActionScreen(self.viewmodel)
+        self.screen.show()
+        app.processEvents()
+
+    def hits(self, count: int) -> list:
+        return [NetworkEvent(EVENT_PLAYER_HIT, *self.rng.sample(self.ids, 2)) for _ in range(count)]
+
+    def qobjects(self) -> int:
+        return len(self.screen.findChildren(QObject))
+
+    def per_update(self, updates: int, hits_per_update: int) -> dict:
+        """Time the slots one scoreboard update runs, outside the coalescer"""
+        screen, game_model, app = self.screen, self.viewmodel.game_model, self.app
+        timings = {'scores': [], 'log': [], 'flash': [], 'paint': [], 'alloc': []}
+        objects_before = self.qobjects()
+        tracemalloc.start()
+        for _ in range(updates):
+            self.viewmodel.session.apply_batch(self.hits(hits_per_update))
+            scores = game_model.get_scores()
+            log = game_model.get_recent_events(5)
+
+            tracemalloc.reset_peak()
+            allocated_before = tracemalloc.get_traced_memory()[0]
+            begin = time.perf_counter()
+            screen.update_scores(scores)
+            scored = time.perf_counter()
+            screen.update_log(log)
+            logged = time.perf_counter()
+            screen.flash_timer_label()
+            flashed = time.perf_counter()
+            app.processEvents()  # Layout and paint what the updates invalidated
+            painted = time.perf_counter()
+            timings['alloc'].append(tracemalloc.get_traced_memory()[1] - allocated_before)
+
+            timings['scores'].append(scored - begin)
+            timings['log'].append(logged - scored)
+            timings['flash'].append(flashed - logged)
+            timings['paint'].append(painted - flashed)
+        tracemalloc.stop()
+        self.viewmodel.scoreboard.cancel()
+        timings['leaked'] = self.qobjects() - objects_before
+        return timings
+
+    def live(self, rate: float, duration: float, hits_per_update: int) -> dict:
+        """Feed hits at `rate` batches per second through the view model and watch the event loop"""
+        self.viewmodel.scoreboard.set_frame_rate(rate)
+        renders = []
+
+        gaps = []
+        last_beat = [time.perf_counter()]
+
+        def beat():
+            now = time.perf_counter()
+            gaps.append(now - last_beat[0])
+            last_beat[0] = now
+
+        def feed():
+            self.viewmodel.handle_network_batch(self.hits(hits_per_update))
+
+        def rendered(_):
+            renders.append(time.perf_counter())
+
+        heartbeat = QTimer()
+        heartbeat.setTimerType(Qt.TimerType.PreciseTimer)
+        heartbeat.timeout.connect(beat)
+        driver = QTimer()
+        driver.setTimerType(Qt.TimerType.PreciseTimer)
+        driver.timeout.connect(feed)
+        self.viewmodel.update_scores.connect(rendered)
+
+        begin = time.perf_counter()
+        heartbeat.start(HEARTBEAT_MS)
+        driver.start(max(1, round(1000 / rate)))
+        QTimer.singleShot(int(duration * 1000), self.app.quit)
+        self.app.exec()
+        elapsed = time.perf_counter() - begin
+        heartbeat.stop()
+        driver.stop()
+        self.viewmodel.update_scores.disconnect(rendered)
+        self.viewmodel.scoreboard.cancel()
+        return {'renders_per_s': len(renders) / elapsed, 'gaps': gaps}
+
+    def close(self):
+        self.screen.audio_player.stop()
+        self.screen.close()
+        self.viewmodel.result_writer.stop()
+
+
+def bench_player_entry(app, players: int, directory: str) -> tuple:
+    """Mean seconds per add while the teams fill up, and one update_team_lists at full size"""
+    database = DatabaseModel(os.path.join(directory, 'players.db'), warm_cache=False)
+    viewmodel = PlayerEntryViewModel(database)
+    viewmodel.MAX_PLAYERS_PER_TEAM = players  # The real limit is 15; lift it to see how adds scale
+    screen = PlayerEntryScreen(viewmodel)
+    screen.show()
+    app.processEvents()
+
+    red_team, green_team = make_teams(players)
+    adds = []
+    for player in sorted(red_team + green_team, key=lambda p: p.player_id):
+        begin = time.perf_counter()
+        # The viewmodel's player_added signal drives update_team_lists, as the add button does
+        viewmodel.add_player(player.player_id, player.code_name, player.team, player.equipment_id)
+        app.processEvents()
+        adds.append(time.perf_counter() - begin)
+
+    begin = time.perf_counter()
+    screen.update_team_lists()
+    app.processEvents()
+    rebuild = time.perf_counter() - begin
+    screen.close()
+    database.close()
+    return mean(adds), rebuild
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offscreen UI rendering benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help='Players in the game')
+    parser.add_argument('--rates', type=float, nargs='+', default=list(DEFAULT_RATES),
+                        help='Scoreboard updates per second in the live run')
+    parser.add_argument('--updates', type=int, default=200, help='Updates timed per size')
+    parser.add_argument('--hits-per-update', type=int, default=10, help='Hits applied between updates')
+    parser.add_argument('--duration', type=float, default=3.0, help='Seconds per live run')
+    parser.add_argument('--stall-ms', type=float, default=50.0, help='Heartbeat gap counted as a stall')
+    parser.add_argument('--entry-sizes', type=int, nargs='+', default=[2, 30, 300],
+                        help='Players added on the entry screen')
+    args = parser.parse_args()
+
+    app = _import_qt()
+    # Game-over and error dialogs would block the run
+    QMessageBox.information = QMessageBox.warning = QMessageBox.critical = lambda *a, **k: None
+
+    update_rows, live_rows, entry_rows = [], [], []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            bench = PlayScreenBench(app, size, directory)
+            timings = bench.per_update(args.updates, args.hits_per_update)
+            totals = [sum(parts) for parts in zip(timings['scores'], timings['log'], timings['flash'], timings['paint'])]
+            update_rows.append([size] + [f"{mean(timings[key]) * 1000:.3f}" for key in ('scores', 'log', 'flash', 'paint')]
+                               + [f"{percentile(totals, 0.99) * 1000:.2f}", f"{mean(timings['alloc']) / 1024:.1f}",
+                                  timings['leaked']])
+            for rate in args.rates:
+                result = bench.live(rate, args.duration, args.hits_per_update)
+                gaps_ms = [gap * 1000 for gap in result['gaps']]
+                live_rows.append([size, f"{rate:g}", f"{result['renders_per_s']:.1f}",
+                                  f"{percentile(gaps_ms, 0.99):.1f}", f"{max(gaps_ms, default=0):.1f}",
+                                  sum(1 for gap in gaps_ms if gap > args.stall_ms)])
+            bench.close()
+
+        for size in args.entry_sizes:
+            add_s, rebuild_s = bench_player_entry(app, size, directory)
+            entry_rows.append([size, f"{add_s * 1000:.2f}", f"{rebuild_s * 1000:.2f}"])
+
+    print_table(f"PlayActionScreen per update (ms, mean of {args.updates}; alloc = peak Python KiB per update)",
+                ['players', 'update_scores', 'update_log', 'flash', 'paint', 'p99 total', 'alloc KiB',
+                 'QObjects left'], update_rows)
+    print_table(f"PlayActionScreen live ({args.hits_per_update} hits per batch, {HEARTBEAT_MS} ms heartbeat, "
+                f"stall > {args.stall_ms:g} ms)",
+                ['players', 'target/s', 'renders/s', 'gap p99 ms', 'gap max ms', 'stalls'], live_rows)
+    print_table("PlayerEntryScreen (ms)", ['players', 'per add', 'update_team_lists'], entry_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import random
+import socket
+import time
+from typing import Callable, List, Tuple
+
+from src.models.player_model import Player
+
+
+def make_teams(total_players: int, seed: int = 1234) -> Tuple[List[Player], List[Player]]:
+    """Build two synthetic teams with unique player and equipment IDs"""
+    rng = random.Random(seed)
+    red_team, green_team = [], []
+    for index in range(total_players):
+        team = 'red' if index % 2 == 0 else 'green'
+        player = Player(index + 1, f"{team.capitalize()}-{index + 1}", 1000 + index, team)
+        (red_team if team == 'red' else green_team).append(player)
+    rng.shuffle(red_team)
+    rng.shuffle(green_team)
+    return red_team, green_team
+
+
+def free_udp_port() -> int:
+    """A UDP port on localhost that nothing is bound to right now"""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def time_per_call(func: Callable[[], object], iterations: int) -> float:
+    """Run func `iterations` times and return the mean cost in nanoseconds"""
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def print_table(title: str, headers: List[str], rows: List[List[object]]):
+    """Print benchmark results as a fixed-width table"""
+    print(f"\n{title}")
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).rjust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(str(c).rjust(w) for c, w in zip(row, widths)))
@@ -0,0 +1,278 @@
+"""Benchmark suite for the scoring, receive and lookup hot paths, with baselines
+
+Every case runs against the same seeded fixtures at 2, 30, 300 and 3,000
+players and reports the best mean nanoseconds per call over several
+repeats. Results can be saved as a JSON baseline and a later run compared
+against it; the compare step exits non-zero when a case got slower than
+the threshold allows, so it can gate a change.
+
+Run from the repository root:
+    python -m benchmarks.suite run --save baseline.json
+    python -m benchmarks.suite run --compare baseline.json
+    python -m benchmarks.suite compare baseline.json current.json --threshold 0.15
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from PyQt6.QtCore import QCoreApplication
+
+from benchmarks.common import make_teams, time_per_call, print_table
+
+FIXTURE_SIZES = (2, 30, 300, 3000)
+PAIRS = 1024  # Distinct shooter/target pairs cycled through by the hit cases
+
+# Imported once src/ is on sys.path (the view model uses the app's own import style)
+GameModel = NetworkModel = PlayActionViewModel = DatabaseModel = ResultWriter = None
+NetworkEvent = EVENT_PLAYER_HIT = OP_PLAYER_HIT = encode_v1 = pack_v2 = None
+
+
+def _import_app():
+    global GameModel, NetworkModel, PlayActionViewModel, DatabaseModel, ResultWriter
+    global NetworkEvent, EVENT_PLAYER_HIT, OP_PLAYER_HIT, encode_v1, pack_v2
+    src = os.path.join(os.getcwd(), 'src')
+    if src not in sys.path:
+        sys.path.append(src)
+    from models.game_model import GameModel
+    from models.network_model import NetworkModel
+    from models.database_model import DatabaseModel
+    from models.result_writer import ResultWriter
+    from models.protocol import NetworkEvent, EVENT_PLAYER_HIT, OP_PLAYER_HIT, encode_v1, pack_v2
+    from viewmodels.play_action_viewmodel import PlayActionViewModel
+
+
+class Fixture:
+    """Seeded teams and hit pairs for one roster size"""
+
+    def __init__(self, players: int, seed: int, directory: str):
+        self.players = players
+        self.seed = seed
+        self.directory = directory
+        self.red_team, self.green_team = make_teams(players, seed)
+        rng = random.Random(seed)
+        ids = [p.equipment_id for p in self.red_team + self.green_team]
+        self.equipment_ids = ids
+        self.pairs = [tuple(rng.sample(ids, 2)) for _ in range(PAIRS)]
+
+    def game(self, hits: int = 0):
+        """A running game, optionally with some hits already scored"""
+        red_team, green_team = make_teams(self.players, self.seed)
+        game = GameModel(red_team, green_team)
+        game.start_game()
+        for shooter_id, target_id in self.pairs[:hits]:
+            game.register_hit(shooter_id, target_id)
+        return game
+
+    def v2_datagrams(self, count: int) -> List[bytes]:
+        """Hit records with per-device sequence numbers that never repeat"""
+        sequence = {}
+        datagrams = []
+        for shooter_id, target_id in itertools.islice(itertools.cycle(self.pairs), count):
+            seq = sequence.get(shooter_id, 0)
+            sequence[shooter_id] = seq + 1
+            datagrams.append(pack_v2(OP_PLAYER_HIT, shooter_id, target_id, seq))
+        return datagrams
+
+
+def bench_register_hit(fixture: Fixture, iterations: int) -> float:
+    game = fixture.game()
+    pairs = itertools.cycle(fixture.pairs)
+    register_hit = game.register_hit
+    return time_per_call(lambda: register_hit(*next(pairs)), iterations)
+
+
+def bench_register_base_hit(fixture: Fixture, iterations: int) -> float:
+    """Mostly repeat hits, which are rejected, as in a real game"""
+    game = fixture.game()
+    ids = itertools.cycle(fixture.equipment_ids)
+    register_base_hit = game.register_base_hit
+    return time_per_call(lambda: register_base_hit(next(ids)), iterations)
+
+
+def bench_get_team_states(fixture: Fixture, iterations: int) -> float:
+    game = fixture.game(hits=PAIRS)
+    return time_per_call(game.get_team_states, iterations)
+
+
+def bench_get_scores(fixture: Fixture, iterations: int) -> float:
+    game = fixture.game(hits=PAIRS)
+    return time_per_call(game.get_scores, iterations)
+
+
+def _bench_receive(datagrams: List[bytes], iterations: int) -> float:
+    network = NetworkModel()
+    datagrams = iter(datagrams)
+    process = network.service._process_received_data
+    return time_per_call(lambda: process(next(datagrams)), iterations)
+
+
+def bench_receive_v1(fixture: Fixture, iterations: int) -> float:
+    """NetworkModel per-packet path: parse a v1 datagram and emit data_received"""
+    datagrams = [encode_v1(OP_PLAYER_HIT, *pair) for pair in fixture.pairs]
+    return _bench_receive(itertools.cycle(datagrams), iterations)
+
+
+def bench_receive_v2(fixture: Fixture, iterations: int) -> float:
+    """As receive_v1 with v2 records, including sequence tracking"""
+    return _bench_receive(fixture.v2_datagrams(iterations), iterations)
+
+
+def bench_handle_network_data(fixture: Fixture, iterations: int) -> float:
+    """PlayActionViewModel applying a hit and scheduling a scoreboard refresh"""
+    result_writer = ResultWriter(os.path.join(fixture.directory, 'results.db'))
+    viewmodel = PlayActionViewModel(fixture.red_team, fixture.green_team, journal_path=None,
+                                    game_model=fixture.game(), result_writer=result_writer)
+    events = itertools.cycle([NetworkEvent(EVENT_PLAYER_HIT, *pair) for pair in fixture.pairs])
+    handle = viewmodel.handle_network_data
+    try:
+        return time_per_call(lambda: handle(next(events)), iterations)
+    finally:
+        viewmodel.scoreboard.cancel()
+        result_writer.stop()
+
+
+def _bench_get_player(fixture: Fixture, iterations: int, cache_size: int) -> float:
+    db_path = os.path.join(fixture.directory, f'players-{fixture.players}.db')
+    database = DatabaseModel(db_path, cache_size=cache_size, warm_cache=False)
+    with database._get_connection() as conn:
+        conn.executemany('INSERT OR IGNORE INTO players (id, code_name, team) VALUES (?, ?, ?)',
+                         ((p.player_id, p.code_name, p.team) for p in fixture.red_team + fixture.green_team))
+    ids = itertools.cycle([p.player_id for p in fixture.red_team + fixture.green_team])
+    try:
+        return time_per_call(lambda: database.get_player(next(ids)), iterations)
+    finally:
+        database.close()
+
+
+def bench_get_player(fixture: Fixture, iterations: int) -> float:
+    """DatabaseModel.get_player with the default code-name cache"""
+    return _bench_get_player(fixture, iterations, cache_size=1024)
+
+
+def bench_get_player_uncached(fixture: Fixture, iterations: int) -> float:
+    """DatabaseModel.get_player always going to SQLite"""
+    return _bench_get_player(fixture, iterations, cache_size=0)
+
+
+CASES: Dict[str, Callable[[Fixture, int], float]] = {
+    'game.register_hit': bench_register_hit,
+    'game.register_base_hit': bench_register_base_hit,
+    'game.get_team_states': bench_get_team_states,
+    'game.get_scores': bench_get_scores,
+    'network.receive_v1': bench_receive_v1,
+    'network.receive_v2': bench_receive_v2,
+    'viewmodel.handle_network_data': bench_handle_network_data,
+    'database.get_player': bench_get_player,
+    'database.get_player_uncached': bench_get_player_uncached,
+}
+
+
+def run_suite(cases: List[str], sizes: List[int], iterations: int, repeat: int, seed: int = 1234) -> dict:
+    """Run the cases at every size. Returns {'metadata': ..., 'results': {case: {size: ns per call}}}"""
+    _import_app()
+    # Keeps the application alive for the viewmodel cases' QObjects and timers
+    _app = QCoreApplication.instance() or QCoreApplication([])
+    results = {case: {} for case in cases}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            fixture = Fixture(size, seed, directory)
+            for case in cases:
+                # Best of the repeats: noise only ever makes a run slower
+                results[case][str(size)] = min(CASES[case](fixture, iterations) for _ in range(repeat))
+    return {
+        'metadata': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'iterations': iterations,
+            'repeat': repeat,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> List[List[object]]:
+    """Rows of (case, size, baseline ns, current ns, change, verdict) for everything both runs measured"""
+    rows = []
+    for case, by_size in current['results'].items():
+        for size, ns in by_size.items():
+            before = baseline['results'].get(case, {}).get(size)
+            if before is None:
+                continue
+            change = (ns - before) / before
+            verdict = 'REGRESSION' if change > threshold else 'faster' if change < -threshold else ''
+            rows.append([case, size, f"{before:.0f}", f"{ns:.0f}", f"{change:+.1%}", verdict])
+    return rows
+
+
+def print_results(report: dict):
+    results = report['results']
+    sizes = sorted({int(size) for by_size in results.values() for size in by_size})
+    print_table("ns per call (best of {repeat} x {iterations})".format(**report['metadata']),
+                ['case'] + [f"{size} players" for size in sizes],
+                [[case] + [f"{by_size[str(size)]:.0f}" if str(size) in by_size else '-' for size in sizes]
+                 for case, by_size in results.items()])
+
+
+def print_comparison(baseline: dict, current: dict, threshold: float) -> int:
+    """Print the comparison and return the number of regressions"""
+    rows = compare(baseline, current, threshold)
+    print_table(f"Change against the baseline (threshold {threshold:.0%})",
+                ['case', 'players', 'baseline ns', 'current ns', 'change', ''], rows)
+    regressions = sum(1 for row in rows if row[-1] == 'REGRESSION')
+    if baseline['metadata'].get('platform') != current['metadata'].get('platform'):
+        print(f"\nNote: baseline came from {baseline['metadata'].get('platform')}")
+    print(f"\n{regressions} regression(s) beyond {threshold:.0%}")
+    return regressions
+
+
+def load(path: str) -> dict:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Hot path benchmark suite')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='Run the suite')
+    run.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES), help='Cases to run')
+    run.add_argument('--sizes', type=int, nargs='+', default=list(FIXTURE_SIZES), help='Players per fixture')
+    run.add_argument('--iterations', type=int, default=20000, help='Calls per measurement')
+    run.add_argument('--repeat', type=int, default=5, help='Measurements per case; the best is kept')
+    run.add_argument('--save', help='Write the results to this JSON file')
+    run.add_argument('--compare', help='Baseline JSON file to compare the results against')
+    run.add_argument('--threshold', type=float, default=0.10, help='Slowdown counted as a regression (0.10 = 10%%)')
+
+    check = commands.add_parser('compare', help='Compare two saved runs')
+    check.add_argument('baseline', help='Baseline JSON file')
+    check.add_argument('current', help='JSON file of the run to check')
+    check.add_argument('--threshold', type=float, default=0.10, help='Slowdown counted as a regression (0.10 = 10%%)')
+    args = parser.parse_args()
+
+    if args.command == 'compare':
+        return 1 if print_comparison(load(args.baseline), load(args.current), args.threshold) else 0
+
+    report = run_suite(args.cases, args.sizes, args.iterations, args.repeat)
+    print_results(report)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.save}")
+    if args.compare:
+        return 1 if print_comparison(load(args.compare), report, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
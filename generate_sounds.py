@@ -1,51 +1,82 @@
 import numpy as np
-from scipy.io import wavfile
 import os
 
-def generate_sine_wave(freq, duration, sample_rate=44100, volume=0.5):
+SAMPLE_RATE = 44100
+
+def generate_sine_wave(freq, duration, sample_rate=SAMPLE_RATE, volume=0.5):
     """Generate a sine wave tone"""
     t = np.linspace(0, duration, int(sample_rate * duration), False)
     tone = np.sin(2 * np.pi * freq * t) * volume * 32767
     return tone.astype(np.int16)
 
-def generate_hit_sound():
-    """Generate a hit sound effect"""
+def synthesize_hit():
+    """Synthesize the hit sound effect"""
     # Short beep at 800Hz
-    hit = generate_sine_wave(800, 0.1, volume=0.3)
-    wavfile.write('assets/sounds/hit.wav', 44100, hit)
+    return generate_sine_wave(800, 0.1, volume=0.3)
 
-def generate_base_hit_sound():
-    """Generate a base hit sound effect"""
+def synthesize_base_hit():
+    """Synthesize the base hit sound effect"""
     # Lower pitched beep at 500Hz
-    base_hit = generate_sine_wave(500, 0.2, volume=0.5)
-    wavfile.write('assets/sounds/base_hit.wav', 44100, base_hit)
+    return generate_sine_wave(500, 0.2, volume=0.5)
 
-def generate_warning_sound():
-    """Generate a warning sound effect"""
+def synthesize_warning():
+    """Synthesize the warning sound effect"""
     # Two quick beeps
     beep1 = generate_sine_wave(1000, 0.1, volume=0.4)
     beep2 = generate_sine_wave(1200, 0.1, volume=0.4)
     silence = np.zeros(2205, dtype=np.int16)  # 50ms of silence
-    warning = np.concatenate([beep1, silence, beep2])
-    wavfile.write('assets/sounds/warning.wav', 44100, warning)
+    return np.concatenate([beep1, silence, beep2])
+
+def synthesize_tick():
+    """Synthesize the tick sound effect for the countdown"""
+    return generate_sine_wave(1500, 0.05, volume=0.3)
+
+def synthesize_game_over():
+    """Synthesize the game over sound effect"""
+    # Descending tone
+    t = np.linspace(0, 1.5, int(SAMPLE_RATE * 1.5), False)
+    freq = np.linspace(1000, 200, len(t))
+    tone = np.sin(2 * np.pi * freq * t) * 0.5 * 32767
+    return tone.astype(np.int16)
+
+# Effect name (file name in assets/sounds without .wav) -> int16 mono samples at SAMPLE_RATE
+SYNTHESIZERS = {
+    'hit': synthesize_hit,
+    'base_hit': synthesize_base_hit,
+    'warning': synthesize_warning,
+    'tick': synthesize_tick,
+    'game_over': synthesize_game_over,
+}
+
+def _write(name, samples):
+    # scipy is only needed to write the files, not to synthesize them at runtime
+    from scipy.io import wavfile
+    wavfile.write(f'assets/sounds/{name}.wav', SAMPLE_RATE, samples)
+
+def generate_hit_sound():
+    """Generate a hit sound effect"""
+    _write('hit', synthesize_hit())
+
+def generate_base_hit_sound():
+    """Generate a base hit sound effect"""
+    _write('base_hit', synthesize_base_hit())
+
+def generate_warning_sound():
+    """Generate a warning sound effect"""
+    _write('warning', synthesize_warning())
 
 def generate_tick_sound():
     """Generate a tick sound effect for the countdown"""
-    tick = generate_sine_wave(1500, 0.05, volume=0.3)
-    wavfile.write('assets/sounds/tick.wav', 44100, tick)
+    _write('tick', synthesize_tick())
 
 def generate_game_over_sound():
     """Generate a game over sound effect"""
-    # Descending tone
-    t = np.linspace(0, 1.5, int(44100 * 1.5), False)
-    freq = np.linspace(1000, 200, len(t))
-    tone = np.sin(2 * np.pi * freq * t) * 0.5 * 32767
-    wavfile.write('assets/sounds/game_over.wav', 44100, tone.astype(np.int16))
+    _write('game_over', synthesize_game_over())
 
 if __name__ == "__main__":
     # Create sounds directory if it doesn't exist
     os.makedirs('assets/sounds', exist_ok=True)
-    
+
     # Generate all sound effects
     print("Generating sound effects...")
     generate_hit_sound()
@@ -4,8 +4,20 @@ setup(
     name="laser_tag",
     version="0.1",
     packages=find_packages(),
+    py_modules=['generate_sounds'],
     install_requires=[
         'PyQt6>=6.4.0',
     ],
+    extras_require={
+        # NumPy software mixer (create_audio_player('mixer'))
+        'mixer': ['numpy>=1.21'],
+        # Regenerating assets/sounds with generate_sounds.py
+        'sounds': ['numpy>=1.21', 'scipy'],
+    },
     python_requires='>=3.8',
+    entry_points={
+        'console_scripts': [
+            'laser-tag-server=src.server:main',
+        ],
+    },
 )
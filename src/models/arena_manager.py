@@ -0,0 +1,286 @@
+import queue
+import selectors
+import socket
+import threading
+from typing import Callable, Dict, List, Optional
+
+from .game_model import GameModel, GameSettings
+from .game_session import GameSession
+from .network_service import NetworkService
+from .protocol import PROTOCOL_V1, arena_of
+
+def _ignore(*_):
+    pass
+
+class Arena:
+    """One arena hosted by an ArenaManager, with its own game, session, parser and sender"""
+
+    def __init__(self, arena_id: int, game_model: GameModel, network: NetworkService,
+                 sock: Optional[socket.socket] = None):
+        self.arena_id = arena_id
+        self.game_model = game_model
+        self.network = network
+        self.session = GameSession(game_model, network)
+        self.sock = sock  # Own receive socket, None when routed by arena ID on the shared port
+        self.datagrams = 0
+        self.events = 0
+
+    @property
+    def rx_port(self) -> Optional[int]:
+        return self.sock.getsockname()[1] if self.sock is not None else None
+
+class ArenaManager:
+    """Hosts several independent games behind one receive loop
+
+    Datagrams are routed to an arena by the port they arrive on (arenas with
+    their own rx port) or, on the shared port, by the arena ID carried in the
+    v2 flags byte. Receiving, scoring and every arena's countdown run on one
+    thread, so games need no locking and cannot see each other's state: each
+    arena has its own GameModel, event log, parser and GameClock.
+
+    Arenas can be added and removed from any thread. The arena table is
+    replaced rather than modified in place, so the loop always iterates a
+    consistent snapshot; sockets are registered and closed on the loop
+    thread. A stopped manager cannot be started again.
+    """
+
+    BUFFER_SIZE = 1024
+    RCVBUF = 1 << 20
+
+    def __init__(self, host: str = '127.0.0.1', shared_port: Optional[int] = None, max_batch: int = 512):
+        """Create the manager
+
+        Args:
+            host: Broadcast address for arena transmissions
+            shared_port: Port receiving v2 traffic for any arena, routed by arena ID (optional)
+            max_batch: Upper bound on datagrams drained from one socket per wakeup
+        """
+        self.host = host
+        self.max_batch = max_batch
+        self.arenas: Dict[int, Arena] = {}  # Replaced on every change, never modified in place
+        self._arenas_lock = threading.Lock()
+        self.unrouted = 0  # Shared-port datagrams with no matching arena
+
+        # Called on the loop thread after each batch: on_applied(arena, events, sounds)
+        self.on_applied: Callable[[Arena, list, set], None] = _ignore
+        self.on_error: Callable[[str], None] = print
+        # Called on the loop thread after every loop cycle, at least every max_wait seconds if set
+        self.on_cycle: Callable[[], None] = _ignore
+        self.max_wait: Optional[float] = None
+
+        self._selector = selectors.DefaultSelector()
+        self._calls: queue.SimpleQueue = queue.SimpleQueue()
+        self._wake_reader, self._wake_writer = socket.socketpair()
+        self._wake_reader.setblocking(False)
+        self._selector.register(self._wake_reader, selectors.EVENT_READ, None)
+        self._thread: Optional[threading.Thread] = None
+        self._loop_thread_id: Optional[int] = None
+        self._running = False
+
+        self.shared_sock: Optional[socket.socket] = None
+        if shared_port is not None:
+            self.shared_sock = self._bind(shared_port)
+            self._selector.register(self.shared_sock, selectors.EVENT_READ, self.shared_sock)
+
+    def _bind(self, port: int) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.RCVBUF)
+        sock.bind(('', port))
+        sock.setblocking(False)
+        return sock
+
+    def add_arena(self, arena_id: int, red_team: list, green_team: list, rx_port: Optional[int] = None,
+                  tx_port: int = 7500, settings: Optional[GameSettings] = None,
+                  protocol: str = PROTOCOL_V1, game_model: Optional[GameModel] = None) -> Arena:
+        """Add an arena
+
+        Args:
+            arena_id: 0-255; also the ID routed on the shared port
+            rx_port: Port of the arena's own receive socket (0 picks a free port).
+                None routes the arena through the shared port by arena ID.
+            tx_port: Port arena broadcasts are sent to
+            game_model: Existing game to host, e.g. one recovered from its journal
+        """
+        if arena_id in self.arenas:
+            raise ValueError(f"Arena {arena_id} already exists")
+        if not 0 <= arena_id <= 255:
+            raise ValueError("Arena IDs must fit the v2 flags byte (0-255)")
+        if rx_port is None and self.shared_sock is None:
+            raise ValueError("Arena needs an rx_port when the manager has no shared port")
+
+        sock = self._bind(rx_port) if rx_port is not None else None
+        network = NetworkService(self.host, tx_port, rx_port or 0, batch_mode=True, max_batch=self.max_batch,
+                                 protocol=protocol)
+        network.arena = arena_id
+        network.on_error = self.on_error
+        network.attach(sock if sock is not None else self.shared_sock)
+
+        if game_model is None:
+            game_model = GameModel(red_team, green_team, settings)
+        arena = Arena(arena_id, game_model, network, sock)
+        with self._arenas_lock:
+            if arena_id in self.arenas:
+                network.stop()
+                if sock is not None:
+                    sock.close()
+                raise ValueError(f"Arena {arena_id} already exists")
+            self.arenas = {**self.arenas, arena_id: arena}
+        if sock is not None:
+            self.call_in_loop(self._selector.register, sock, selectors.EVENT_READ, arena)
+        return arena
+
+    def remove_arena(self, arena_id: int):
+        """End an arena's game and close its socket"""
+        with self._arenas_lock:
+            arenas = dict(self.arenas)
+            arena = arenas.pop(arena_id)
+            self.arenas = arenas
+        self.call_in_loop(self._close_arena, arena)
+
+    def _close_arena(self, arena: Arena):
+        if arena.game_model.is_running:
+            arena.session.end()
+        arena.network.stop()
+        if arena.sock is not None:
+            self._selector.unregister(arena.sock)
+            arena.sock.close()
+
+    def start_game(self, arena_id: int):
+        """Start the game in one arena"""
+        self.call_in_loop(self.arenas[arena_id].session.start)
+
+    def end_game(self, arena_id: int):
+        """End the game in one arena"""
+        self.call_in_loop(self.arenas[arena_id].session.end)
+
+    def call_in_loop(self, func, *args):
+        """Run func on the loop thread, or right away if the loop is not running"""
+        if not self._running or threading.get_ident() == self._loop_thread_id:
+            func(*args)
+            return
+        self._calls.put((func, args))
+        self._wake_writer.send(b'\0')
+
+    def start(self):
+        """Run the receive loop on a background thread"""
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the loop, end running games and close every socket"""
+        if self._thread is not None:
+            self._running = False
+            self._wake_writer.send(b'\0')
+            self._thread.join(timeout=2)
+            self._thread = None
+        with self._arenas_lock:
+            arenas, self.arenas = self.arenas, {}
+        for arena in arenas.values():
+            self._close_arena(arena)
+        if self.shared_sock is not None:
+            self._selector.unregister(self.shared_sock)
+            self.shared_sock.close()
+            self.shared_sock = None
+        self._selector.close()
+        self._wake_reader.close()
+        self._wake_writer.close()
+
+    def run(self):
+        """Receive, route and apply datagrams and tick every arena until stop()"""
+        self._running = True
+        self._loop_thread_id = threading.get_ident()
+        buffer = bytearray(self.BUFFER_SIZE)
+        view = memoryview(buffer)
+        while self._running:
+            # One failing arena or callback must not stop the loop for every other arena
+            try:
+                ready = self._selector.select(self._time_until_tick())
+            except Exception as e:
+                self.on_error(f"Arena loop error: {e}")
+                continue
+            for key, _ in ready:
+                try:
+                    if key.data is None:
+                        self._run_calls()
+                    elif key.data is self.shared_sock:
+                        self._drain(key.fileobj, None, buffer, view)
+                    else:
+                        self._drain(key.fileobj, key.data, buffer, view)
+                except Exception as e:
+                    self.on_error(f"Arena loop error: {e}")
+
+            for arena in self.arenas.values():
+                try:
+                    if arena.session.clock.due():
+                        arena.session.tick()
+                except Exception as e:
+                    self.on_error(f"Arena {arena.arena_id} tick failed: {e}")
+            try:
+                self.on_cycle()
+            except Exception as e:
+                self.on_error(f"Arena loop error: {e}")
+        self._loop_thread_id = None
+
+    def _time_until_tick(self) -> Optional[float]:
+        """Seconds until the next arena tick (None if no game is running)"""
+        timeout = self.max_wait
+        for arena in self.arenas.values():
+            remaining = arena.session.clock.time_until_tick()
+            if remaining is not None and (timeout is None or remaining < timeout):
+                timeout = remaining
+        return timeout
+
+    def _run_calls(self):
+        try:
+            while self._wake_reader.recv(256):
+                pass
+        except BlockingIOError:
+            pass
+        while True:
+            try:
+                func, args = self._calls.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                func(*args)
+            except Exception as e:
+                self.on_error(f"Arena call failed: {e}")
+
+    def _drain(self, sock: socket.socket, arena: Optional[Arena], buffer: bytearray, view: memoryview):
+        """Read every queued datagram from a socket and apply each arena's events as one batch"""
+        batches: Dict[Arena, List] = {}
+        for _ in range(self.max_batch):
+            try:
+                nbytes = sock.recv_into(buffer)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as e:
+                self.on_error(f"Receive error: {e}")
+                break
+            if not nbytes:
+                continue
+            data = view[:nbytes]
+            target = arena
+            if target is None:
+                target = self.arenas.get(arena_of(data))
+                if target is None:
+                    self.unrouted += 1
+                    continue
+            target.datagrams += 1
+            events = batches.get(target)
+            if events is None:
+                events = batches[target] = []
+            target.network.parse_into(events, data)
+
+        for target, events in batches.items():
+            if not events:
+                continue
+            target.events += len(events)
+            sounds = target.session.apply_batch(events)
+            if sounds:
+                target.session.on_change(False)
+            self.on_applied(target, events, sounds)
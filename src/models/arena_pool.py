@@ -0,0 +1,365 @@
+import multiprocessing
+import os
+import random
+import shutil
+import struct
+import tempfile
+import time
+from dataclasses import replace
+from multiprocessing.connection import Connection, wait
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .arena_manager import ArenaManager
+from .game_journal import GameJournal
+from .game_model import GameModel, GameSettings
+from .player_model import Player
+from .protocol import PROTOCOL_V1, NetworkEvent, EVENT_PLAYER_HIT
+
+# Worker -> parent messages are tagged bytes; parent -> worker messages are pickled tuples
+MSG_SNAPSHOT = b'S'
+MSG_READY = b'R'      # payload: bound rx port
+MSG_LOAD_DONE = b'L'  # payload: hits applied, seconds
+
+SNAPSHOT_HEADER = struct.Struct('<HBxiiIiH')  # arena, running, red, green, events, remaining, players
+SNAPSHOT_PLAYER = struct.Struct('<IiB')       # equipment ID, score, base hit
+READY = struct.Struct('<H')
+LOAD_DONE = struct.Struct('<Id')
+
+class ArenaSnapshot(NamedTuple):
+    """Compact score state of one arena, as published by its worker"""
+    arena_id: int
+    running: bool
+    red_score: int
+    green_score: int
+    events: int        # Network events applied by the worker
+    remaining: int     # Seconds left in the game
+    players: Tuple[Tuple[int, int, bool], ...]  # (equipment_id, score, base_hit)
+
+def pack_snapshot(arena_id: int, game_model: GameModel, events: int) -> bytes:
+    players = game_model.red_team + game_model.green_team
+    header = SNAPSHOT_HEADER.pack(arena_id, game_model.is_running, game_model.red_score, game_model.green_score,
+                                  events, game_model.get_remaining_time(), len(players))
+    pack = SNAPSHOT_PLAYER.pack
+    return MSG_SNAPSHOT + header + b''.join(pack(p.equipment_id, p.score, bool(p.base_hit)) for p in players)
+
+def unpack_snapshot(data: bytes) -> ArenaSnapshot:
+    arena_id, running, red, green, events, remaining, count = SNAPSHOT_HEADER.unpack_from(data, 1)
+    start = 1 + SNAPSHOT_HEADER.size
+    body = data[start:start + count * SNAPSHOT_PLAYER.size]
+    players = tuple((eid, score, bool(base)) for eid, score, base in SNAPSHOT_PLAYER.iter_unpack(body))
+    return ArenaSnapshot(arena_id, bool(running), red, green, events, remaining, players)
+
+class _SnapshotPublisher:
+    """Sends an arena's snapshot to the parent at most once per interval (runs on the worker loop)"""
+
+    def __init__(self, conn: Connection, arena, interval: float):
+        self.conn = conn
+        self.arena = arena
+        self.interval = interval
+        self.dirty = True
+        self._last = 0.0
+
+    def mark_dirty(self, *_):
+        self.dirty = True
+
+    def maybe_publish(self):
+        if not self.dirty:
+            return
+        now = time.monotonic()
+        if now - self._last < self.interval:
+            return
+        self.publish(now)
+
+    def publish(self, now: float = None):
+        self._last = time.monotonic() if now is None else now
+        self.dirty = False
+        try:
+            self.conn.send_bytes(pack_snapshot(self.arena.arena_id, self.arena.game_model, self.arena.events))
+        except (BrokenPipeError, OSError):
+            pass
+
+def _synthetic_load(arena, hits: int, seed: int) -> float:
+    """Apply `hits` generated hits through the arena's session; returns seconds spent"""
+    rng = random.Random(seed)
+    red_ids = [p.equipment_id for p in arena.game_model.red_team]
+    green_ids = [p.equipment_id for p in arena.game_model.green_team]
+    batch = [NetworkEvent(EVENT_PLAYER_HIT, rng.choice(red_ids), rng.choice(green_ids)) for _ in range(256)]
+    begin = time.perf_counter()
+    for _ in range(hits // len(batch)):
+        arena.session.apply_batch(batch)
+        arena.events += len(batch)
+    return time.perf_counter() - begin
+
+def _worker_main(arena_id: int, roster: List[tuple], settings: GameSettings, rx_port: int, tx_port: int,
+                 protocol: str, recover: bool, conn: Connection, snapshot_interval: float):
+    """Worker process: host one arena and serve commands from the parent"""
+    game_model = None
+    if recover and settings.journal_path and GameJournal.is_unfinished(settings.journal_path):
+        try:
+            game_model = GameModel.from_journal(settings.journal_path, settings, resume=True)
+        except Exception as e:
+            print(f"Arena {arena_id}: could not recover from journal: {e}")
+    if game_model is None:
+        teams = {'red': [], 'green': []}
+        for player_id, code_name, equipment_id, team in roster:
+            teams[team].append(Player(player_id, code_name, equipment_id, team))
+        game_model = GameModel(teams['red'], teams['green'], settings)
+
+    manager = ArenaManager()
+    manager.on_error = lambda message: None
+    manager.max_wait = snapshot_interval
+    arena = manager.add_arena(arena_id, game_model.red_team, game_model.green_team, rx_port=rx_port,
+                              tx_port=tx_port, protocol=protocol, game_model=game_model)
+    publisher = _SnapshotPublisher(conn, arena, snapshot_interval)
+    manager.on_applied = publisher.mark_dirty
+    manager.on_cycle = publisher.maybe_publish
+    arena.session.on_tick = publisher.mark_dirty
+    arena.session.on_game_end = publisher.publish
+
+    conn.send_bytes(MSG_READY + READY.pack(arena.rx_port))
+    if game_model.is_running:
+        # Recovered mid-game: keep the countdown going
+        manager.start_game(arena_id)
+    manager.start()
+
+    def run_load(hits: int, seed: int):
+        elapsed = _synthetic_load(arena, hits, seed)
+        publisher.publish()
+        conn.send_bytes(MSG_LOAD_DONE + LOAD_DONE.pack(hits - hits % 256, elapsed))
+
+    try:
+        while True:
+            command, *args = conn.recv()
+            if command == 'start':
+                manager.start_game(arena_id)
+            elif command == 'end':
+                manager.end_game(arena_id)
+            elif command == 'load':
+                manager.call_in_loop(run_load, *args)
+            elif command == 'crash':
+                os._exit(1)
+            elif command == 'stop':
+                break
+    except (EOFError, OSError):
+        pass
+    manager.stop()
+
+class _WorkerHandle:
+    def __init__(self, arena_id: int, roster: List[tuple], settings: GameSettings, rx_port: int,
+                 tx_port: int, protocol: str):
+        self.arena_id = arena_id
+        self.roster = roster
+        self.settings = settings
+        self.rx_port = rx_port
+        self.tx_port = tx_port
+        self.protocol = protocol
+        self.process: Optional[multiprocessing.Process] = None
+        self.conn: Optional[Connection] = None
+        self.restarts = 0
+        self.failed_starts = 0  # Consecutive restarts that died before reporting ready
+        self.retry_at: Optional[float] = None  # When to try again after a failed restart
+
+class ArenaWorkerPool:
+    """Runs each arena's engine in its own worker process
+
+    Workers receive their arena's traffic directly on its rx port, so scoring
+    in different arenas runs in parallel instead of sharing one GIL. The
+    operator process only receives compact ArenaSnapshot messages over each
+    worker's pipe. Every arena is journaled, so a worker that dies is
+    restarted and resumes the game from the arena's journal. A worker that
+    dies again before it is ready is retried with exponential backoff.
+    """
+
+    READY_TIMEOUT = 10.0  # Seconds a new worker has to bind its port and report ready
+    RETRY_DELAY = 0.5     # Seconds before the first retry of a failed restart; doubles up to MAX_RETRY_DELAY
+    MAX_RETRY_DELAY = 30.0
+
+    def __init__(self, journal_dir: Optional[str] = None, snapshot_interval: float = 0.05,
+                 context: Optional[str] = None):
+        """Create the pool
+
+        Args:
+            journal_dir: Directory for per-arena journals (default: a temporary directory removed by stop())
+            snapshot_interval: Minimum seconds between snapshots from one worker
+            context: multiprocessing start method (default: the platform default)
+        """
+        self._temporary_dir = None
+        if journal_dir is None:
+            journal_dir = self._temporary_dir = tempfile.mkdtemp(prefix='arena-journals-')
+        self.journal_dir = journal_dir
+        self.snapshot_interval = snapshot_interval
+        self._context = multiprocessing.get_context(context)
+        self.workers: Dict[int, _WorkerHandle] = {}
+        self.snapshots: Dict[int, ArenaSnapshot] = {}
+        self.load_results: Dict[int, Tuple[int, float]] = {}
+        self._stopping = False
+
+    def add_arena(self, arena_id: int, red_team: list, green_team: list, rx_port: int = 0,
+                  tx_port: int = 7500, settings: Optional[GameSettings] = None,
+                  protocol: str = PROTOCOL_V1) -> int:
+        """Start a worker for an arena
+
+        Returns:
+            int: The rx port the worker is listening on
+        """
+        if arena_id in self.workers:
+            raise ValueError(f"Arena {arena_id} already exists")
+        settings = settings or GameSettings()
+        os.makedirs(self.journal_dir, exist_ok=True)
+        settings = replace(settings, journal_path=os.path.join(self.journal_dir, f"arena-{arena_id}.journal"))
+        roster = [(p.player_id, p.code_name, p.equipment_id, team)
+                  for team, players in (('red', red_team), ('green', green_team)) for p in players]
+        handle = _WorkerHandle(arena_id, roster, settings, rx_port, tx_port, protocol)
+        if not self._spawn(handle, recover=False):
+            raise RuntimeError(f"Arena {arena_id} worker exited before it was ready")
+        self.workers[arena_id] = handle
+        return handle.rx_port
+
+    def _spawn(self, handle: _WorkerHandle, recover: bool) -> bool:
+        """Start a worker and wait for it to report ready
+
+        Returns:
+            bool: False if the worker died or timed out first (it is cleaned up)
+        """
+        parent_conn, child_conn = self._context.Pipe()
+        handle.process = self._context.Process(
+            target=_worker_main, daemon=True,
+            args=(handle.arena_id, handle.roster, handle.settings, handle.rx_port, handle.tx_port,
+                  handle.protocol, recover, child_conn, self.snapshot_interval),
+        )
+        handle.process.start()
+        child_conn.close()
+        handle.conn = parent_conn
+        # The first message reports the port, so a restart can bind the same one
+        try:
+            if not parent_conn.poll(self.READY_TIMEOUT):
+                raise TimeoutError
+            message = parent_conn.recv_bytes()
+        except (EOFError, OSError):
+            self._reap(handle)
+            return False
+        if message[:1] == MSG_READY:
+            handle.rx_port = READY.unpack_from(message, 1)[0]
+        return True
+
+    def _reap(self, handle: _WorkerHandle):
+        """Make sure a worker is gone and close its pipe"""
+        if handle.process.is_alive():
+            handle.process.terminate()
+        handle.process.join()
+        handle.conn.close()
+
+    def _send(self, arena_id: int, *command):
+        try:
+            self.workers[arena_id].conn.send(command)
+        except (BrokenPipeError, OSError):
+            pass
+
+    def start_game(self, arena_id: int):
+        self._send(arena_id, 'start')
+
+    def end_game(self, arena_id: int):
+        self._send(arena_id, 'end')
+
+    def run_synthetic_load(self, arena_id: int, hits: int, seed: int = 1234):
+        """Have a worker apply generated hits (reported in load_results when done)"""
+        self._send(arena_id, 'load', hits, seed)
+
+    def poll(self, timeout: Optional[float] = 0.0) -> List[ArenaSnapshot]:
+        """Collect messages from the workers and restart any that died
+
+        Returns:
+            list: Snapshots received during this call, oldest first
+        """
+        received = []
+        handles = {}
+        retry_at = None
+        for handle in self.workers.values():
+            if handle.retry_at is not None:
+                # Waiting to retry a failed restart; do not sleep past it
+                retry_at = handle.retry_at if retry_at is None else min(retry_at, handle.retry_at)
+                continue
+            handles[handle.conn] = handle
+            handles[handle.process.sentinel] = handle
+        if retry_at is not None:
+            until_retry = max(0.0, retry_at - time.monotonic())
+            timeout = until_retry if timeout is None else min(timeout, until_retry)
+        restarted = set()
+        now = time.monotonic()
+        for handle in list(self.workers.values()):
+            if handle.retry_at is not None and handle.retry_at <= now:
+                self._restart(handle)
+                restarted.add(handle.arena_id)
+        if not handles:
+            if timeout:
+                time.sleep(timeout)
+            return received
+        for ready in wait(list(handles), timeout):
+            handle = handles[ready]
+            if handle.arena_id in restarted:
+                continue
+            if ready is handle.process.sentinel or not self._drain(handle, received):
+                self._restart(handle)
+                restarted.add(handle.arena_id)
+        return received
+
+    def _drain(self, handle: _WorkerHandle, received: list) -> bool:
+        """Read every queued message from one worker; False if its pipe closed"""
+        conn = handle.conn
+        try:
+            while conn.poll():
+                message = conn.recv_bytes()
+                tag = message[:1]
+                if tag == MSG_SNAPSHOT:
+                    snapshot = unpack_snapshot(message)
+                    self.snapshots[snapshot.arena_id] = snapshot
+                    received.append(snapshot)
+                elif tag == MSG_LOAD_DONE:
+                    self.load_results[handle.arena_id] = LOAD_DONE.unpack_from(message, 1)
+        except (EOFError, OSError):
+            return False
+        return True
+
+    def _restart(self, handle: _WorkerHandle):
+        """Replace a dead worker, resuming its game from the journal when possible"""
+        if self._stopping or handle.arena_id not in self.workers:
+            return
+        if handle.retry_at is None:
+            # Pipe closed under a live worker: stop it before replacing it
+            self._reap(handle)
+        handle.restarts += 1
+        if self._spawn(handle, recover=True):
+            handle.failed_starts = 0
+            handle.retry_at = None
+            return
+        handle.failed_starts += 1
+        delay = min(self.MAX_RETRY_DELAY, self.RETRY_DELAY * 2 ** (handle.failed_starts - 1))
+        handle.retry_at = time.monotonic() + delay
+
+    def remove_arena(self, arena_id: int):
+        handle = self.workers.pop(arena_id)
+        self._stop_worker(handle)
+        self.snapshots.pop(arena_id, None)
+
+    def _stop_worker(self, handle: _WorkerHandle):
+        if handle.retry_at is not None:
+            return  # Already reaped after a failed restart
+        try:
+            handle.conn.send(('stop',))
+        except (BrokenPipeError, OSError):
+            pass
+        handle.process.join(timeout=2)
+        if handle.process.is_alive():
+            handle.process.terminate()
+            handle.process.join()
+        handle.conn.close()
+
+    def stop(self):
+        """Stop every worker"""
+        self._stopping = True
+        for handle in self.workers.values():
+            self._stop_worker(handle)
+        self.workers.clear()
+        self._stopping = False
+        if self._temporary_dir is not None:
+            shutil.rmtree(self._temporary_dir, ignore_errors=True)
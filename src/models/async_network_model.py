@@ -0,0 +1,30 @@
+import asyncio
+from typing import Optional
+
+from .network_model import NetworkModel
+from .async_network_service import AsyncNetworkService
+from .protocol import PROTOCOL_V1
+
+
+class AsyncNetworkModel(NetworkModel):
+    """Qt adapter for the asyncio network engine (see AsyncNetworkService)"""
+
+    service_class = AsyncNetworkService
+
+    def __init__(self, host: str = '127.0.0.1', tx_port: int = 7500, rx_port: int = 7501,
+                 batch_mode: bool = False, max_batch: int = 512,
+                 protocol: str = PROTOCOL_V1, loop: Optional[asyncio.AbstractEventLoop] = None,
+                 batch_window: float = 0.001):
+        """Create the network service
+
+        Args:
+            loop: Event loop to run on. None starts a dedicated loop thread.
+            batch_window: In batch mode, seconds to coalesce datagrams before
+                emitting batch_received
+        """
+        super().__init__(host, tx_port, rx_port, batch_mode=batch_mode, max_batch=max_batch,
+                         protocol=protocol, loop=loop, batch_window=batch_window)
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        return self.service.loop
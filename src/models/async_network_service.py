@@ -0,0 +1,183 @@
+import asyncio
+import socket
+import threading
+from typing import Optional
+
+from .network_service import NetworkService
+from .protocol import PROTOCOL_V1
+
+
+class _DatagramReceiver(asyncio.DatagramProtocol):
+    """Forwards datagrams from the asyncio transport to the owning service"""
+
+    def __init__(self, owner: 'AsyncNetworkService'):
+        self.owner = owner
+
+    def datagram_received(self, data, addr):
+        self.owner._on_datagram(data)
+
+    def error_received(self, exc):
+        if self.owner.running:
+            self.owner.on_error(f"Receive error: {exc}")
+
+
+class AsyncNetworkService(NetworkService):
+    """asyncio-based network engine with the same public surface as NetworkService
+
+    By default the engine runs its own event loop on a dedicated thread. Pass
+    `loop` to run on an existing loop instead (for example a Qt-integrated
+    loop such as qasync's); start/stop/send must then be called from that
+    loop's thread. Send and receive share the one loop, and shutdown closes
+    the transport from inside the loop rather than pinging the socket.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', tx_port: int = 7500, rx_port: int = 7501,
+                 batch_mode: bool = False, max_batch: int = 512,
+                 protocol: str = PROTOCOL_V1, loop: Optional[asyncio.AbstractEventLoop] = None,
+                 batch_window: float = 0.001):
+        """Create the network service
+
+        Args:
+            loop: Event loop to run on. None starts a dedicated loop thread.
+            batch_window: In batch mode, seconds to coalesce datagrams before
+                calling on_batch
+        """
+        super().__init__(host, tx_port, rx_port, batch_mode=batch_mode, max_batch=max_batch,
+                         protocol=protocol)
+        self.loop = loop
+        self.batch_window = batch_window
+        self._owns_loop = loop is None
+        self._loop_thread: Optional[threading.Thread] = None
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self._pending: list = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    def start(self):
+        """Start the network service"""
+        if self.running:
+            return
+
+        try:
+            self.running = True
+            if self._owns_loop:
+                self.loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(target=self._run_loop, daemon=True)
+                self._loop_thread.start()
+                asyncio.run_coroutine_threadsafe(self._open_endpoint(), self.loop).result(timeout=5)
+                self.on_error(f"Network service started on port {self.rx_port}")
+            else:
+                # The caller's loop is already running on this thread
+                self.loop.create_task(self._open_endpoint()).add_done_callback(self._on_endpoint_opened)
+        except Exception as e:
+            self.on_error(f"Failed to start network service: {e}")
+            self.stop()
+
+    def _run_loop(self):
+        """Run the dedicated event loop until stop() halts it"""
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    async def _open_endpoint(self):
+        """Bind the receive socket and attach it to the loop"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if self.batch_mode:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.BATCH_RCVBUF)
+        sock.bind(('', self.rx_port))
+        sock.setblocking(False)
+        self.transport, _ = await self.loop.create_datagram_endpoint(
+            lambda: _DatagramReceiver(self), sock=sock
+        )
+
+    def _on_endpoint_opened(self, task: asyncio.Task):
+        """Report the outcome of opening the endpoint on an external loop"""
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            self.on_error(f"Failed to start network service: {task.exception()}")
+            self.stop()
+        else:
+            self.on_error(f"Network service started on port {self.rx_port}")
+
+    def stop(self):
+        """Stop the network service"""
+        self.running = False
+        if self.loop is None:
+            return
+
+        if self._owns_loop:
+            if self.loop.is_running():
+                self.loop.call_soon_threadsafe(self._shutdown)
+            if self._loop_thread:
+                self._loop_thread.join(timeout=2)
+                self._loop_thread = None
+            self.loop.close()
+            self.loop = None
+        else:
+            self._close_transport()
+
+    def _shutdown(self):
+        """Close the transport and halt the dedicated loop (runs on the loop)"""
+        self._close_transport()
+        # Let connection_lost run before the loop stops
+        self.loop.call_soon(self.loop.stop)
+
+    def _close_transport(self):
+        """Close the transport and drop any batch still being coalesced"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending = []
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+
+    def _on_datagram(self, data: bytes):
+        """Handle one datagram delivered by the transport"""
+        if not data or not self.running:
+            return
+
+        if not self.batch_mode:
+            self._process_received_data(data)
+            return
+
+        self._pending.append(data)
+        if len(self._pending) >= self.max_batch:
+            self._flush_batch()
+        elif self._flush_handle is None:
+            self._flush_handle = self.loop.call_later(self.batch_window, self._flush_batch)
+
+    def _flush_batch(self):
+        """Report the datagrams coalesced so far as one batch"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        datagrams, self._pending = self._pending, []
+        self._process_batch(datagrams)
+
+    def send_bytes(self, payload: bytes):
+        """Send a raw datagram to the broadcast address"""
+        if not self.running or self.transport is None:
+            self.on_error("Network service not running")
+            return False
+
+        try:
+            address = (self.host, self.tx_port)
+            if self._owns_loop:
+                # Hand the write to the loop thread so it never races the reader
+                self.loop.call_soon_threadsafe(self._send_on_loop, payload, address)
+            else:
+                self.transport.sendto(payload, address)
+            return True
+        except Exception as e:
+            self.on_error(f"Send error: {e}")
+            return False
+
+    def _send_on_loop(self, payload: bytes, address: tuple):
+        """Write a datagram from the loop thread"""
+        if self.transport is None:
+            return
+        try:
+            self.transport.sendto(payload, address)
+        except Exception as e:
+            self.on_error(f"Send error: {e}")
@@ -1,62 +1,332 @@
 import os
 import sqlite3
-from typing import Optional, Tuple
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+# Schema changes, applied in order; the database records how many have run in schema_version
+MIGRATIONS = [
+    # 1: players table (matches databases created before versioning)
+    '''
+    CREATE TABLE IF NOT EXISTS players (
+        id INTEGER PRIMARY KEY,
+        code_name TEXT NOT NULL,
+        team TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    ''',
+    # 2: when each player last played, to warm the code-name cache
+    '''
+    ALTER TABLE players ADD COLUMN last_active TIMESTAMP;
+    CREATE INDEX IF NOT EXISTS players_last_active ON players (last_active);
+    ''',
+    # 3: finished games, who played them and what happened
+    '''
+    CREATE TABLE IF NOT EXISTS matches (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        started_at REAL NOT NULL,
+        ended_at REAL NOT NULL,
+        duration INTEGER NOT NULL,
+        red_score INTEGER NOT NULL,
+        green_score INTEGER NOT NULL,
+        winner TEXT NOT NULL,
+        total_events INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS match_participants (
+        match_id INTEGER NOT NULL REFERENCES matches (id) ON DELETE CASCADE,
+        equipment_id INTEGER NOT NULL,
+        player_id INTEGER,
+        code_name TEXT NOT NULL,
+        team TEXT NOT NULL,
+        score INTEGER NOT NULL,
+        base_hit INTEGER NOT NULL,
+        PRIMARY KEY (match_id, equipment_id)
+    );
+    CREATE INDEX IF NOT EXISTS match_participants_player ON match_participants (player_id);
+    CREATE TABLE IF NOT EXISTS match_events (
+        match_id INTEGER NOT NULL REFERENCES matches (id) ON DELETE CASCADE,
+        seq INTEGER NOT NULL,
+        kind TEXT NOT NULL,
+        timestamp REAL NOT NULL,
+        shooter INTEGER,
+        target INTEGER,
+        delta INTEGER,
+        PRIMARY KEY (match_id, seq)
+    );
+    CREATE VIEW IF NOT EXISTS player_stats AS
+        SELECT player_id, COUNT(*) AS games_played, SUM(score) AS total_score, MAX(score) AS best_score,
+               SUM(base_hit) AS base_hits
+        FROM match_participants WHERE player_id IS NOT NULL GROUP BY player_id;
+    ''',
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+# SQLite's default limit on ? parameters in one statement is 999 on older builds
+MAX_QUERY_PARAMETERS = 900
+
+class CodeNameCache:
+    """Least-recently-used map of player ID -> code name"""
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, player_id: int) -> Optional[str]:
+        with self._lock:
+            code_name = self._entries.get(player_id)
+            if code_name is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(player_id)
+            self.hits += 1
+            return code_name
+
+    def put(self, player_id: int, code_name: str):
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            self._entries[player_id] = code_name
+            self._entries.move_to_end(player_id)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, player_id: int):
+        with self._lock:
+            self._entries.pop(player_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
 
 class DatabaseModel:
-    def __init__(self, db_path: str = 'data/laser_tag.db'):
-        """Initialize the database connection and create tables if they don't exist"""
+    """Player storage on SQLite
+
+    Each thread keeps one long-lived connection in WAL mode, so lookups
+    reuse the connection and its cached prepared statements instead of
+    opening the database per call. The schema is migrated once per
+    database file and process, tracked by the schema_version table.
+    Code names are served from an LRU cache that writes invalidate and
+    that starts out holding the most recently active players.
+    """
+
+    STATEMENT_CACHE_SIZE = 128
+
+    _initialized = set()  # Database paths whose schema is up to date in this process
+    _init_lock = threading.Lock()
+
+    def __init__(self, db_path: str = 'data/laser_tag.db', cache_size: int = 1024, warm_cache: bool = True):
+        """Initialize the database connection and create tables if they don't exist
+
+        Args:
+            cache_size: Capacity of the code-name cache (0 disables it)
+            warm_cache: Preload the cache with the most recently active players
+        """
         self.db_path = db_path
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self.cache = CodeNameCache(cache_size)
+        self.lookup_seconds = None  # Histogram of SQL lookups, set by bind_metrics()
         self._create_tables()
-    
-    def _get_connection(self):
-        """Create a database connection and return the connection object"""
+        if warm_cache:
+            self.warm_cache()
+
+    def bind_metrics(self, registry):
+        """Report cache hits and misses and the time of lookups that reach SQLite to a MetricsRegistry"""
+        cache = self.cache
+        registry.counter('player_cache_lookups_total', 'Code-name cache lookups', {'result': 'hit'},
+                         read=lambda: cache.hits)
+        registry.counter('player_cache_lookups_total', 'Code-name cache lookups', {'result': 'miss'},
+                         read=lambda: cache.misses)
+        self.lookup_seconds = registry.histogram('db_lookup_seconds', 'Time of player lookups that query SQLite')
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _connect(self) -> sqlite3.Connection:
         # Create the data directory if it doesn't exist
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        return sqlite3.connect(self.db_path)
-    
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, cached_statements=self.STATEMENT_CACHE_SIZE)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')  # Durable across crashes of the app in WAL mode
+        conn.execute('PRAGMA busy_timeout=5000')
+        return conn
+
     def _create_tables(self):
-        """Create the players table if it doesn't exist"""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS players (
-                    id INTEGER PRIMARY KEY,
-                    code_name TEXT NOT NULL,
-                    team TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            conn.commit()
-    
+        """Bring the schema up to date (once per database file and process)"""
+        key = os.path.abspath(self.db_path) if self.db_path != ':memory:' else None
+        if key in DatabaseModel._initialized:
+            return
+        with DatabaseModel._init_lock:
+            if key in DatabaseModel._initialized:
+                return
+            conn = self._get_connection()
+            with conn:
+                conn.execute('CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)')
+                row = conn.execute('SELECT version FROM schema_version').fetchone()
+                version = row[0] if row else 0
+                if row is None:
+                    conn.execute('INSERT INTO schema_version (version) VALUES (0)')
+            for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+                conn.executescript(f'BEGIN;\n{migration}\nUPDATE schema_version SET version = {number};\nCOMMIT;')
+            if key is not None:
+                DatabaseModel._initialized.add(key)
+
+    @property
+    def schema_version(self) -> int:
+        row = self._get_connection().execute('SELECT version FROM schema_version').fetchone()
+        return row[0] if row else 0
+
+    def close(self):
+        """Close every thread's connection"""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.ProgrammingError:
+                pass  # Closed from a thread other than its own; it goes with that thread
+        self._local = threading.local()
+
+    def warm_cache(self, limit: Optional[int] = None):
+        """Fill the code-name cache with the most recently active players"""
+        limit = self.cache.capacity if limit is None else min(limit, self.cache.capacity)
+        if limit <= 0:
+            return
+        rows = self._get_connection().execute(
+            'SELECT id, code_name FROM players WHERE last_active IS NOT NULL '
+            'ORDER BY last_active DESC LIMIT ?', (limit,)
+        ).fetchall()
+        # Least recent first, so the most recent end up at the fresh end of the LRU
+        for player_id, code_name in reversed(rows):
+            self.cache.put(player_id, code_name)
+
     def get_player(self, player_id: int) -> Optional[Tuple[int, str]]:
         """Get a player by ID. Returns (player_id, code_name) or None if not found"""
+        code_name = self.cache.get(player_id)
+        if code_name is not None:
+            return player_id, code_name
+        lookup_seconds = self.lookup_seconds
+        if lookup_seconds is not None:
+            begin = time.perf_counter()
+        row = self._get_connection().execute('SELECT id, code_name FROM players WHERE id = ?', (player_id,)).fetchone()
+        if lookup_seconds is not None:
+            lookup_seconds.observe(time.perf_counter() - begin)
+        if row is not None:
+            self.cache.put(*row)
+        return row
+
+    def get_players(self, player_ids: Iterable[int]) -> Dict[int, str]:
+        """Look up many players at once. Returns {player_id: code_name} for the IDs that exist"""
+        found = {}
+        missing = []
+        for player_id in dict.fromkeys(player_ids):
+            code_name = self.cache.get(player_id)
+            if code_name is None:
+                missing.append(player_id)
+            else:
+                found[player_id] = code_name
+
+        if not missing:
+            return found
+        lookup_seconds = self.lookup_seconds
+        if lookup_seconds is not None:
+            begin = time.perf_counter()
+        conn = self._get_connection()
+        for start in range(0, len(missing), MAX_QUERY_PARAMETERS):
+            chunk = missing[start:start + MAX_QUERY_PARAMETERS]
+            placeholders = ','.join('?' * len(chunk))
+            for player_id, code_name in conn.execute(
+                    f'SELECT id, code_name FROM players WHERE id IN ({placeholders})', chunk):
+                found[player_id] = code_name
+                self.cache.put(player_id, code_name)
+        if lookup_seconds is not None:
+            lookup_seconds.observe(time.perf_counter() - begin)
+        return found
+
+    def mark_active(self, player_ids: Iterable[int]):
+        """Record that these players just played (used to warm the cache next time)"""
+        player_ids = list(player_ids)
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT id, code_name FROM players WHERE id = ?', (player_id,))
-            return cursor.fetchone()
-    
+            for start in range(0, len(player_ids), MAX_QUERY_PARAMETERS):
+                chunk = player_ids[start:start + MAX_QUERY_PARAMETERS]
+                placeholders = ','.join('?' * len(chunk))
+                conn.execute(f'UPDATE players SET last_active = CURRENT_TIMESTAMP WHERE id IN ({placeholders})',
+                             chunk)
+
     def add_player(self, player_id: int, code_name: str, team: str = None) -> bool:
         """Add a new player to the database. Returns True if successful, False if player ID already exists"""
         try:
             with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
+                conn.execute(
                     'INSERT INTO players (id, code_name, team) VALUES (?, ?, ?)',
                     (player_id, code_name, team)
                 )
-                conn.commit()
-                return True
+            self.cache.invalidate(player_id)
+            return True
         except sqlite3.IntegrityError:
             # Player ID already exists
             return False
-    
+
+    def save_matches(self, results: Iterable) -> list:
+        """Store finished games (MatchResult tuples) in one transaction
+
+        Returns:
+            list: The new match IDs, in order
+        """
+        match_ids = []
+        with self._get_connection() as conn:
+            for result in results:
+                cursor = conn.execute(
+                    'INSERT INTO matches (started_at, ended_at, duration, red_score, green_score, winner, total_events) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (result.started_at, result.ended_at, result.duration, result.red_score, result.green_score,
+                     result.winner, result.total_events)
+                )
+                match_id = cursor.lastrowid
+                conn.executemany(
+                    'INSERT INTO match_participants (match_id, equipment_id, player_id, code_name, team, score, base_hit) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    [(match_id, *participant) for participant in result.participants]
+                )
+                conn.executemany(
+                    'INSERT INTO match_events (match_id, seq, kind, timestamp, shooter, target, delta) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    [(match_id, seq, *event) for seq, event in enumerate(result.events)]
+                )
+                match_ids.append(match_id)
+        return match_ids
+
+    def get_player_stats(self, player_id: int) -> Optional[Tuple[int, int, int, int]]:
+        """Returns (games_played, total_score, best_score, base_hits) or None if the player never finished a game"""
+        return self._get_connection().execute(
+            'SELECT games_played, total_score, best_score, base_hits FROM player_stats WHERE player_id = ?',
+            (player_id,)
+        ).fetchone()
+
     def update_player_team(self, player_id: int, team: str) -> bool:
         """Update a player's team. Returns True if successful, False if player not found"""
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
+            cursor = conn.execute(
                 'UPDATE players SET team = ? WHERE id = ?',
                 (team, player_id)
             )
-            conn.commit()
-            return cursor.rowcount > 0
+        self.cache.invalidate(player_id)
+        return cursor.rowcount > 0
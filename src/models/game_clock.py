@@ -0,0 +1,42 @@
+import time
+from typing import Callable, Optional
+
+class GameClock:
+    """Fixed-interval tick schedule for game loops that are not driven by a QTimer
+
+    Ticks are scheduled from the start time rather than from the previous
+    tick, so one late tick does not delay every tick after it.
+    """
+
+    def __init__(self, interval: float = 1.0, time_source: Callable[[], float] = time.monotonic):
+        self.interval = interval
+        self.time_source = time_source
+        self._next_tick: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._next_tick is not None
+
+    def start(self):
+        """Schedule the first tick one interval from now"""
+        self._next_tick = self.time_source() + self.interval
+
+    def stop(self):
+        self._next_tick = None
+
+    def time_until_tick(self) -> Optional[float]:
+        """Seconds until the next tick is due (None when stopped)"""
+        if self._next_tick is None:
+            return None
+        return max(0.0, self._next_tick - self.time_source())
+
+    def due(self) -> bool:
+        """Whether a tick is due; consumes it (and any ticks missed while busy)"""
+        if self._next_tick is None:
+            return False
+        now = self.time_source()
+        if now < self._next_tick:
+            return False
+        while self._next_tick <= now:
+            self._next_tick += self.interval
+        return True
@@ -0,0 +1,118 @@
+import json
+import time
+from collections import deque
+from typing import Callable, Iterator, List, NamedTuple, Optional
+
+# Event kinds
+EVENT_GAME_START = 'game_start'
+EVENT_GAME_END = 'game_end'
+EVENT_HIT = 'hit'
+EVENT_FRIENDLY_FIRE = 'friendly_fire'
+EVENT_BASE_HIT = 'base_hit'
+EVENT_FINAL_SCORE = 'final_score'  # shooter/target carry the red/green totals
+
+class GameEvent(NamedTuple):
+    """One entry in the game log, stored unformatted"""
+    kind: str
+    timestamp: float
+    shooter: Optional[int] = None  # Equipment ID
+    target: Optional[int] = None   # Equipment ID
+    delta: Optional[int] = None    # Score change for the shooter
+
+# Builds an event from a complete field tuple, skipping NamedTuple argument handling
+_make_event = tuple.__new__
+
+class JsonLinesEventSink:
+    """Spills every logged event to a JSON-lines file so the full history survives the ring buffer"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+        self._size = 0  # Size of the file when it was closed
+
+    def write(self, event: GameEvent):
+        self._file.write(json.dumps(event))
+        self._file.write('\n')
+
+    def flush(self):
+        self._file.flush()
+
+    def tell(self) -> int:
+        """Flush and return the size of the file, to read it back up to this point later"""
+        if self._file.closed:
+            return self._size
+        self._file.flush()
+        return self._file.tell()
+
+    def close(self):
+        if not self._file.closed:
+            self._size = self._file.tell()
+            self._file.close()
+
+    @staticmethod
+    def read(path: str, end: Optional[int] = None) -> Iterator[GameEvent]:
+        """Read back the events written to a sink file, up to byte offset `end` if given"""
+        position = 0
+        with open(path, 'rb') as f:
+            for line in f:
+                position += len(line)
+                if end is not None and position > end:
+                    return
+                if line.strip():
+                    yield GameEvent(*json.loads(line))
+
+class EventLog:
+    """Bounded ring buffer of structured game events
+
+    Only the newest `capacity` events are kept in memory. Events are stored as
+    plain tuples and turned into text only when a view asks for them. An
+    optional sink receives every event to keep the full history on disk.
+    """
+
+    def __init__(self, capacity: int = 1000, sink: Optional[JsonLinesEventSink] = None,
+                 clock: Callable[[], float] = time.time):
+        self.capacity = capacity
+        self.sink = sink
+        self.clock = clock
+        self._events = deque(maxlen=capacity)
+        self.total_events = 0  # Including those evicted from the buffer
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __iter__(self) -> Iterator[GameEvent]:
+        return iter(self._events)
+
+    def record(self, kind: str, shooter: int = None, target: int = None, delta: int = None,
+               timestamp: float = None) -> GameEvent:
+        """Append an event, stamping it with the clock unless a timestamp is given"""
+        if timestamp is None:
+            timestamp = self.clock()
+        event = _make_event(GameEvent, (kind, timestamp, shooter, target, delta))
+        self._events.append(event)
+        self.total_events += 1
+        if self.sink is not None:
+            self.sink.write(event)
+        return event
+
+    def recent(self, count: int) -> List[GameEvent]:
+        """The newest `count` events, oldest first"""
+        if count <= 0:
+            return []
+        events = self._events
+        if count >= len(events):
+            return list(events)
+        return [events[i] for i in range(len(events) - count, len(events))]
+
+    def clear(self):
+        self._events.clear()
+
+    def flush(self):
+        """Flush the sink, if any"""
+        if self.sink is not None:
+            self.sink.flush()
+
+    def close(self):
+        """Close the sink, if any"""
+        if self.sink is not None:
+            self.sink.close()
@@ -0,0 +1,232 @@
+import mmap
+import os
+import struct
+import threading
+from typing import Iterator, NamedTuple, Optional
+
+# Record opcodes
+OP_ROSTER = 1     # a=player_id, b=equipment_id, flags=team (0 red, 1 green), payload=code name
+OP_START = 2      # timestamp=start time, a=game duration (s), b=pack_points(points per hit, points per base)
+OP_HIT = 3        # a=shooter equipment ID, b=target equipment ID
+OP_BASE_HIT = 4   # a=player equipment ID
+OP_END = 5        # Game ended normally
+OP_ABORT = 6      # Game screen closed before the game ended
+OP_REMOVE = 7     # a=equipment ID of a player removed mid-game
+
+TEAM_CODES = {'red': 0, 'green': 1}
+TEAM_NAMES = {code: team for team, code in TEAM_CODES.items()}
+
+MAGIC = b'LTGJ'
+VERSION = 1
+HEADER = struct.Struct('<4sHH')         # magic, version, state
+STATE = struct.Struct('<H')
+STATE_OFFSET = 6
+
+# Journal states kept in the header so detection does not scan the records
+STATE_EMPTY = 0
+STATE_RUNNING = 1
+STATE_CLOSED = 2
+RECORD = struct.Struct('<BBHdii')       # op, flags, payload length, timestamp, a, b
+POINTS = struct.Struct('<hh')           # Two signed 16-bit point values sharing one int field
+_INT = struct.Struct('<i')
+
+def pack_points(per_hit: int, per_base: int) -> int:
+    """Points per hit (low half) and per base (high half) as one signed 32-bit record field"""
+    return _INT.unpack(POINTS.pack(per_hit, per_base))[0]
+
+def unpack_points(value: int) -> tuple:
+    """(points per hit, points per base) from a field written by pack_points, signs intact"""
+    return POINTS.unpack(_INT.pack(value))
+
+class JournalRecord(NamedTuple):
+    op: int
+    flags: int
+    timestamp: float
+    a: int
+    b: int
+    payload: bytes
+
+class GameJournal:
+    """Append-only, memory-mapped binary journal of everything applied to a game
+
+    Records are written straight into a shared mapping of the journal file,
+    so they reach the OS page cache (and survive a crash of this process) as
+    soon as append() returns. Durability against an OS crash comes from an
+    fsync issued off the hot path, either by a background thread every
+    `flush_interval` seconds or by an explicit flush().
+    """
+
+    def __init__(self, path: str, flush_interval: Optional[float] = 1.0, chunk_size: int = 1 << 20):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.chunk_size = chunk_size
+        self._fd: Optional[int] = None
+        self._map: Optional[mmap.mmap] = None
+        self._size = 0
+        self._offset = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._flush_stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._map is not None
+
+    def open(self):
+        """Start a new journal, replacing any previous file"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._map_file(os.O_RDWR | os.O_CREAT | os.O_TRUNC, self.chunk_size)
+        HEADER.pack_into(self._map, 0, MAGIC, VERSION, STATE_EMPTY)
+        self._offset = HEADER.size
+        self._start_flusher()
+
+    def resume(self):
+        """Reopen an existing journal and continue appending after its last record"""
+        end = HEADER.size
+        for record in self.read(self.path):
+            end += RECORD.size + len(record.payload)
+        self._map_file(os.O_RDWR, max(os.path.getsize(self.path), end + self.chunk_size))
+        self._offset = end
+        self._start_flusher()
+
+    def _map_file(self, flags: int, size: int):
+        self._fd = os.open(self.path, flags, 0o644)
+        os.ftruncate(self._fd, size)
+        self._size = size
+        self._map = mmap.mmap(self._fd, size)
+
+    def _start_flusher(self):
+        if self.flush_interval and self._flusher is None:
+            self._flush_stop.clear()
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self):
+        """Background fsync so the writer never waits on the disk"""
+        while not self._flush_stop.wait(self.flush_interval):
+            self.flush()
+
+    def append(self, op: int, timestamp: float, a: int = 0, b: int = 0, flags: int = 0, payload: bytes = b''):
+        """Append one record"""
+        if self._map is None:
+            return
+        end = self._offset + RECORD.size + len(payload)
+        if end > self._size:
+            self._grow(end)
+        RECORD.pack_into(self._map, self._offset, op, flags, len(payload), timestamp, a, b)
+        if payload:
+            self._map[self._offset + RECORD.size:end] = payload
+        self._offset = end
+        self._dirty = True
+
+    def _set_state(self, state: int):
+        if self._map is not None:
+            STATE.pack_into(self._map, STATE_OFFSET, state)
+
+    def _grow(self, needed: int):
+        """Extend the file and mapping by whole chunks"""
+        with self._lock:
+            size = self._size
+            while size < needed:
+                size += self.chunk_size
+            self._map.close()
+            os.ftruncate(self._fd, size)
+            self._size = size
+            self._map = mmap.mmap(self._fd, size)
+
+    def flush(self):
+        """Force written records to disk"""
+        with self._lock:
+            if self._fd is None or not self._dirty:
+                return
+            self._dirty = False
+            # fsync covers the shared mapping's dirty pages and releases the GIL
+            os.fsync(self._fd)
+
+    def close(self):
+        """Flush, trim the file to the written length and close it"""
+        if self._flusher is not None:
+            self._flush_stop.set()
+            self._flusher.join()
+            self._flusher = None
+        if self._map is None:
+            return
+        self.flush()
+        with self._lock:
+            self._map.close()
+            self._map = None
+            os.ftruncate(self._fd, self._offset)
+            os.close(self._fd)
+            self._fd = None
+
+    # Typed helpers used by GameModel
+
+    def log_roster(self, player, team: str):
+        player_id = player.player_id if player.player_id is not None else -1
+        self.append(OP_ROSTER, 0.0, player_id, player.equipment_id, TEAM_CODES[team],
+                    (player.code_name or '').encode('utf-8'))
+
+    def log_remove(self, equipment_id: int):
+        self.append(OP_REMOVE, 0.0, equipment_id)
+
+    def log_start(self, timestamp: float, settings):
+        self.append(OP_START, timestamp, settings.game_duration,
+                    pack_points(settings.points_per_hit, settings.points_per_base))
+        self._set_state(STATE_RUNNING)
+
+    def log_hit(self, timestamp: float, shooter_id: int, target_id: int):
+        self.append(OP_HIT, timestamp, shooter_id, target_id)
+
+    def log_base_hit(self, timestamp: float, player_id: int):
+        self.append(OP_BASE_HIT, timestamp, player_id)
+
+    def log_end(self, timestamp: float):
+        self.append(OP_END, timestamp)
+        self._set_state(STATE_CLOSED)
+
+    def log_abort(self, timestamp: float):
+        self.append(OP_ABORT, timestamp)
+        self._set_state(STATE_CLOSED)
+
+    # Reading
+
+    @staticmethod
+    def read(path: str) -> Iterator[JournalRecord]:
+        """Yield the valid records of a journal, stopping at the first torn or empty slot"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < HEADER.size:
+            return
+        magic, version, _ = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a game journal: {path}")
+
+        offset = HEADER.size
+        limit = len(data) - RECORD.size
+        view = memoryview(data)
+        while offset <= limit:
+            op, flags, length, timestamp, a, b = RECORD.unpack_from(data, offset)
+            if op == 0:
+                # Zero-filled space past the last record
+                return
+            end = offset + RECORD.size + length
+            if end > len(data):
+                return
+            yield JournalRecord(op, flags, timestamp, a, b, bytes(view[offset + RECORD.size:end]) if length else b'')
+            offset = end
+
+    @staticmethod
+    def is_unfinished(path: str) -> bool:
+        """Whether the journal holds a started game that never ended or was closed"""
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(HEADER.size)
+        except OSError:
+            return False
+        if len(header) < HEADER.size:
+            return False
+        magic, version, state = HEADER.unpack(header)
+        return magic == MAGIC and version == VERSION and state == STATE_RUNNING
@@ -1,9 +1,22 @@
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple
+from dataclasses import dataclass, field, replace
+from typing import Callable, Iterable, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 import random
 import os
+import time
 from pathlib import Path
+from .leaderboard import Leaderboard
+from .game_events import (
+    EventLog, GameEvent, JsonLinesEventSink, EVENT_GAME_START, EVENT_GAME_END, EVENT_HIT,
+    EVENT_FRIENDLY_FIRE, EVENT_BASE_HIT, EVENT_FINAL_SCORE
+)
+from .game_journal import (
+    GameJournal, JournalRecord, OP_ROSTER, OP_REMOVE, OP_START, OP_HIT, OP_BASE_HIT, OP_END, OP_ABORT, TEAM_NAMES,
+    unpack_points
+)
+
+# Outcomes counted by the hits_total metric
+HIT_OUTCOMES = ('hit', 'friendly_fire', 'base_hit', 'rejected')
 
 @dataclass
 class GameSettings:
@@ -12,16 +25,28 @@ class GameSettings:
     points_per_hit: int = 10
     points_per_base: int = 100
     music_dir: str = str(Path(__file__).parent.parent / "assets" / "sounds")
+    event_log_capacity: int = 1000  # Events kept in memory for the log view
+    event_log_spill_path: Optional[str] = None  # JSON-lines file receiving the full history
+    journal_path: Optional[str] = None  # Binary journal used to recover the game after a crash
 
 class GameModel:
-    def __init__(self, red_team: list, green_team: list):
-        self.settings = GameSettings()
+    def __init__(self, red_team: list, green_team: list, settings: Optional[GameSettings] = None,
+                 clock: Callable[[], float] = time.time):
+        """Create a game
+        
+        Args:
+            clock: Returns the current time in epoch seconds; replays inject their own
+        """
+        self.settings = settings or GameSettings()
+        self.clock = clock
         self.red_team = red_team
         self.green_team = green_team
         self.start_time: Optional[datetime] = None
         self.end_time: Optional[datetime] = None
         self.is_running: bool = False
-        self.game_log: List[str] = []
+        sink = JsonLinesEventSink(self.settings.event_log_spill_path) if self.settings.event_log_spill_path else None
+        self.game_log = EventLog(self.settings.event_log_capacity, sink=sink, clock=clock)
+        self.journal: Optional[GameJournal] = GameJournal(self.settings.journal_path) if self.settings.journal_path else None
         self.current_music: Optional[str] = None
         
         # Initialize scores
@@ -35,32 +60,138 @@ class GameModel:
         self.red_base_hit = False
         self.green_base_hit = False
         
+        # Roster index keyed by equipment ID and player ID so hit resolution
+        # never has to scan the teams
+        self._players_by_equipment: Dict[int, object] = {}
+        self._players_by_id: Dict[int, object] = {}
+        self._team_of: Dict[int, str] = {}  # equipment_id -> 'red' or 'green'
+        
+        # Players kept in score order per team and overall
+        self.leaderboards: Dict[str, Leaderboard] = {'red': Leaderboard(), 'green': Leaderboard()}
+        self.overall_leaderboard = Leaderboard()
+        self._roster_order = 0
+        self._ranking_deferred = False  # Set while replaying a journal
+        
+        # Hit counters by outcome, set by bind_metrics()
+        self.metrics: Optional[Dict[str, object]] = None
+        
         # Initialize player states
-        for player in self.red_team + self.green_team:
-            player.hit_base = False
-            player.recently_scored = False
+        for team_key, team in (('red', self.red_team), ('green', self.green_team)):
+            for player in team:
+                player.hit_base = False
+                player.recently_scored = False
+                self._index_player(player, team_key)
+        self._update_team_scores()
+    
+    def bind_metrics(self, registry):
+        """Count hits by outcome and report the roster size to a MetricsRegistry"""
+        self.metrics = {outcome: registry.counter('hits_total', 'Hits registered, by outcome', {'outcome': outcome})
+                        for outcome in HIT_OUTCOMES}
+        registry.gauge('players', 'Players in the current game', read=lambda: len(self._players_by_equipment))
+    
+    def _index_player(self, player, team_key: str):
+        """Add a player to the roster index and leaderboards"""
+        self._players_by_equipment[player.equipment_id] = player
+        if player.player_id is not None:
+            self._players_by_id[player.player_id] = player
+        self._team_of[player.equipment_id] = team_key
+        self.leaderboards[team_key].add(player, self._roster_order)
+        self.overall_leaderboard.add(player, self._roster_order)
+        self._roster_order += 1
+    
+    def add_player(self, player, team: str):
+        """Add a player to a team and keep the roster index up to date
+
+        A player whose equipment ID is already on the roster replaces the old
+        entry, so adding them again (e.g. on the other team) moves them.
+        """
+        self.remove_player(player.equipment_id)
+        player.hit_base = False
+        player.recently_scored = False
+        team_key = 'red' if team.lower() == 'red' else 'green'
+        if team_key == 'red':
+            self.red_team.append(player)
+        else:
+            self.green_team.append(player)
+        self._index_player(player, team_key)
+        self._apply_score_delta(player, player.score)
+        if self.journal is not None and self.journal.is_open:
+            self.journal.log_roster(player, team_key)
+    
+    def remove_player(self, equipment_id: int) -> bool:
+        """Remove a player by equipment ID. Returns False if the player is unknown"""
+        player = self._players_by_equipment.pop(equipment_id, None)
+        if player is None:
+            return False
+        if self._players_by_id.get(player.player_id) is player:
+            del self._players_by_id[player.player_id]
+        team_key = self._team_of.pop(equipment_id)
+        self.leaderboards[team_key].remove(equipment_id)
+        self.overall_leaderboard.remove(equipment_id)
+        for team in (self.red_team, self.green_team):
+            if player in team:
+                team.remove(player)
+        self._update_team_scores()
+        if self.journal is not None and self.journal.is_open:
+            self.journal.log_remove(equipment_id)
+        return True
+    
+    def get_player_by_equipment_id(self, equipment_id: int):
+        """Look up a player by equipment ID (None if not registered)"""
+        return self._players_by_equipment.get(equipment_id)
     
+    def get_player_by_id(self, player_id: int):
+        """Look up a player by player ID (None if not registered)"""
+        return self._players_by_id.get(player_id)
+
     def start_game(self):
         """Start a new game"""
-        self.start_time = datetime.now()
+        self._begin(datetime.fromtimestamp(self.clock()))
+        if self.journal is not None:
+            # The roster goes first so the journal alone can rebuild the game
+            self.journal.open()
+            for team_key, team in (('red', self.red_team), ('green', self.green_team)):
+                for player in team:
+                    self.journal.log_roster(player, team_key)
+            self.journal.log_start(self.start_time.timestamp(), self.settings)
+        self._select_music()
+    
+    def _begin(self, start_time: datetime):
+        """Mark the game as running from start_time"""
+        self.start_time = start_time
         self.end_time = self.start_time + timedelta(seconds=self.settings.game_duration)
         self.is_running = True
-        self.game_log.append(f"Game started at {self.start_time.strftime('%H:%M:%S')}")
-        self._select_music()
+        self.game_log.record(EVENT_GAME_START, timestamp=self.start_time.timestamp())
     
-    def end_game(self):
+    def end_game(self, timestamp: Optional[float] = None):
         """End the current game"""
         if self.is_running:
+            if timestamp is None:
+                timestamp = self.clock()
             self.is_running = False
-            self.game_log.append(f"Game ended at {datetime.now().strftime('%H:%M:%S')}")
-            self.game_log.append(f"Final Score - Red: {self.red_score} | Green: {self.green_score}")
+            self.game_log.record(EVENT_GAME_END, timestamp=timestamp)
+            self.game_log.record(EVENT_FINAL_SCORE, self.red_score, self.green_score, timestamp=timestamp)
+            self.game_log.close()
+            if self.journal is not None:
+                self.journal.log_end(timestamp)
+                self.journal.close()
+    
+    def close_journal(self):
+        """Close the journal and event spill file of a game that is being abandoned
+        
+        The game is marked as closed so it is not offered for recovery.
+        """
+        self.game_log.close()
+        if self.journal is not None and self.journal.is_open:
+            self.journal.log_abort(self.clock())
+            self.journal.close()
     
     def get_remaining_time(self) -> int:
         """Get remaining game time in seconds"""
         if not self.is_running or not self.end_time:
             return 0
         
-        remaining = (self.end_time - datetime.now()).total_seconds()
+        remaining = self.end_time.timestamp() - self.clock()
         return max(0, int(remaining))
     
     def format_time(self, seconds: int) -> str:
@@ -91,53 +222,71 @@ class GameModel:
         except Exception as e:
             print(f"Error selecting music: {e}")
     
-    def register_hit(self, shooter_id: int, target_id: int):
+    def register_hit(self, shooter_id: int, target_id: int, timestamp: Optional[float] = None):
         """Register a hit between players"""
+        metrics = self.metrics
         if not self.is_running:
+            if metrics is not None:
+                metrics['rejected'].inc()
             return False, "Game is not running"
         
         # Find shooter and target
-        shooter = None
-        target = None
-        
-        for player in self.red_team + self.green_team:
-            if player.equipment_id == shooter_id:
-                shooter = player
-            if player.equipment_id == target_id:
-                target = player
+        shooter = self._players_by_equipment.get(shooter_id)
+        target = self._players_by_equipment.get(target_id)
         
         if not shooter or not target:
+            if metrics is not None:
+                metrics['rejected'].inc()
             return False, "Invalid player IDs"
         
         # Check if shooter hit themselves
         if shooter_id == target_id:
+            if metrics is not None:
+                metrics['rejected'].inc()
             return False, "Cannot hit yourself"
         
+        if timestamp is None:
+            timestamp = self.clock()
+        
         # Calculate score change
         if shooter.team == target.team:
             # Friendly fire - deduct points
-            shooter.score -= self.settings.points_per_hit
-            self.game_log.append(f"Friendly fire! {shooter.code_name} hit {target.code_name} (-{self.settings.points_per_hit})")
+            delta = -self.settings.points_per_hit
+            self.game_log.record(EVENT_FRIENDLY_FIRE, shooter_id, target_id, delta, timestamp)
+            if metrics is not None:
+                metrics['friendly_fire'].inc()
         else:
             # Hit opponent - add points
-            shooter.score += self.settings.points_per_hit
-            self.game_log.append(f"{shooter.code_name} hit {target.code_name} (+{self.settings.points_per_hit})")
+            delta = self.settings.points_per_hit
+            self.game_log.record(EVENT_HIT, shooter_id, target_id, delta, timestamp)
+            if metrics is not None:
+                metrics['hit'].inc()
+        shooter.score += delta
         
         # Update team scores
-        self._update_team_scores()
+        self._apply_score_delta(shooter, delta)
+        if self.journal is not None:
+            self.journal.log_hit(timestamp, shooter_id, target_id)
         return True, "Hit registered"
     
-    def register_base_hit(self, player_id: int):
+    def register_base_hit(self, player_id: int, timestamp: Optional[float] = None):
         """Register a base hit"""
+        metrics = self.metrics
         if not self.is_running:
+            if metrics is not None:
+                metrics['rejected'].inc()
             return False, "Game is not running"
         
-        player = next((p for p in self.red_team + self.green_team if p.equipment_id == player_id), None)
+        player = self._players_by_equipment.get(player_id)
         if not player:
+            if metrics is not None:
+                metrics['rejected'].inc()
             return False, "Invalid player ID"
         
         # Check if player already hit a base
         if player.equipment_id in self.base_hitters:
+            if metrics is not None:
+                metrics['rejected'].inc()
             return False, "Already hit a base"
         
         # Award points and mark as base hitter
@@ -146,24 +295,142 @@ class GameModel:
         self.base_hitters.add(player.equipment_id)
         
         # Update team scores
-        self._update_team_scores()
+        self._apply_score_delta(player, self.settings.points_per_base)
         
-        self.game_log.append(f"{player.code_name} scored a base hit! (+{self.settings.points_per_base})")
+        if timestamp is None:
+            timestamp = self.clock()
+        self.game_log.record(EVENT_BASE_HIT, player.equipment_id, delta=self.settings.points_per_base,
+                             timestamp=timestamp)
+        if self.journal is not None:
+            self.journal.log_base_hit(timestamp, player.equipment_id)
+        if metrics is not None:
+            metrics['base_hit'].inc()
         return True, "Base hit registered"
     
+    @classmethod
+    def from_journal(cls, path: str, settings: Optional[GameSettings] = None,
+                     resume: bool = False) -> 'GameModel':
+        """Rebuild a game by replaying its journal
+        
+        Args:
+            path: Journal file written by a previous game
+            settings: Base settings; duration and points are taken from the journal
+            resume: Keep appending to the journal and pick music, to continue the game
+        
+        Returns:
+            GameModel: The game in the state of the last journaled record
+        """
+        model = cls.replay_records(GameJournal.read(path), settings)
+        if model is None:
+            raise ValueError(f"Journal has no game start: {path}")
+        if resume:
+            model.settings.journal_path = path
+            model.journal = GameJournal(path)
+            model.journal.resume()
+            model._select_music()
+        return model
+    
+    @classmethod
+    def replay_records(cls, records: Iterable[JournalRecord], settings: Optional[GameSettings] = None,
+                       clock: Callable[[], float] = time.time) -> Optional['GameModel']:
+        """Build a game by applying a stream of journal records, one game per stream
+        
+        Hits and base hits carry their own timestamps, so the result does not
+        depend on when or how fast the records are applied.
+        
+        Returns:
+            GameModel: The game after the last record, or None if the stream never started a game
+        """
+        from .player_model import Player
+        
+        teams = {'red': [], 'green': []}
+        model = None
+        try:
+            for op, flags, timestamp, a, b, payload in records:
+                if model is None:
+                    # Before the start only the roster matters
+                    if op == OP_ROSTER:
+                        team_key = TEAM_NAMES[flags]
+                        teams[team_key].append(Player(None if a < 0 else a, payload.decode('utf-8'), b, team_key))
+                    elif op == OP_START:
+                        points_per_hit, points_per_base = unpack_points(b)
+                        game_settings = replace(settings or GameSettings(), journal_path=None, game_duration=a,
+                                                points_per_hit=points_per_hit, points_per_base=points_per_base)
+                        model = cls(teams['red'], teams['green'], game_settings, clock)
+                        model._begin(datetime.fromtimestamp(timestamp))
+                        # Rank once at the end instead of after every replayed hit
+                        model._ranking_deferred = True
+                elif op == OP_HIT:
+                    model.register_hit(a, b, timestamp)
+                elif op == OP_BASE_HIT:
+                    model.register_base_hit(a, timestamp)
+                elif op == OP_ROSTER:
+                    team_key = TEAM_NAMES[flags]
+                    model.add_player(Player(None if a < 0 else a, payload.decode('utf-8'), b, team_key), team_key)
+                elif op == OP_REMOVE:
+                    model.remove_player(a)
+                elif op in (OP_END, OP_ABORT):
+                    model.end_game(timestamp)
+        finally:
+            if model is not None and model._ranking_deferred:
+                model._ranking_deferred = False
+                for leaderboard in (*model.leaderboards.values(), model.overall_leaderboard):
+                    leaderboard.rebuild()
+        return model
+    
+    def _apply_score_delta(self, player, delta: int):
+        """Apply a player's score change to the team total and leaderboards"""
+        if not delta:
+            return
+        team_key = self._team_of[player.equipment_id]
+        if team_key == 'red':
+            self.red_score += delta
+        else:
+            self.green_score += delta
+        if self._ranking_deferred:
+            return
+        self.leaderboards[team_key].update(player)
+        self.overall_leaderboard.update(player)
+    
     def _update_team_scores(self):
-        """Update team scores based on player scores"""
+        """Recompute team scores from scratch based on player scores"""
         self.red_score = sum(player.score for player in self.red_team)
         self.green_score = sum(player.score for player in self.green_team)
     
     def get_team_players_sorted(self, team: str) -> list:
         """Get players from a team, sorted by score (highest first)"""
-        team_players = [p for p in (self.red_team if team.lower() == 'red' else self.green_team)]
-        return sorted(team_players, key=lambda p: p.score, reverse=True)
+        return self.leaderboards['red' if team.lower() == 'red' else 'green'].top()
+    
+    def get_top_players(self, k: int, team: Optional[str] = None) -> list:
+        """Get the k highest-scoring players of a team, or overall if team is None"""
+        if team is None:
+            return self.overall_leaderboard.top(k)
+        return self.leaderboards['red' if team.lower() == 'red' else 'green'].top(k)
     
     def get_recent_events(self, count: int = 5) -> list:
-        """Get the most recent game events"""
-        return self.game_log[-count:] if self.game_log else []
+        """Get the most recent game events as display strings"""
+        return [self.format_event(event) for event in self.game_log.recent(count)]
+    
+    def _player_name(self, equipment_id: int) -> str:
+        player = self._players_by_equipment.get(equipment_id)
+        return player.code_name if player else f"#{equipment_id}"
+    
+    def format_event(self, event: GameEvent) -> str:
+        """Format a logged event for display"""
+        kind = event.kind
+        if kind == EVENT_HIT:
+            return f"{self._player_name(event.shooter)} hit {self._player_name(event.target)} (+{event.delta})"
+        if kind == EVENT_FRIENDLY_FIRE:
+            return f"Friendly fire! {self._player_name(event.shooter)} hit {self._player_name(event.target)} ({event.delta})"
+        if kind == EVENT_BASE_HIT:
+            return f"{self._player_name(event.shooter)} scored a base hit! (+{event.delta})"
+        if kind == EVENT_GAME_START:
+            return f"Game started at {datetime.fromtimestamp(event.timestamp).strftime('%H:%M:%S')}"
+        if kind == EVENT_GAME_END:
+            return f"Game ended at {datetime.fromtimestamp(event.timestamp).strftime('%H:%M:%S')}"
+        if kind == EVENT_FINAL_SCORE:
+            return f"Final Score - Red: {event.shooter} | Green: {event.target}"
+        return kind
     
     def get_scores(self) -> dict:
         """Get the current scores and team states
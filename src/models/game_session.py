@@ -0,0 +1,238 @@
+import queue
+import time
+from typing import Callable, Iterable, Optional, Set
+
+from .game_clock import GameClock
+from .game_model import GameModel
+from .protocol import NetworkEvent, EVENT_PLAYER_HIT, EVENT_BASE_HIT, EVENT_GAME_START, EVENT_GAME_END
+
+def _ignore(*_):
+    pass
+
+class SessionMetrics:
+    """Apply time and errors reported to a MetricsRegistry"""
+
+    def __init__(self, registry, session: 'GameSession'):
+        registry.counter('events_applied_total', 'Network events applied to the game',
+                         read=lambda: session.events_applied)
+        registry.gauge('queue_depth', 'Items waiting in a queue', {'queue': 'session_inbox'},
+                       read=session._inbox.qsize)
+        self.apply_seconds = registry.histogram('apply_seconds', 'Time to apply one batch of network events')
+        self.errors = registry.counter('apply_errors_total', 'Network events that raised while being applied')
+
+class GameSession:
+    """Runs one game without Qt: applies network events to a GameModel and keeps its countdown
+
+    The Qt view model drives a session from network signals and a QTimer;
+    the headless server drives it with run(). Either way the outcome is
+    reported through plain callbacks:
+        on_tick(remaining)  once per tick with the seconds left
+        on_warning()        when the warning period starts
+        on_change(urgent)   the scoreboard changed; urgent changes should be shown now
+        on_game_end()       the game ended by timer or by a received end code
+    """
+
+    def __init__(self, game_model: GameModel, network=None, tick_interval: float = 1.0):
+        """Create a session
+
+        Args:
+            network: NetworkService or NetworkModel used for start/end broadcasts (optional)
+            tick_interval: Seconds between ticks when run() drives the session
+        """
+        self.game_model = game_model
+        self.network = network
+        self.clock = GameClock(tick_interval)
+        self.on_tick: Callable[[int], None] = _ignore
+        self.on_warning: Callable[[], None] = _ignore
+        self.on_change: Callable[[bool], None] = _ignore
+        self.on_game_end: Callable[[], None] = _ignore
+        self.events_applied = 0
+        self._inbox: queue.SimpleQueue = queue.SimpleQueue()
+        self._stopping = False
+        self.metrics: Optional[SessionMetrics] = None  # Set by bind_metrics()
+
+    def bind_metrics(self, registry):
+        """Report applied events, apply time and errors (and the game's hits) to a MetricsRegistry"""
+        self.metrics = SessionMetrics(registry, self)
+        self.game_model.bind_metrics(registry)
+        if self.network is not None and hasattr(self.network, 'bind_metrics'):
+            self.network.bind_metrics(registry)
+
+    def report_error(self, error: Exception):
+        """Log an event that could not be applied"""
+        print(f"Error handling network data: {error}")
+        if self.metrics is not None:
+            self.metrics.errors.inc()
+
+    def start(self) -> bool:
+        """Start the game and network service
+
+        Returns:
+            bool: True if an already running (recovered) game was resumed
+        """
+        resumed = self.game_model.is_running
+        if not resumed:
+            self.game_model.start_game()
+        if self.network is not None:
+            self.network.start()
+            # A recovered game is already known to the devices
+            if not resumed:
+                self.network.broadcast_game_start()
+        self.clock.start()
+        return resumed
+
+    def end(self, broadcast: bool = True):
+        """End the game"""
+        self.clock.stop()
+        self.game_model.end_game()
+        if broadcast and self.network is not None:
+            self.network.broadcast_game_end()
+
+    def tick(self):
+        """Report the remaining time and end the game when it runs out"""
+        if not self.game_model.is_running:
+            return
+        remaining = self.game_model.get_remaining_time()
+        self.on_tick(remaining)
+
+        if remaining == self.game_model.settings.warning_time:
+            self.on_warning()
+
+        if remaining <= 0:
+            self.clock.stop()
+            self.game_model.end_game()
+            self.on_game_end()
+
+    def apply_event(self, data) -> Optional[str]:
+        """Apply one network event to the game model
+
+        Args:
+            data: A NetworkEvent, a dict with 'type' key, or a string (legacy)
+
+        Returns:
+            str: Sound effect to play if the event changed the score, else None
+        """
+        self.events_applied += 1
+        game_model = self.game_model
+
+        # Legacy dict events are converted so both take the same path
+        if isinstance(data, dict):
+            data = NetworkEvent.from_dict(data)
+
+        # Handle events parsed by the network service
+        if isinstance(data, NetworkEvent):
+            data_type = data.type
+            if data_type == EVENT_PLAYER_HIT:
+                shooter_id = data.shooter_id
+                target_id = data.target_id
+                if shooter_id is not None and target_id is not None:
+                    success, message = game_model.register_hit(shooter_id, target_id)
+                    if success:
+                        return 'hit'
+            elif data_type == EVENT_BASE_HIT:
+                base_team = data.base_team
+                # v2 packets identify the player who scored the base
+                player_id = data.player_id
+                if player_id:
+                    success, message = game_model.register_base_hit(player_id)
+                    if success:
+                        return 'base_hit'
+                elif base_team in ['red', 'green']:
+                    success, message = game_model.register_base_hit(base_team)
+                    if success:
+                        return 'base_hit'
+            elif data_type == EVENT_GAME_START and not game_model.is_running:
+                game_model.start_game()
+                self.clock.start()
+                self.on_change(False)
+            elif data_type == EVENT_GAME_END and game_model.is_running:
+                self.clock.stop()
+                game_model.end_game()
+                self.on_game_end()
+        # Handle legacy string format (for backward compatibility)
+        elif isinstance(data, str):
+            # Handle base hits (53 for red base, 43 for green base)
+            if data == "53":  # Red base hit
+                success, message = game_model.register_base_hit('red')
+                if success:
+                    return 'base_hit'
+            elif data == "43":  # Green base hit
+                success, message = game_model.register_base_hit('green')
+                if success:
+                    return 'base_hit'
+            # Handle hit events (format: "shooter_id:target_id")
+            elif ":" in data:
+                shooter_id, target_id = map(int, data.split(":"))
+                success, message = game_model.register_hit(shooter_id, target_id)
+                if success:
+                    return 'hit'
+            # Handle game control commands
+            elif data == "202" and not game_model.is_running:  # Start game
+                game_model.start_game()
+                self.clock.start()
+            elif data == "221" and game_model.is_running:  # End game
+                self.clock.stop()
+                game_model.end_game()
+                self.on_game_end()
+        return None
+
+    def apply_batch(self, events: Iterable) -> Set[str]:
+        """Apply a batch of network events
+
+        Returns:
+            set: Sound effects triggered by the batch
+        """
+        metrics = self.metrics
+        if metrics is not None:
+            begin = time.perf_counter()
+        sounds = set()
+        for data in events:
+            try:
+                sound = self.apply_event(data)
+            except Exception as e:
+                self.report_error(e)
+                continue
+            if sound:
+                sounds.add(sound)
+        if metrics is not None:
+            metrics.apply_seconds.observe(time.perf_counter() - begin)
+        return sounds
+
+    def run(self):
+        """Play the game on the calling thread until it ends or stop() is called
+
+        Network callbacks only queue events; they are applied here, so the
+        game model is never touched from the receive thread.
+        """
+        self._stopping = False
+        if self.network is not None:
+            self.network.on_event = self._inbox.put
+            self.network.on_batch = self._inbox.put
+        self.start()
+        self.tick()
+
+        while self.game_model.is_running and not self._stopping:
+            try:
+                item = self._inbox.get(timeout=self.clock.time_until_tick())
+            except queue.Empty:
+                item = None
+            if isinstance(item, list):
+                if self.apply_batch(item):
+                    self.on_change(False)
+            elif item is not None:
+                try:
+                    if self.apply_event(item):
+                        self.on_change(False)
+                except Exception as e:
+                    self.report_error(e)
+            if self.clock.due():
+                self.tick()
+
+        self.end()
+        if self.network is not None:
+            self.network.stop()
+
+    def stop(self):
+        """Ask run() to end the game and return; safe to call from any thread"""
+        self._stopping = True
+        self._inbox.put(None)
@@ -0,0 +1,145 @@
+import json
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Points each traced event passes, in order. 'sent' is the v2 device timestamp.
+POINTS = ('sent', 'arrived', 'parsed', 'delivered', 'applied', 'rendered')
+_SENT, _ARRIVED, _PARSED, _DELIVERED, _APPLIED, _RENDERED = range(len(POINTS))
+
+# Stage name -> (from point, to point)
+STAGES = {
+    'wire': (_SENT, _ARRIVED),          # Device to receive thread (includes the kernel queue)
+    'parse': (_ARRIVED, _PARSED),       # Parsing the datagram
+    'queue': (_PARSED, _DELIVERED),     # Waiting for the UI thread to pick up the batch
+    'apply': (_DELIVERED, _APPLIED),    # Applying the batch to the game model
+    'render': (_APPLIED, _RENDERED),    # Until the scoreboard showing it was updated
+    'total': (_SENT, _RENDERED),
+}
+
+PERCENTILES = (50, 95, 99)
+
+def now_us() -> float:
+    """Wall clock in microseconds, comparable with v2 device timestamps on the same host"""
+    return time.time_ns() / 1000
+
+def event_key(event) -> Optional[Tuple[int, int]]:
+    """(device, sequence number) of a v2 event, None for v1 events that carry neither"""
+    seq = getattr(event, 'seq', None)
+    if seq is None or getattr(event, 'device_ts', None) is None:
+        return None
+    return event.shooter_id or event.player_id or 0, seq
+
+def summarize(values: List[float]) -> dict:
+    """Count, mean, percentiles, max and a power-of-two histogram of latencies in microseconds"""
+    if not values:
+        return {'count': 0}
+    ordered = sorted(values)
+    summary = {'count': len(ordered), 'mean_us': sum(ordered) / len(ordered)}
+    for percentile in PERCENTILES:
+        summary[f'p{percentile}_us'] = ordered[min(len(ordered) - 1, len(ordered) * percentile // 100)]
+    summary['max_us'] = ordered[-1]
+    histogram = {}
+    for value in ordered:
+        bucket = 1 << max(0, int(value)).bit_length()  # Upper bound of the bucket, in us
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+    summary['histogram_us'] = {str(bucket): count for bucket, count in sorted(histogram.items())}
+    return summary
+
+class LatencyTracer:
+    """Timestamps v2 events at every stage from the device to the scoreboard
+
+    Events are correlated by (device, sequence number), so nothing has to be
+    added to the events themselves. The receive thread reports when each
+    datagram arrived and was parsed, the view model when a batch was
+    delivered to the UI thread and applied, and the view when it finished
+    updating the scoreboard; everything applied since the previous render is
+    credited to that render. With the asyncio engine in batch mode the
+    coalescing window is counted as part of 'wire'.
+    """
+
+    def __init__(self, max_samples: int = 200000, clock: Callable[[], float] = now_us):
+        """Create an empty tracer
+
+        Args:
+            max_samples: Completed events kept; later ones are only counted
+            clock: Microsecond clock shared by all stages
+        """
+        self.max_samples = max_samples
+        self.clock = clock
+        self.completed: List[list] = []
+        self.overflow = 0
+        self.untracked = 0  # Applied events that were never seen arriving (v1, or evicted)
+        self._pending: Dict[Tuple[int, int], list] = {}
+        self._applied: List[list] = []
+        self._lock = threading.Lock()
+
+    def parsed(self, events: Iterable, arrived: float):
+        """Record events parsed from a datagram that arrived at `arrived` (receive thread)"""
+        now = self.clock()
+        with self._lock:
+            pending = self._pending
+            for event in events:
+                key = event_key(event)
+                if key is not None:
+                    pending[key] = [event.device_ts, arrived, now]
+            while len(pending) > self.max_samples:
+                del pending[next(iter(pending))]  # Never applied, e.g. dropped as a duplicate later
+
+    def applied(self, events: Iterable, delivered: float):
+        """Record events applied to the game model after being delivered at `delivered` (UI thread)"""
+        now = self.clock()
+        with self._lock:
+            pending = self._pending
+            for event in events:
+                key = event_key(event)
+                record = pending.pop(key, None) if key is not None else None
+                if record is None:
+                    self.untracked += 1
+                    continue
+                record.append(delivered)
+                record.append(now)
+                self._applied.append(record)
+
+    def rendered(self):
+        """Record that the scoreboard now shows everything applied so far (UI thread)"""
+        now = self.clock()
+        with self._lock:
+            if not self._applied:
+                return
+            room = self.max_samples - len(self.completed)
+            for record in self._applied[:max(0, room)]:
+                record.append(now)
+                self.completed.append(record)
+            self.overflow += max(0, len(self._applied) - max(0, room))
+            self._applied = []
+
+    @property
+    def in_flight(self) -> int:
+        """Events seen arriving but not rendered yet"""
+        with self._lock:
+            return len(self._pending) + len(self._applied)
+
+    def stage_latencies(self, stage: str) -> List[float]:
+        """Microseconds spent in one stage by every completed event"""
+        start, end = STAGES[stage]
+        with self._lock:
+            return [record[end] - record[start] for record in self.completed]
+
+    def stats(self) -> Dict[str, dict]:
+        """Latency summary per stage (see summarize())"""
+        return {stage: summarize(self.stage_latencies(stage)) for stage in STAGES}
+
+    def export(self, path: str, **metadata):
+        """Write the per-stage summaries and any run metadata as JSON"""
+        report = {
+            'metadata': metadata,
+            'events': len(self.completed),
+            'overflow': self.overflow,
+            'untracked': self.untracked,
+            'in_flight': self.in_flight,
+            'stages': self.stats(),
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        return report
@@ -0,0 +1,142 @@
+from bisect import bisect_left, insort
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+class _SortedKeys:
+    """Sorted keys stored as a list of short sorted blocks
+
+    Blocks hold between 1 and 2 * LOAD keys and `_maxes` holds the last key
+    of each block. An insert or removal is a binary search over the block
+    maxima plus a binary search and a memmove inside one block, so its cost
+    is O(log n) plus a move of at most 2 * LOAD entries, however many keys
+    there are. A single sorted list would move O(n) entries per change.
+    """
+
+    LOAD = 64
+
+    def __init__(self, keys: Iterable[Tuple[int, int]] = ()):
+        self._blocks: List[list] = []
+        self._maxes: list = []
+        self._len = 0
+        self.reset(keys)
+
+    def reset(self, keys: Iterable[Tuple[int, int]]):
+        """Replace the contents with already sorted keys"""
+        keys = list(keys)
+        load = self.LOAD
+        self._blocks = [keys[i:i + load] for i in range(0, len(keys), load)]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._len = len(keys)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return chain.from_iterable(self._blocks)
+
+    def add(self, key: Tuple[int, int]):
+        blocks, maxes = self._blocks, self._maxes
+        if not blocks:
+            blocks.append([key])
+            maxes.append(key)
+            self._len = 1
+            return
+        i = bisect_left(maxes, key)
+        if i == len(maxes):
+            i -= 1  # Beyond every key: goes at the end of the last block
+        block = blocks[i]
+        insort(block, key)
+        maxes[i] = block[-1]
+        self._len += 1
+        if len(block) > 2 * self.LOAD:
+            # Split in half so both blocks stay between LOAD and 2 * LOAD
+            half = block[self.LOAD:]
+            del block[self.LOAD:]
+            blocks.insert(i + 1, half)
+            maxes[i] = block[-1]
+            maxes.insert(i + 1, half[-1])
+
+    def remove(self, key: Tuple[int, int]):
+        """Remove a key that is present"""
+        blocks, maxes = self._blocks, self._maxes
+        i = bisect_left(maxes, key)
+        block = blocks[i]
+        del block[bisect_left(block, key)]
+        self._len -= 1
+        if block:
+            maxes[i] = block[-1]
+        else:
+            del blocks[i]
+            del maxes[i]
+
+    def index(self, key: Tuple[int, int]) -> int:
+        """Position of a key that is present (sums the sizes of the blocks before it)"""
+        i = bisect_left(self._maxes, key)
+        return sum(len(block) for block in self._blocks[:i]) + bisect_left(self._blocks[i], key)
+
+class Leaderboard:
+    """Players kept in score order (highest first) as scores change
+
+    Each player has a sort key of (-score, order), where order is the player's
+    roster position, so ties keep roster order just like a stable sort. Keys
+    live in a blocked sorted list (see _SortedKeys): a score change removes
+    and re-inserts one key in O(log n) plus a bounded in-block move, and
+    top-K queries never re-sort.
+    """
+
+    def __init__(self):
+        self._keys = _SortedKeys()
+        self._players: Dict[int, object] = {}  # order -> player
+        self._key_of: Dict[int, Tuple[int, int]] = {}  # equipment_id -> key
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, equipment_id: int) -> bool:
+        return equipment_id in self._key_of
+
+    def add(self, player, order: int):
+        """Insert a player; `order` breaks score ties and must be unique"""
+        if player.equipment_id in self._key_of:
+            self.remove(player.equipment_id)
+        key = (-player.score, order)
+        self._keys.add(key)
+        self._players[order] = player
+        self._key_of[player.equipment_id] = key
+
+    def remove(self, equipment_id: int) -> bool:
+        """Remove a player. Returns False if the player is not on the board"""
+        key = self._key_of.pop(equipment_id, None)
+        if key is None:
+            return False
+        self._keys.remove(key)
+        del self._players[key[1]]
+        return True
+
+    def update(self, player):
+        """Re-rank a player after their score changed"""
+        old_key = self._key_of.get(player.equipment_id)
+        if old_key is None or old_key[0] == -player.score:
+            return
+        self._keys.remove(old_key)
+        new_key = (-player.score, old_key[1])
+        self._keys.add(new_key)
+        self._key_of[player.equipment_id] = new_key
+
+    def rebuild(self):
+        """Re-rank every player from their current score, e.g. after bulk score changes"""
+        keys = sorted((-player.score, order) for order, player in self._players.items())
+        self._keys.reset(keys)
+        players = self._players
+        self._key_of = {players[key[1]].equipment_id: key for key in keys}
+
+    def top(self, k: Optional[int] = None) -> list:
+        """The k highest-scoring players (all players if k is None)"""
+        keys = iter(self._keys) if k is None else islice(self._keys, k)
+        players = self._players
+        return [players[order] for _, order in keys]
+
+    def rank(self, equipment_id: int) -> Optional[int]:
+        """Zero-based rank of a player (None if not on the board)"""
+        key = self._key_of.get(equipment_id)
+        return None if key is None else self._keys.index(key)
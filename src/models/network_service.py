@@ -0,0 +1,301 @@
+import socket
+import threading
+import time
+from typing import Optional, Callable, Dict, Any
+from .protocol import (
+    CODE_GAME_START, CODE_GAME_END, CODE_RED_BASE, CODE_GREEN_BASE, OP_PLAYER_HIT,
+    DEVICE_OPERATOR, PROTOCOL_V1, PROTOCOL_V2, PacketParser, encode_v1, pack_v2
+)
+
+def _ignore(_):
+    pass
+
+class ReceiveMetrics:
+    """Packet counters and parse time reported to a MetricsRegistry"""
+    
+    def __init__(self, registry):
+        self.received = registry.counter('packets_received_total', 'Datagrams received')
+        self.parsed = registry.counter('events_parsed_total', 'Events parsed from received datagrams')
+        self.rejected = registry.counter('packets_rejected_total',
+                                         'Datagrams that failed to parse or carried no new event')
+        self.parse_seconds = registry.histogram('parse_seconds', 'Time to parse one datagram')
+    
+    def observe(self, seconds: float, events: int):
+        self.received.inc()
+        self.parse_seconds.observe(seconds)
+        if events:
+            self.parsed.inc(events)
+        else:
+            self.rejected.inc()
+
+class NetworkService:
+    """UDP send/receive for the laser tag system, with no Qt dependency
+    
+    Received events and errors are reported through plain callbacks, which
+    run on the receive thread:
+        on_event(NetworkEvent)  one per event when not in batch mode
+        on_batch(list)          one per drained batch in batch mode
+        on_error(str)           errors and status messages
+    """
+    
+    BUFFER_SIZE = 1024
+    BATCH_RCVBUF = 1 << 20  # Kernel receive buffer requested in batch mode
+    
+    def __init__(self, host: str = '127.0.0.1', tx_port: int = 7500, rx_port: int = 7501,
+                 batch_mode: bool = False, max_batch: int = 512, protocol: str = PROTOCOL_V1):
+        """Create the network service
+        
+        Args:
+            protocol: Wire format used for sending ('v1' text or 'v2' binary).
+                Received datagrams are auto-detected either way.
+            batch_mode: Drain every pending datagram per wakeup and call on_batch
+                once instead of on_event per packet
+            max_batch: Upper bound on datagrams parsed per batch
+        """
+        self.host = host
+        self.tx_port = tx_port
+        self.rx_port = rx_port
+        self.batch_mode = batch_mode
+        self.max_batch = max_batch
+        self.protocol = protocol
+        self.running = False
+        self.receive_thread: Optional[threading.Thread] = None
+        self.sock: Optional[socket.socket] = None
+        
+        # Callbacks for received data and errors
+        self.on_event: Callable[[Any], None] = _ignore
+        self.on_batch: Callable[[list], None] = _ignore
+        self.on_error: Callable[[str], None] = _ignore
+        
+        # Datagram parser; also holds the per-device v2 sequence counters
+        self.parser = PacketParser()
+        self.sequence_trackers = self.parser.sequence_trackers
+        # Our own v2 send sequence per device
+        self._tx_sequence: Dict[int, int] = {}
+        
+        # Optional PacketCapture recording every received datagram for replay
+        self.capture = None
+        # Optional LatencyTracer timestamping v2 events as they arrive and are parsed
+        self.tracer = None
+        # Set by bind_metrics()
+        self.metrics: Optional[ReceiveMetrics] = None
+        
+        # Arena ID stamped on outgoing v2 records (see ArenaManager)
+        self.arena = 0
+        # Set when the socket belongs to someone else, e.g. an ArenaManager
+        self._attached = False
+    
+    def bind_metrics(self, registry):
+        """Count received, parsed and rejected packets and time parsing in a MetricsRegistry"""
+        self.metrics = ReceiveMetrics(registry)
+    
+    def start(self):
+        """Start the network service"""
+        if self.running:
+            return
+            
+        try:
+            # Create UDP socket for receiving
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if self.batch_mode:
+                # Give the kernel room to queue a burst between wakeups
+                self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.BATCH_RCVBUF)
+            self.sock.bind(('', self.rx_port))
+            
+            # Start receive thread
+            self.running = True
+            self.receive_thread = threading.Thread(target=self._receive_loop, daemon=True)
+            self.receive_thread.start()
+            
+            self.on_error(f"Network service started on port {self.rx_port}")
+            
+        except Exception as e:
+            self.on_error(f"Failed to start network service: {e}")
+            self.stop()
+    
+    def attach(self, sock: socket.socket):
+        """Send through a socket owned and read by someone else
+        
+        No receive thread is started; the owner feeds received datagrams to
+        the parser itself. start() and stop() leave the socket alone.
+        """
+        self.sock = sock
+        self._attached = True
+        self.running = True
+    
+    def stop(self):
+        """Stop the network service"""
+        self.running = False
+        if self._attached:
+            self._attached = False
+            self.sock = None
+            return
+        if self.sock:
+            try:
+                # Send a dummy packet to unblock the receive thread
+                temp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                temp_sock.sendto(b'', ('127.0.0.1', self.rx_port))
+                temp_sock.close()
+                
+                self.sock.close()
+            except:
+                pass
+            finally:
+                self.sock = None
+    
+    def _receive_loop(self):
+        """Main receive loop running in a separate thread"""
+        # Datagrams land in one reusable buffer and are parsed in place
+        buffer = bytearray(self.BUFFER_SIZE)
+        view = memoryview(buffer)
+        while self.running and self.sock:
+            try:
+                nbytes, addr = self.sock.recvfrom_into(buffer)
+                
+                if self.batch_mode:
+                    self._emit_batch(self._drain_socket(buffer, view, nbytes))
+                    continue
+                
+                if not nbytes:
+                    continue
+                    
+                # Process the received data
+                self._process_received_data(view[:nbytes])
+                
+            except (socket.timeout, ConnectionResetError):
+                continue
+            except Exception as e:
+                if self.running:  # Only report errors if we're supposed to be running
+                    self.on_error(f"Receive error: {e}")
+                break
+    
+    def _drain_socket(self, buffer: bytearray, view: memoryview, nbytes: int) -> list:
+        """Parse the datagram in the buffer plus every datagram already queued, without blocking"""
+        events = []
+        self.parse_into(events, view[:nbytes])
+        flags = getattr(socket, 'MSG_DONTWAIT', 0)
+        if not flags:
+            # Platforms without MSG_DONTWAIT (Windows) toggle the socket instead
+            self.sock.setblocking(False)
+        try:
+            for _ in range(self.max_batch - 1):
+                try:
+                    nbytes, addr = self.sock.recvfrom_into(buffer, 0, flags)
+                except (BlockingIOError, InterruptedError):
+                    break
+                self.parse_into(events, view[:nbytes])
+        finally:
+            if not flags and self.sock:
+                self.sock.setblocking(True)
+        return events
+    
+    def parse_into(self, events: list, data):
+        """Parse one datagram and append its events, reporting parse errors
+
+        Also the entry point for owners of an attached socket (see attach()),
+        which read datagrams themselves.
+        """
+        if not data:
+            return
+        tracer = self.tracer
+        if tracer is not None:
+            arrived, first = tracer.clock(), len(events)
+        metrics = self.metrics
+        if metrics is not None:
+            begin, before = time.perf_counter(), len(events)
+        if self.capture is not None:
+            self.capture.write(data)
+        try:
+            events.extend(self.parser.parse(data))
+        except Exception as e:
+            self.on_error(f"Error processing data: {e}")
+        if tracer is not None:
+            tracer.parsed(events[first:], arrived)
+        if metrics is not None:
+            metrics.observe(time.perf_counter() - begin, len(events) - before)
+    
+    def _process_batch(self, datagrams: list):
+        """Parse a batch of datagrams and report them as one batch"""
+        events = []
+        for data in datagrams:
+            self.parse_into(events, data)
+        self._emit_batch(events)
+    
+    def _emit_batch(self, events: list):
+        """Report parsed events as one batch"""
+        if events:
+            self.on_batch(events)
+    
+    def _process_received_data(self, data):
+        """Process a received datagram (bytes or memoryview) and report its events"""
+        tracer = self.tracer
+        if tracer is not None:
+            arrived = tracer.clock()
+        metrics = self.metrics
+        if metrics is not None:
+            begin = time.perf_counter()
+        if self.capture is not None:
+            self.capture.write(data)
+        events = None
+        try:
+            events = self.parser.parse(data)
+            if metrics is not None:
+                metrics.observe(time.perf_counter() - begin, len(events))
+            if tracer is not None:
+                tracer.parsed(events, arrived)
+            for event in events:
+                self.on_event(event)
+        except Exception as e:
+            if metrics is not None and events is None:
+                metrics.observe(time.perf_counter() - begin, 0)
+            self.on_error(f"Error processing data: {e}")
+    
+    def get_link_stats(self) -> Dict[int, Dict[str, int]]:
+        """Per-device received/lost/duplicate counters for v2 traffic"""
+        return self.parser.link_stats()
+    
+    def send_data(self, data: str):
+        """Send data to the broadcast address"""
+        return self.send_bytes(data.encode('utf-8'))
+    
+    def send_bytes(self, payload: bytes):
+        """Send a raw datagram to the broadcast address"""
+        if not self.running or not self.sock:
+            self.on_error("Network service not running")
+            return False
+            
+        try:
+            self.sock.sendto(payload, (self.host, self.tx_port))
+            return True
+        except Exception as e:
+            self.on_error(f"Send error: {e}")
+            return False
+    
+    def send_opcode(self, opcode: int, shooter: int = 0, target: int = 0):
+        """Send one event in the configured wire format"""
+        if self.protocol == PROTOCOL_V2:
+            seq = self._tx_sequence.get(shooter, 0)
+            self._tx_sequence[shooter] = seq + 1
+            return self.send_bytes(pack_v2(opcode, shooter, target, seq, arena=self.arena))
+        return self.send_bytes(encode_v1(opcode, shooter, target))
+    
+    def broadcast_hit(self, shooter_id: int, target_id: int):
+        """Broadcast a hit event"""
+        return self.send_opcode(OP_PLAYER_HIT, shooter_id, target_id)
+    
+    def broadcast_game_start(self):
+        """Broadcast game start signal"""
+        return self.send_opcode(CODE_GAME_START, DEVICE_OPERATOR)
+    
+    def broadcast_game_end(self):
+        """Broadcast game end signal (sends 3 times)"""
+        for _ in range(3):
+            if not self.send_opcode(CODE_GAME_END, DEVICE_OPERATOR):
+                return False
+        return True
+    
+    def broadcast_base_hit(self, base_team: str, player_id: int = 0):
+        """Broadcast a base hit"""
+        code = CODE_RED_BASE if base_team.lower() == 'red' else CODE_GREEN_BASE
+        return self.send_opcode(code, player_id)
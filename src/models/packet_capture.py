@@ -0,0 +1,61 @@
+import struct
+import threading
+import time
+from typing import Callable, Iterator, Tuple
+
+MAGIC = b'LTPC'
+VERSION = 1
+HEADER = struct.Struct('<4sHH')     # magic, version, reserved
+RECORD = struct.Struct('<dH')       # arrival time, datagram length
+
+class PacketCapture:
+    """Records received datagrams with their arrival time so a game can be replayed later"""
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.clock = clock
+        self.packets = 0
+        self._lock = threading.Lock()  # Written from the receive thread, closed from the UI
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, 0))
+
+    def write(self, data, timestamp: float = None):
+        """Append one datagram (bytes or memoryview)"""
+        if timestamp is None:
+            timestamp = self.clock()
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(RECORD.pack(timestamp, len(data)))
+            self._file.write(data)
+            self.packets += 1
+
+    def flush(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    @staticmethod
+    def read(path: str) -> Iterator[Tuple[float, bytes]]:
+        """Yield (arrival time, datagram) pairs, stopping at a truncated record"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < HEADER.size:
+            return
+        magic, version, _ = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a packet capture: {path}")
+
+        offset = HEADER.size
+        while offset + RECORD.size <= len(data):
+            timestamp, length = RECORD.unpack_from(data, offset)
+            offset += RECORD.size
+            if offset + length > len(data):
+                return
+            yield timestamp, data[offset:offset + length]
+            offset += length
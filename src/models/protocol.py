@@ -0,0 +1,353 @@
+"""Wire formats spoken on the laser tag UDP ports
+
+v1 is the original UTF-8 text protocol from ruleset/network_codes.txt
+("shooter:target", "202", "221", "53", "43").
+
+v2 is a fixed-size binary record that carries the same codes plus a
+per-device sequence number and device timestamp. Several records may be
+packed back to back in one datagram. Every v2 record starts with V2_MAGIC,
+which is outside the ASCII range, so receivers can tell the two formats
+apart from the first byte of each datagram.
+
+Parsing works directly on the received bytes (or a memoryview over a reused
+receive buffer) and dispatches through a table of registered codes. Add new
+codes from network_codes.txt with register_code() rather than another branch
+in the parser.
+"""
+import struct
+import time
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# Control codes (ruleset/network_codes.txt); v2 reuses them as opcodes
+CODE_GAME_START = 202
+CODE_GAME_END = 221
+CODE_RED_BASE = 53
+CODE_GREEN_BASE = 43
+# v1 expresses a hit as "shooter:target" text; v2 needs an opcode for it
+OP_PLAYER_HIT = 1
+
+# v2 device IDs (shooter field) for senders that are not player equipment. Each
+# sender numbers its records separately, so they must not share an ID.
+DEVICE_CONTROLLER = 0  # Field controllers and senders that do not set one
+DEVICE_OPERATOR = 0xFFFF  # The game station or headless server
+DEVICE_GENERATOR = 0xFFFE  # traffic_generator.py
+
+V2_MAGIC = 0xB2
+# magic, opcode, flags (arena ID, 0 for single-arena venues), pad, shooter, target, sequence, device timestamp (us)
+V2_RECORD = struct.Struct('!BBBxHHIQ')
+V2_RECORD_SIZE = V2_RECORD.size
+V2_FLAGS_OFFSET = 2
+
+PROTOCOL_V1 = 'v1'
+PROTOCOL_V2 = 'v2'
+
+# Event types produced by the parser
+EVENT_PLAYER_HIT = 'player_hit'
+EVENT_BASE_HIT = 'base_hit'
+EVENT_GAME_START = 'game_start'
+EVENT_GAME_END = 'game_end'
+
+
+class NetworkEvent(NamedTuple):
+    """A parsed network event
+
+    A named tuple (so it has empty __slots__ and no per-event dict) that is
+    immutable, which lets the parser hand out preallocated instances for v1
+    control codes. get() is provided so code written against the old event
+    dicts keeps working.
+    """
+
+    type: str
+    shooter_id: Optional[int] = None
+    target_id: Optional[int] = None
+    base_team: Optional[str] = None
+    player_id: Optional[int] = None
+    seq: Optional[int] = None
+    device_ts: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'NetworkEvent':
+        """Build an event from the legacy dict format"""
+        return cls(data.get('type'), **{key: data[key] for key in cls._fields[1:] if key in data})
+
+    def get(self, key: str, default=None):
+        """Dict-style access to a field (default if unset)"""
+        value = getattr(self, key, None) if key in self._fields else None
+        return default if value is None else value
+
+    def to_dict(self) -> dict:
+        """Legacy dict form with only the fields that are set"""
+        return {key: value for key, value in zip(self._fields, self) if value is not None}
+
+
+# Builds an event from a complete field tuple without going through __new__'s argument handling
+_make_event = tuple.__new__
+
+
+# Dispatch tables built by register_code()
+_KIND_HIT, _KIND_BASE, _KIND_CONTROL = range(3)
+_OPCODES: Dict[int, Tuple[str, Optional[str], int]] = {}  # opcode -> (event type, base team, kind)
+_TEXT_CODES: Dict[bytes, NetworkEvent] = {}  # v1 text code -> preallocated event
+# v1 datagram -> parsed event. Seeded with the text codes; hits are added as they
+# are first seen, so a repeat "shooter:target" datagram costs one dict lookup.
+_V1_CACHE: Dict[bytes, NetworkEvent] = {}
+V1_CACHE_SIZE = 16384
+
+
+def register_code(code: int, event_type: str, base_team: str = None, text: bool = True):
+    """Register a network code with the parser
+
+    Args:
+        code: Numeric code (also the v2 opcode)
+        event_type: Event type the code produces
+        base_team: Team whose base was scored, for base codes
+        text: Also accept the code as a v1 text message
+    """
+    if event_type == EVENT_PLAYER_HIT:
+        kind = _KIND_HIT
+    elif base_team is not None:
+        kind = _KIND_BASE
+    else:
+        kind = _KIND_CONTROL
+    _OPCODES[code] = (event_type, base_team, kind)
+    if text:
+        text_code = str(code).encode('ascii')
+        _TEXT_CODES[text_code] = _V1_CACHE[text_code] = NetworkEvent(event_type, base_team=base_team)
+
+
+# ruleset/network_codes.txt
+register_code(OP_PLAYER_HIT, EVENT_PLAYER_HIT, text=False)
+register_code(CODE_GAME_START, EVENT_GAME_START)
+register_code(CODE_GAME_END, EVENT_GAME_END)
+register_code(CODE_RED_BASE, EVENT_BASE_HIT, base_team='red')
+register_code(CODE_GREEN_BASE, EVENT_BASE_HIT, base_team='green')
+
+
+def is_v2(data) -> bool:
+    """Check whether a datagram uses the v2 binary format"""
+    return len(data) >= V2_RECORD_SIZE and data[0] == V2_MAGIC
+
+
+def now_us() -> int:
+    """Device timestamp in microseconds since the epoch"""
+    return time.time_ns() // 1000
+
+
+def pack_v2(opcode: int, shooter: int = 0, target: int = 0, seq: int = 0, timestamp_us: int = None,
+            arena: int = 0) -> bytes:
+    """Encode a single v2 record"""
+    if timestamp_us is None:
+        timestamp_us = now_us()
+    return V2_RECORD.pack(V2_MAGIC, opcode, arena, shooter, target, seq & 0xFFFFFFFF, timestamp_us)
+
+
+def arena_of(data) -> Optional[int]:
+    """Arena ID carried in the flags byte of a v2 datagram (None for v1)"""
+    if len(data) >= V2_RECORD_SIZE and data[0] == V2_MAGIC:
+        return data[V2_FLAGS_OFFSET]
+    return None
+
+
+def pack_v2_records(records: Iterable[Tuple[int, int, int, int, int]]) -> bytes:
+    """Encode several (opcode, shooter, target, seq, timestamp_us) records into one datagram"""
+    return b''.join(pack_v2(*record) for record in records)
+
+
+def iter_v2_records(data: bytes) -> Iterator[Tuple[int, int, int, int, int, int]]:
+    """Yield (opcode, flags, shooter, target, seq, timestamp_us) for each record in a datagram
+
+    Raises:
+        ValueError: If the datagram is not a whole number of valid records
+    """
+    if len(data) % V2_RECORD_SIZE:
+        raise ValueError(f"Truncated v2 datagram ({len(data)} bytes)")
+    for magic, opcode, flags, shooter, target, seq, timestamp_us in V2_RECORD.iter_unpack(data):
+        if magic != V2_MAGIC:
+            raise ValueError(f"Bad v2 record magic 0x{magic:02x}")
+        yield opcode, flags, shooter, target, seq, timestamp_us
+
+
+def encode_v1(opcode: int, shooter: int = 0, target: int = 0) -> bytes:
+    """Encode an opcode as v1 text"""
+    if opcode == OP_PLAYER_HIT:
+        return f"{shooter}:{target}".encode('utf-8')
+    return str(opcode).encode('utf-8')
+
+
+class SequenceTracker:
+    """Tracks loss and duplicates for one device's sequence numbers
+
+    Keeps a bitmask of the last WINDOW sequence numbers seen so that late
+    (reordered) records are credited back instead of being counted as
+    duplicates. A device that restarts numbering starts a new epoch: a jump
+    back by WINDOW or more, or a repeated number stamped later than the
+    newest record seen, resets the tracker instead of being dropped.
+    """
+
+    WINDOW = 64
+    _WINDOW_MASK = (1 << WINDOW) - 1
+
+    def __init__(self):
+        self.highest = None
+        self.received = 0
+        self.lost = 0
+        self.duplicates = 0
+        self.resets = 0
+        self.highest_ts = None  # Device timestamp of the record carrying `highest`
+        self._seen = 0  # Bit i set => highest - i has been seen
+
+    def _reset(self, seq: int, timestamp_us: Optional[int]):
+        self.highest = seq
+        self.highest_ts = timestamp_us
+        self._seen = 1
+        self.received += 1
+
+    def observe(self, seq: int, timestamp_us: Optional[int] = None) -> bool:
+        """Record a sequence number (and its device timestamp). Returns False if it is a duplicate"""
+        highest = self.highest
+        if highest is not None and seq == highest + 1:
+            # In-order fast path
+            self.highest = seq
+            self.highest_ts = timestamp_us
+            self._seen = ((self._seen << 1) | 1) & self._WINDOW_MASK
+            self.received += 1
+            return True
+
+        if highest is None:
+            self._reset(seq, timestamp_us)
+            return True
+
+        # Sequence numbers are 32-bit and wrap
+        delta = (seq - self.highest) & 0xFFFFFFFF
+        if delta and delta < 0x80000000:
+            # Newer than anything seen; everything skipped is presumed lost
+            self.lost += delta - 1
+            self._seen = ((self._seen << delta) | 1) & self._WINDOW_MASK if delta < self.WINDOW else 1
+            self.highest = seq
+            self.highest_ts = timestamp_us
+            self.received += 1
+            return True
+
+        age = (self.highest - seq) & 0xFFFFFFFF
+        # A record stamped after the newest one seen cannot be a copy of an older record
+        restarted = timestamp_us is not None and self.highest_ts is not None and timestamp_us > self.highest_ts
+        if age < self.WINDOW and not restarted:
+            if self._seen & (1 << age):
+                self.duplicates += 1
+                return False
+            # Late arrival of a record we had written off as lost
+            self._seen |= 1 << age
+            self.lost -= 1
+            self.received += 1
+            return True
+
+        # The device started numbering again (restart or new sender on the same ID)
+        self.resets += 1
+        self._reset(seq, timestamp_us)
+        return True
+
+    def as_dict(self) -> Dict[str, int]:
+        """Snapshot of the counters"""
+        return {
+            'received': self.received,
+            'lost': self.lost,
+            'duplicates': self.duplicates,
+            'resets': self.resets,
+            'highest_seq': self.highest,
+        }
+
+
+def parse_v1(data) -> Optional[NetworkEvent]:
+    """Parse a v1 text datagram without decoding it to str"""
+    if not isinstance(data, bytes):
+        data = bytes(data)
+    event = _V1_CACHE.get(data)
+    if event is not None:
+        return event
+
+    # Expected format: b"shooter_id:target_id"
+    shooter, colon, target = data.strip().partition(b':')
+    if not colon:
+        return _TEXT_CODES.get(data.strip())
+    if not (shooter.isdigit() and target.isdigit()):
+        return None
+
+    event = _make_event(NetworkEvent, (EVENT_PLAYER_HIT, int(shooter), int(target), None, None, None, None))
+    if len(_V1_CACHE) >= V1_CACHE_SIZE:
+        # Keep the control codes, drop the learned hits
+        _V1_CACHE.clear()
+        _V1_CACHE.update(_TEXT_CODES)
+    _V1_CACHE[data] = event
+    return event
+
+
+class PacketParser:
+    """Parses datagrams in either wire format into NetworkEvent objects
+
+    Holds the per-device SequenceTracker state for v2 traffic.
+    """
+
+    def __init__(self):
+        self.sequence_trackers: Dict[int, SequenceTracker] = {}
+
+    def parse(self, data) -> List[NetworkEvent]:
+        """Parse one datagram (bytes or memoryview) into a list of events"""
+        events = []
+        self.parse_into(events, data)
+        return events
+
+    def parse_into(self, events: list, data):
+        """Parse one datagram and append its events to `events`"""
+        if len(data) >= V2_RECORD_SIZE and data[0] == V2_MAGIC:
+            self.parse_v2_into(events, data)
+            return
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        event = _V1_CACHE.get(data)
+        if event is None:
+            event = parse_v1(data)
+            if event is None:
+                return
+        events.append(event)
+
+    def parse_v2_into(self, events: list, data):
+        """Parse the v2 records in a datagram, dropping duplicates and unknown opcodes"""
+        if len(data) % V2_RECORD_SIZE:
+            raise ValueError(f"Truncated v2 datagram ({len(data)} bytes)")
+
+        append = events.append
+        trackers = self.sequence_trackers
+        opcodes = _OPCODES
+        window_mask = SequenceTracker._WINDOW_MASK
+        for magic, opcode, flags, shooter, target, seq, timestamp_us in V2_RECORD.iter_unpack(data):
+            if magic != V2_MAGIC:
+                raise ValueError(f"Bad v2 record magic 0x{magic:02x}")
+            entry = opcodes.get(opcode)
+            if entry is None:
+                continue
+
+            # The shooter field identifies the sending device (see DEVICE_CONTROLLER)
+            tracker = trackers.get(shooter)
+            if tracker is None:
+                tracker = trackers[shooter] = SequenceTracker()
+                tracker.observe(seq, timestamp_us)
+            elif seq == tracker.highest + 1:
+                # In-order fast path of SequenceTracker.observe, inlined
+                tracker.highest = seq
+                tracker.highest_ts = timestamp_us
+                tracker._seen = ((tracker._seen << 1) | 1) & window_mask
+                tracker.received += 1
+            elif not tracker.observe(seq, timestamp_us):
+                continue
+
+            event_type, base_team, kind = entry
+            if kind == _KIND_HIT:
+                append(_make_event(NetworkEvent, (event_type, shooter, target, None, None, seq, timestamp_us)))
+            elif kind == _KIND_BASE:
+                append(_make_event(NetworkEvent, (event_type, None, None, base_team, shooter, seq, timestamp_us)))
+            else:
+                append(_make_event(NetworkEvent, (event_type, None, None, None, None, seq, timestamp_us)))
+
+    def link_stats(self) -> Dict[int, Dict[str, int]]:
+        """Per-device received/lost/duplicate counters for v2 traffic"""
+        return {device: tracker.as_dict() for device, tracker in self.sequence_trackers.items()}
@@ -0,0 +1,138 @@
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from .game_model import GameModel, GameSettings
+from .game_journal import (
+    GameJournal, JournalRecord, OP_ROSTER, OP_START, OP_HIT, OP_BASE_HIT, OP_END, TEAM_CODES,
+    pack_points
+)
+from .packet_capture import PacketCapture
+from .protocol import PacketParser, EVENT_PLAYER_HIT, EVENT_BASE_HIT, EVENT_GAME_START, EVENT_GAME_END
+
+class ReplayClock:
+    """Game clock that shows the time of the record being replayed instead of the wall clock"""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+@dataclass
+class ReplayResult:
+    model: Optional[GameModel]
+    events: int       # Records applied
+    elapsed: float    # Wall-clock seconds spent replaying
+    checksum: str     # state_checksum() of the final game
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.elapsed if self.elapsed > 0 else float('inf')
+
+def state_checksum(model: Optional[GameModel]) -> str:
+    """Digest of everything that decides a game's outcome
+
+    Two games with the same roster, scores, base hits and event count have
+    the same checksum, however they were played or replayed.
+    """
+    digest = hashlib.sha256()
+    if model is None:
+        return digest.hexdigest()
+    digest.update(f"{model.red_score}|{model.green_score}|{model.game_log.total_events}|{model.is_running}|".encode())
+    players = sorted(model.red_team + model.green_team, key=lambda p: p.equipment_id)
+    for player in players:
+        digest.update(f"{player.equipment_id}:{player.team}:{player.score}:{int(bool(player.base_hit))};".encode())
+    digest.update(','.join(map(str, sorted(model.base_hitters))).encode())
+    return digest.hexdigest()
+
+def journal_records(path: str) -> Iterator[JournalRecord]:
+    """Records of a game journal"""
+    return GameJournal.read(path)
+
+def capture_records(path: str, red_team: List, green_team: List,
+                    settings: Optional[GameSettings] = None) -> Iterator[JournalRecord]:
+    """Turn a packet capture into journal records
+
+    Captures hold only network traffic, so the roster has to be supplied. A
+    game start is synthesized at the first packet if the capture has none.
+    """
+    settings = settings or GameSettings()
+    for team_key, team in (('red', red_team), ('green', green_team)):
+        for player in team:
+            player_id = player.player_id if player.player_id is not None else -1
+            yield JournalRecord(OP_ROSTER, TEAM_CODES[team_key], 0.0, player_id, player.equipment_id,
+                                (player.code_name or '').encode('utf-8'))
+
+    start = JournalRecord(OP_START, 0, 0.0, settings.game_duration,
+                          pack_points(settings.points_per_hit, settings.points_per_base), b'')
+    started = False
+    parser = PacketParser()
+    for timestamp, data in PacketCapture.read(path):
+        for event in parser.parse(data):
+            event_type = event.type
+            if not started:
+                started = True
+                yield start._replace(timestamp=timestamp)
+                if event_type == EVENT_GAME_START:
+                    continue
+            if event_type == EVENT_PLAYER_HIT:
+                yield JournalRecord(OP_HIT, 0, timestamp, event.shooter_id, event.target_id, b'')
+            elif event_type == EVENT_BASE_HIT and event.player_id:
+                # v1 base codes do not say who scored, so only v2 base hits count
+                yield JournalRecord(OP_BASE_HIT, 0, timestamp, event.player_id, 0, b'')
+            elif event_type == EVENT_GAME_END:
+                yield JournalRecord(OP_END, 0, timestamp, 0, 0, b'')
+
+class ReplayEngine:
+    """Feeds recorded game records into a GameModel without a network or Qt
+
+    Records are applied at their original pace (speed=1), N times faster
+    (speed=N) or as fast as possible (speed=None). The game's clock follows
+    the replayed timestamps, so timers and the log read as they did live.
+    """
+
+    def __init__(self, records: Iterable[JournalRecord], speed: Optional[float] = None,
+                 settings: Optional[GameSettings] = None, clock: Optional[ReplayClock] = None,
+                 sleep: Callable[[float], None] = time.sleep,
+                 wall_clock: Callable[[], float] = time.perf_counter):
+        self.records = records
+        self.speed = speed
+        self.settings = settings
+        self.clock = clock or ReplayClock()
+        self.sleep = sleep
+        self.wall_clock = wall_clock
+        self.events = 0
+
+    def run(self) -> ReplayResult:
+        """Replay every record and return the final game"""
+        self.events = 0
+        begin = self.wall_clock()
+        model = GameModel.replay_records(self._paced(), self.settings, self.clock)
+        elapsed = self.wall_clock() - begin
+        return ReplayResult(model, self.events, elapsed, state_checksum(model))
+
+    def _paced(self) -> Iterator[JournalRecord]:
+        """Yield records, advancing the replay clock and waiting for each one's turn"""
+        clock = self.clock
+        speed = self.speed
+        first = None
+        wall_start = 0.0
+        for record in self.records:
+            timestamp = record.timestamp
+            if timestamp:
+                clock.now = timestamp
+                if speed:
+                    if first is None:
+                        first = timestamp
+                        wall_start = self.wall_clock()
+                    delay = wall_start + (timestamp - first) / speed - self.wall_clock()
+                    if delay > 0:
+                        self.sleep(delay)
+            self.events += 1
+            yield record
+
+def replay_journal(path: str, speed: Optional[float] = None, **kwargs) -> ReplayResult:
+    """Replay a game journal"""
+    return ReplayEngine(journal_records(path), speed, **kwargs).run()
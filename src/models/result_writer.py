@@ -0,0 +1,218 @@
+import atexit
+import queue
+import threading
+import time
+from collections import deque
+from statistics import median
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from .database_model import DatabaseModel
+from .game_events import GameEvent, JsonLinesEventSink
+
+class MatchResult(NamedTuple):
+    """Everything persisted about one finished game, captured when it ends"""
+    started_at: float
+    ended_at: float
+    duration: int
+    red_score: int
+    green_score: int
+    winner: str       # 'red', 'green' or 'tie'
+    total_events: int  # Events logged, including those no longer in the ring buffer
+    participants: List[Tuple]  # (equipment_id, player_id, code_name, team, score, base_hit)
+    events: List[GameEvent]    # The events still held by the game log
+    spill: Optional[Tuple[str, int]] = None  # (path, size) of the game log's spill file when the game ended
+
+def match_result(game_model) -> MatchResult:
+    """Snapshot a finished game (cheap enough for the UI thread)"""
+    red, green = game_model.red_score, game_model.green_score
+    winner = 'red' if red > green else 'green' if green > red else 'tie'
+    started_at = game_model.start_time.timestamp() if game_model.start_time else game_model.clock()
+    last = game_model.game_log.recent(1)  # The final score, stamped when the game ended
+    ended_at = last[0].timestamp if last else game_model.clock()
+    participants = [
+        (p.equipment_id, p.player_id, p.code_name, team, p.score, int(bool(p.base_hit)))
+        for team, players in (('red', game_model.red_team), ('green', game_model.green_team))
+        for p in players
+    ]
+    game_log = game_model.game_log
+    spill = None
+    if game_log.sink is not None and game_log.total_events > len(game_log):
+        # The ring buffer lost the start of the game; the writer reads it back from the spill file
+        spill = (game_log.sink.path, game_log.sink.tell())
+    return MatchResult(started_at, ended_at, round(ended_at - started_at), red, green, winner,
+                       game_log.total_events, participants, list(game_log), spill)
+
+def full_events(result: MatchResult) -> List[GameEvent]:
+    """Every event of the game: the tail of the spill file if the ring buffer overflowed
+
+    Raises:
+        OSError, ValueError: If the spill file cannot be read back
+    """
+    if result.spill is None:
+        return result.events
+    path, end = result.spill
+    # The game's events are the last total_events lines written before it ended
+    return list(deque(JsonLinesEventSink.read(path, end), maxlen=result.total_events))
+
+class ResultWriter:
+    """Persists finished games on a dedicated writer thread
+
+    submit() only puts the result on a queue, so the UI thread never waits
+    on disk. The writer takes everything queued (up to `max_batch` games)
+    and stores it in a single transaction with executemany, so a burst of
+    back-to-back games costs one commit. Games whose log overflowed its ring
+    buffer are stored with the full event stream from the spill file when
+    there is one; otherwise matches.total_events records how many events
+    were logged in all.
+    """
+
+    LATENCY_SAMPLES = 200
+
+    def __init__(self, db_path: str = 'data/laser_tag.db', max_batch: int = 32):
+        self.db_path = db_path
+        self.max_batch = max_batch
+        self.on_error: Callable[[str], None] = print
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.max_queue_depth = 0
+        self.written = 0
+        self.batches = 0
+        self.errors = 0
+        self.commit_latencies = deque(maxlen=self.LATENCY_SAMPLES)  # Seconds per transaction
+        self.last_match_ids: List[int] = []
+        self.open_error: Optional[Exception] = None  # Why the database could not be opened, if it failed
+
+    @property
+    def queue_depth(self) -> int:
+        """Games waiting to be written"""
+        return self._queue.qsize()
+
+    def bind_metrics(self, registry):
+        """Report the queue depth, games written and write errors to a MetricsRegistry"""
+        registry.gauge('queue_depth', 'Items waiting in a queue', {'queue': 'result_writer'},
+                       read=lambda: self.queue_depth)
+        registry.counter('games_saved_total', 'Finished games written to the database', read=lambda: self.written)
+        registry.counter('game_save_errors_total', 'Batches of games that failed to save', read=lambda: self.errors)
+
+    def record_game(self, game_model):
+        """Queue a finished game for writing"""
+        self.submit(match_result(game_model))
+
+    def submit(self, result: MatchResult):
+        # Queued before the thread starts, so a writer that fails to open the database still sees it
+        self._queue.put(result)
+        depth = self._queue.qsize()
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='result-writer', daemon=True)
+                self._thread.start()
+
+    def flush(self, timeout: Optional[float] = 30.0) -> bool:
+        """Wait until everything submitted so far is written
+
+        Returns:
+            bool: False if the timeout expired first or the database could not be opened
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return self.open_error is None
+
+    def stop(self, timeout: Optional[float] = 5.0) -> bool:
+        """Write what is queued and stop the writer thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return True
+        self._queue.put(None)
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def _run(self):
+        try:
+            database = DatabaseModel(self.db_path, cache_size=0, warm_cache=False)
+        except Exception as e:
+            self._fail_open(e)
+            return
+        self.open_error = None
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < self.max_batch:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = None in batch
+                results = [result for result in batch if result is not None]
+                if results:
+                    self._write(database, results)
+                for _ in batch:
+                    self._queue.task_done()
+                if stop:
+                    return
+        finally:
+            database.close()
+
+    def _fail_open(self, error: Exception):
+        """Report a database that cannot be opened and discard what is queued, so flush() returns"""
+        self.open_error = error
+        discarded = 0
+        while True:
+            try:
+                result = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            discarded += result is not None
+            self._queue.task_done()
+        self.errors += 1
+        self.on_error(f"Cannot open {self.db_path}; {discarded} game result(s) not saved: {error}")
+
+    def _complete(self, result: MatchResult) -> MatchResult:
+        """The result with every event of the game, read back from the spill file if needed"""
+        if result.spill is None:
+            return result
+        try:
+            return result._replace(events=full_events(result))
+        except (OSError, ValueError) as e:
+            self.on_error(f"Error reading {result.spill[0]}; saving the last {len(result.events)} events only: {e}")
+            return result
+
+    def _write(self, database: DatabaseModel, results: List[MatchResult]):
+        results = [self._complete(result) for result in results]
+        begin = time.perf_counter()
+        try:
+            self.last_match_ids = database.save_matches(results)
+        except Exception as e:
+            self.errors += 1
+            self.on_error(f"Error saving {len(results)} game result(s): {e}")
+            return
+        self.commit_latencies.append(time.perf_counter() - begin)
+        self.written += len(results)
+        self.batches += 1
+
+    def stats(self) -> dict:
+        """Queue depth, games written and commit latency in milliseconds"""
+        stats = {'queue_depth': self.queue_depth, 'max_queue_depth': self.max_queue_depth,
+                 'written': self.written, 'batches': self.batches, 'errors': self.errors}
+        if self.commit_latencies:
+            latencies = [latency * 1000 for latency in self.commit_latencies]
+            stats.update(commit_ms_median=median(latencies), commit_ms_max=max(latencies))
+        return stats
+
+_shared_writers = {}
+
+def shared_result_writer(db_path: str = 'data/laser_tag.db') -> ResultWriter:
+    """One writer per database for the whole process, drained at exit"""
+    writer = _shared_writers.get(db_path)
+    if writer is None:
+        writer = _shared_writers[db_path] = ResultWriter(db_path)
+        atexit.register(writer.stop)
+    return writer
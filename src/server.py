@@ -0,0 +1,157 @@
+"""Headless laser tag game server
+
+Runs one game with no display and without importing PyQt6: the scoring
+engine, network service and game clock all come from the Qt-free models.
+
+Usage:
+    laser-tag-server --player red:11:Alpha --player green:21:Bravo
+    laser-tag-server --roster roster.json --duration 600
+    laser-tag-server --recover
+    laser-tag-server --roster roster.json --metrics-port 9108
+"""
+import argparse
+import json
+import signal
+import sys
+from typing import List, Tuple
+
+from src.models.player_model import Player
+from src.models.game_model import GameModel, GameSettings
+from src.models.game_journal import GameJournal
+from src.models.game_session import GameSession
+from src.models.network_service import NetworkService
+from src.models.async_network_service import AsyncNetworkService
+from src.models.protocol import PROTOCOL_V1, PROTOCOL_V2
+from src.models.result_writer import ResultWriter
+from src.utils.metrics import MetricsRegistry
+
+# Network engines selectable with --engine
+NETWORK_SERVICES = {
+    'thread': NetworkService,
+    'asyncio': AsyncNetworkService,
+}
+
+DEFAULT_JOURNAL_PATH = 'data/current_game.journal'
+
+def parse_player(spec: str) -> Player:
+    """Parse a TEAM:EQUIPMENT_ID:CODE_NAME[:PLAYER_ID] roster entry"""
+    parts = spec.split(':')
+    if len(parts) not in (3, 4) or parts[0].lower() not in ('red', 'green'):
+        raise argparse.ArgumentTypeError(f"Expected TEAM:EQUIPMENT_ID:CODE_NAME[:PLAYER_ID], got {spec!r}")
+    team, equipment_id, code_name = parts[0].lower(), int(parts[1]), parts[2]
+    player_id = int(parts[3]) if len(parts) == 4 else None
+    return Player(player_id, code_name, equipment_id, team)
+
+def load_roster(path: str) -> List[Player]:
+    """Load players from a JSON list of {team, equipment_id, code_name[, player_id]} objects"""
+    with open(path, encoding='utf-8') as f:
+        entries = json.load(f)
+    return [Player(entry.get('player_id'), entry['code_name'], int(entry['equipment_id']), entry['team'].lower())
+            for entry in entries]
+
+def split_teams(players: List[Player]) -> Tuple[list, list]:
+    red_team = [p for p in players if p.team == 'red']
+    green_team = [p for p in players if p.team == 'green']
+    return red_team, green_team
+
+def build_session(args) -> GameSession:
+    """Create the game model, network service and session described by the command line"""
+    network = NETWORK_SERVICES[args.engine](host=args.host, tx_port=args.tx_port, rx_port=args.rx_port,
+                                            batch_mode=True, protocol=args.protocol)
+    network.on_error = lambda message: print(f"Network: {message}", flush=True)
+
+    journal_path = None if args.no_journal else args.journal
+    if args.recover:
+        if not journal_path or not GameJournal.is_unfinished(journal_path):
+            raise SystemExit("No unfinished game to recover")
+        game_model = GameModel.from_journal(journal_path, resume=True)
+    else:
+        players = list(args.player or [])
+        if args.roster:
+            players.extend(load_roster(args.roster))
+        red_team, green_team = split_teams(players)
+        if not red_team or not green_team:
+            raise SystemExit("Each team needs at least one player (use --player or --roster)")
+        settings = GameSettings(game_duration=args.duration, journal_path=journal_path)
+        game_model = GameModel(red_team, green_team, settings)
+    return GameSession(game_model, network)
+
+def attach_reporting(session: GameSession, status_every: int):
+    """Print the countdown every `status_every` seconds and the result at the end"""
+    game_model = session.game_model
+
+    def on_tick(remaining: int):
+        if remaining % status_every == 0 or remaining <= 10:
+            print(f"[{game_model.format_time(remaining)}] Red {game_model.red_score} | "
+                  f"Green {game_model.green_score}", flush=True)
+
+    def on_game_end():
+        print("Game over", flush=True)
+
+    session.on_tick = on_tick
+    session.on_warning = lambda: print("Warning: game ends soon", flush=True)
+    session.on_game_end = on_game_end
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Headless laser tag game server')
+    parser.add_argument('--player', action='append', type=parse_player,
+                        help='Roster entry TEAM:EQUIPMENT_ID:CODE_NAME[:PLAYER_ID] (repeatable)')
+    parser.add_argument('--roster', help='JSON roster file')
+    parser.add_argument('--duration', type=int, default=GameSettings.game_duration, help='Game length in seconds')
+    parser.add_argument('--host', default='127.0.0.1', help='Broadcast address')
+    parser.add_argument('--tx-port', type=int, default=7501, help='Port to transmit on')
+    parser.add_argument('--rx-port', type=int, default=7501, help='Port to receive on')
+    parser.add_argument('--engine', choices=sorted(NETWORK_SERVICES), default='thread', help='Network engine')
+    parser.add_argument('--protocol', choices=[PROTOCOL_V1, PROTOCOL_V2], default=PROTOCOL_V1,
+                        help='Wire format for broadcasts')
+    parser.add_argument('--journal', default=DEFAULT_JOURNAL_PATH, help='Game journal file')
+    parser.add_argument('--no-journal', action='store_true', help='Do not journal the game')
+    parser.add_argument('--recover', action='store_true', help='Resume the unfinished game in the journal')
+    parser.add_argument('--results-db', help='SQLite database to save the finished game to')
+    parser.add_argument('--status-every', type=int, default=30, help='Seconds between status lines')
+    parser.add_argument('--metrics-port', type=int, help='Serve Prometheus metrics on this port at /metrics')
+    parser.add_argument('--metrics-file', help='Keep Prometheus metrics in this text file')
+    parser.add_argument('--metrics-interval', type=float, default=15.0, help='Seconds between metrics file writes')
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    session = build_session(args)
+    attach_reporting(session, args.status_every)
+
+    metrics = None
+    if args.metrics_port is not None or args.metrics_file:
+        metrics = MetricsRegistry()
+        session.bind_metrics(metrics)
+        if args.metrics_port is not None:
+            server = metrics.serve(args.metrics_port)
+            print(f"Serving metrics on http://127.0.0.1:{server.server_address[1]}/metrics", flush=True)
+        if args.metrics_file:
+            metrics.write_every(args.metrics_file, args.metrics_interval)
+
+    # Ctrl-C / SIGTERM end the game cleanly instead of leaving it to recovery
+    signal.signal(signal.SIGINT, lambda *_: session.stop())
+    signal.signal(signal.SIGTERM, lambda *_: session.stop())
+
+    session.run()
+
+    game_model = session.game_model
+    if args.results_db and not game_model.is_running:
+        writer = ResultWriter(args.results_db)
+        if metrics is not None:
+            writer.bind_metrics(metrics)
+        writer.record_game(game_model)
+        writer.stop()
+    if metrics is not None and args.metrics_file:
+        try:
+            metrics.write(args.metrics_file)  # Final values, after the game and its save
+        except OSError as e:
+            print(f"Error writing metrics to {args.metrics_file}: {e}")
+    winner = ('Red' if game_model.red_score > game_model.green_score
+              else 'Green' if game_model.green_score > game_model.red_score else 'Tie')
+    print(f"Final Score - Red: {game_model.red_score} | Green: {game_model.green_score} ({winner})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
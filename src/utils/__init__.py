@@ -0,0 +1 @@
+# Initialize the utils package
@@ -0,0 +1,265 @@
+"""In-process metrics with Prometheus text export
+
+Subsystems are handed a MetricsRegistry through their bind_metrics() method
+and create their counters, gauges and histograms there. Until then they
+hold no metric objects, so an unobserved station pays only a None check on
+its hot paths. Values that already live elsewhere (queue sizes, cache hit
+counts) are registered as callbacks and read only when the registry is
+exported.
+
+The registry can be written to a Prometheus text file or served over HTTP:
+    registry.write('data/metrics.prom')
+    registry.serve(9108)   # GET http://127.0.0.1:9108/metrics
+
+For the GUI, set LASER_TAG_METRICS_PORT and/or LASER_TAG_METRICS_FILE;
+configured_registry() then returns the shared registry with its exporters
+running, and None otherwise.
+"""
+import os
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Latency buckets in seconds, from 50 us to 1 s
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+class Counter:
+    """A value that only goes up
+
+    Increments are not locked: each counter is expected to be bumped from
+    one thread (the receive thread or the UI thread), which keeps inc() to
+    a single attribute update.
+    """
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        self.value += amount
+
+class Gauge:
+    """A value that can go up and down"""
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+class Histogram:
+    """Observations counted into fixed buckets, plus their count and sum"""
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # The last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, count of observations <= le) pairs as Prometheus expects them"""
+        pairs = []
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            pairs.append(('+Inf' if bound == float('inf') else repr(bound), total))
+        return pairs
+
+class _Callback:
+    """A counter or gauge whose value is read from a function at export time"""
+    __slots__ = ('read',)
+
+    def __init__(self, read: Callable[[], float]):
+        self.read = read
+
+    @property
+    def value(self):
+        return self.read()
+
+def _label_text(labels: Tuple[Tuple[str, str], ...], extra: str = '') -> str:
+    parts = [f'{key}="{_escape(value)}"' for key, value in labels]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _number(value) -> str:
+    if isinstance(value, float):
+        if value != value:
+            return 'NaN'
+        if value in (float('inf'), float('-inf')):
+            return '+Inf' if value > 0 else '-Inf'
+        return repr(value)
+    return str(value)
+
+class MetricsRegistry:
+    """Named metric families, each holding one metric per label set"""
+
+    def __init__(self, prefix: str = 'laser_tag_'):
+        self.prefix = prefix
+        self._families: Dict[str, Tuple[str, str, Dict[tuple, object]]] = {}  # name -> (type, help, {labels: metric})
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def _get(self, kind: str, name: str, help_text: str, labels: Optional[dict], factory, replace: bool = False):
+        name = self.prefix + name
+        key = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = (kind, help_text, {})
+            elif family[0] != kind:
+                raise ValueError(f"Metric {name} is already registered as a {family[0]}")
+            metric = family[2].get(key)
+            if metric is None or replace:
+                metric = family[2][key] = factory()
+            return metric
+
+    def counter(self, name: str, help_text: str = '', labels: Optional[dict] = None,
+                read: Optional[Callable[[], float]] = None) -> Counter:
+        """Get or create a counter (names get the registry prefix)
+
+        Args:
+            read: Read the value from this function at export time instead;
+                registering it again replaces the previous function
+        """
+        if read is not None:
+            return self._get('counter', name, help_text, labels, lambda: _Callback(read), replace=True)
+        return self._get('counter', name, help_text, labels, Counter)
+
+    def gauge(self, name: str, help_text: str = '', labels: Optional[dict] = None,
+              read: Optional[Callable[[], float]] = None) -> Gauge:
+        """Get or create a gauge (`read` makes it a callback read at export time)"""
+        if read is not None:
+            return self._get('gauge', name, help_text, labels, lambda: _Callback(read), replace=True)
+        return self._get('gauge', name, help_text, labels, Gauge)
+
+    def histogram(self, name: str, help_text: str = '', labels: Optional[dict] = None,
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create a histogram with fixed buckets"""
+        return self._get('histogram', name, help_text, labels, lambda: Histogram(buckets))
+
+    def render(self) -> str:
+        """The registry in the Prometheus text exposition format"""
+        with self._lock:
+            families = [(name, kind, help_text, list(metrics.items()))
+                        for name, (kind, help_text, metrics) in sorted(self._families.items())]
+        lines = []
+        for name, kind, help_text, metrics in families:
+            if help_text:
+                lines.append(f'# HELP {name} {_escape(help_text)}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, metric in metrics:
+                if kind == 'histogram':
+                    for bound, count in metric.cumulative():
+                        le = f'le="{bound}"'
+                        lines.append(f'{name}_bucket{_label_text(labels, le)} {count}')
+                    lines.append(f'{name}_count{_label_text(labels)} {metric.count}')
+                    lines.append(f'{name}_sum{_label_text(labels)} {_number(metric.sum)}')
+                    continue
+                try:
+                    value = metric.value
+                except Exception as e:
+                    print(f"Error reading metric {name}: {e}")
+                    continue
+                lines.append(f'{name}{_label_text(labels)} {_number(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str):
+        """Write the registry to a Prometheus text file, replacing it atomically"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(temporary, path)
+
+    def write_every(self, path: str, interval: float = 15.0) -> threading.Event:
+        """Rewrite the file every `interval` seconds on a daemon thread. Set the returned event to stop"""
+        stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                try:
+                    self.write(path)
+                except OSError as e:
+                    print(f"Error writing metrics to {path}: {e}")
+
+        threading.Thread(target=run, name='metrics-writer', daemon=True).start()
+        return stop
+
+    def serve(self, port: int, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+        """Serve GET /metrics on a daemon thread (port 0 picks a free port; see server_address)"""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass  # Scrapes are not worth a line each
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+        self._server = server
+        return server
+
+    def stop_serving(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+REGISTRY = MetricsRegistry()
+
+_configured = False
+
+def configured_registry() -> Optional[MetricsRegistry]:
+    """The shared registry if LASER_TAG_METRICS_PORT or LASER_TAG_METRICS_FILE is set, else None
+
+    The first call starts the configured exporters.
+    """
+    global _configured
+    port = os.environ.get('LASER_TAG_METRICS_PORT')
+    path = os.environ.get('LASER_TAG_METRICS_FILE')
+    if not port and not path:
+        return None
+    with REGISTRY._lock:
+        start, _configured = not _configured, True
+    if start:
+        if port:
+            try:
+                REGISTRY.serve(int(port))
+            except (OSError, ValueError) as e:
+                print(f"Cannot serve metrics on port {port}: {e}")
+        if path:
+            REGISTRY.write_every(path)
+    return REGISTRY
@@ -0,0 +1,192 @@
+import wave
+from typing import Callable, Dict, List, Optional
+import numpy as np
+
+SAMPLE_RATE = 44100
+BLOCK_FRAMES = 512  # ~11.6 ms per block at 44.1 kHz
+
+MUSIC = 'music'
+EFFECTS = 'effects'
+
+def to_float(samples: np.ndarray) -> np.ndarray:
+    """Convert int16 (or float) samples to float32 in [-1, 1]"""
+    if samples.dtype == np.int16:
+        return samples.astype(np.float32) / 32768.0
+    return samples.astype(np.float32, copy=False)
+
+def load_wav(path: str, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Read a 16-bit PCM WAV file as float32 mono samples at `sample_rate`"""
+    with wave.open(path, 'rb') as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit PCM is supported")
+        channels = wav.getnchannels()
+        rate = wav.getframerate()
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype='<i2')
+    samples = to_float(samples)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    if rate != sample_rate:
+        # Linear resampling is enough for short effects
+        positions = np.arange(0, len(samples), rate / sample_rate)
+        samples = np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+    return samples
+
+class Voice:
+    """One sound playing in the mixer"""
+    __slots__ = ('name', 'buffer', 'position', 'gain', 'group', 'loop', 'on_end', 'next')
+
+    def __init__(self, name: str, buffer: np.ndarray, gain: float, group: str, loop: bool,
+                 on_end: Optional[Callable[[], None]]):
+        self.name = name
+        self.buffer = buffer
+        self.position = 0
+        self.gain = gain
+        self.group = group
+        self.loop = loop
+        self.on_end = on_end
+        self.next: Optional[str] = None  # Sound continuing on this voice, sample-exact, when the buffer ends
+
+class Mixer:
+    """Mixes preloaded sounds into one mono int16 stream, one fixed-size block at a time
+
+    Sounds are kept as float32 arrays, so starting a voice costs nothing but a
+    list append. Each block sums every voice with its own gain, its group's
+    gain and, for music, the ducking gain, then clips and converts once.
+    Music is ducked while any of `duck_triggers` is playing, with the gain
+    ramped over `duck_ramp` seconds to avoid clicks. The mixer is Qt-free;
+    an output (see MixerAudioPlayer) pulls blocks from mix_block().
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, block_frames: int = BLOCK_FRAMES, polyphony: int = 16,
+                 duck_gain: float = 0.3, duck_ramp: float = 0.05, duck_triggers=('warning', 'tick')):
+        """Create the mixer
+
+        Args:
+            block_frames: Samples produced per mix_block() call
+            polyphony: Maximum voices mixed at once; further play() calls are dropped
+            duck_gain: Music gain while a ducking sound plays
+            duck_ramp: Seconds for the music gain to move between 1.0 and duck_gain
+            duck_triggers: Sound names that duck the music
+        """
+        self.sample_rate = sample_rate
+        self.block_frames = block_frames
+        self.polyphony = polyphony
+        self.duck_gain = duck_gain
+        self.duck_triggers = set(duck_triggers)
+        self._duck_step = block_frames / (sample_rate * duck_ramp) if duck_ramp > 0 else 1.0
+        self._duck = 1.0  # Current music ducking gain
+
+        self.sounds: Dict[str, np.ndarray] = {}
+        self.voices: List[Voice] = []
+        self.group_gain = {MUSIC: 1.0, EFFECTS: 1.0}
+        self.master_gain = 1.0
+        self.dropped = 0
+        self.blocks = 0
+
+        self._mix = np.zeros(block_frames, dtype=np.float32)
+        self._scratch = np.empty(block_frames, dtype=np.float32)
+        self._ramp = np.linspace(0.0, 1.0, block_frames, endpoint=False, dtype=np.float32)
+
+    @property
+    def latency(self) -> float:
+        """Seconds of audio in one block"""
+        return self.block_frames / self.sample_rate
+
+    def add_sound(self, name: str, samples: np.ndarray):
+        """Preload a sound (int16 or float samples at the mixer's rate)"""
+        self.sounds[name] = to_float(np.asarray(samples).reshape(-1))
+
+    def load_sound(self, name: str, path: str):
+        """Preload a sound from a WAV file"""
+        self.sounds[name] = load_wav(path, self.sample_rate)
+
+    def play(self, name: str, gain: float = 1.0, group: str = EFFECTS, loop: bool = False,
+             on_end: Optional[Callable[[], None]] = None) -> Optional[Voice]:
+        """Start a preloaded sound
+
+        Returns:
+            Voice: The new voice, or None if the sound is unknown or the polyphony cap was hit
+        """
+        buffer = self.sounds.get(name)
+        if buffer is None or not len(buffer):
+            return None
+        if len(self.voices) >= self.polyphony:
+            self.dropped += 1
+            return None
+        voice = Voice(name, buffer, gain, group, loop, on_end)
+        self.voices.append(voice)
+        return voice
+
+    def queue_next(self, voice: Voice, name: str) -> bool:
+        """Continue `voice` with another preloaded sound as soon as its current one ends"""
+        if name not in self.sounds or voice not in self.voices:
+            return False
+        voice.next = name
+        return True
+
+    def stop(self, group: Optional[str] = None):
+        """Stop every voice, or only those in `group` (no on_end callbacks)"""
+        self.voices = [v for v in self.voices if group is not None and v.group != group]
+
+    def is_playing(self, group: Optional[str] = None) -> bool:
+        return any(group is None or v.group == group for v in self.voices)
+
+    def _next_duck(self) -> float:
+        """Music ducking gain at the end of this block"""
+        target = self.duck_gain if any(v.name in self.duck_triggers for v in self.voices) else 1.0
+        if self._duck < target:
+            return min(target, self._duck + self._duck_step)
+        return max(target, self._duck - self._duck_step)
+
+    def mix_block(self) -> bytes:
+        """Mix the next block of every voice into little-endian int16 samples"""
+        frames = self.block_frames
+        mix = self._mix
+        mix.fill(0.0)
+
+        duck_start = self._duck
+        duck_end = self._next_duck()
+        duck_ramp = None
+        if duck_start != duck_end:
+            duck_ramp = duck_start + (duck_end - duck_start) * self._ramp
+        self._duck = duck_end
+
+        finished = []
+        switched = []
+        for voice in self.voices:
+            gain = voice.gain * self.group_gain.get(voice.group, 1.0)
+            if voice.group == MUSIC and duck_ramp is None:
+                gain *= duck_end
+            filled = 0
+            while filled < frames:
+                chunk = voice.buffer[voice.position:voice.position + frames - filled]
+                count = len(chunk)
+                out = self._scratch[filled:filled + count]
+                np.multiply(chunk, gain, out=out)
+                if voice.group == MUSIC and duck_ramp is not None:
+                    out *= duck_ramp[filled:filled + count]
+                mix[filled:filled + count] += out
+                filled += count
+                voice.position += count
+                if voice.position >= len(voice.buffer):
+                    voice.position = 0
+                    if voice.loop:
+                        continue
+                    next_buffer = self.sounds.get(voice.next) if voice.next is not None else None
+                    if next_buffer is None or not len(next_buffer):
+                        finished.append(voice)
+                        break
+                    voice.name, voice.buffer, voice.next = voice.next, next_buffer, None
+                    switched.append(voice)
+
+        if finished:
+            self.voices = [v for v in self.voices if v not in finished]
+        # on_end also fires when a voice moves on to its queued sound
+        for voice in finished + switched:
+            if voice.on_end is not None:
+                voice.on_end()
+
+        mix *= self.master_gain * 32768.0
+        np.clip(mix, -32768.0, 32767.0, out=mix)
+        self.blocks += 1
+        return mix.astype('<i2').tobytes()
@@ -0,0 +1,222 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+from PyQt6.QtMultimedia import QAudioFormat, QAudioSink, QMediaDevices
+from PyQt6.QtCore import QObject, QTimer, Qt, pyqtSignal
+from src.utils.mixer import Mixer, MUSIC, EFFECTS, SAMPLE_RATE, BLOCK_FRAMES, load_wav
+from src.utils.music import track_index, pick_track
+
+DEFAULT_SOUND_DIR = str(Path(__file__).parent.parent.parent / "assets" / "sounds")
+
+class MixerAudioPlayer(QObject):
+    """AudioPlayer replacement that plays music and effects through one QAudioSink
+
+    Effects and tracks are preloaded into a NumPy Mixer and written to a
+    single push-mode audio sink in fixed-size blocks, so there is one output
+    device, no player is created per sound, and latency is bounded by the
+    number of buffered blocks. Music is ducked under the warning and tick
+    sounds. Only 16-bit PCM WAV tracks can be played. The next track is
+    decoded on a worker thread while the current one plays and queued on
+    the same voice, so tracks follow each other without a gap.
+    """
+    music_ended = pyqtSignal()
+
+    def __init__(self, music_dir: str = None, sound_dir: str = None, polyphony: int = 16,
+                 block_frames: int = BLOCK_FRAMES, buffered_blocks: int = 4, synthesize: bool = False):
+        """Create the mixer and open the default audio output
+
+        Args:
+            music_dir: Directory of .wav music tracks
+            sound_dir: Directory of .wav effects, keyed by file name without extension
+            polyphony: Maximum voices mixed at once
+            block_frames: Samples per mixed block
+            buffered_blocks: Blocks queued in the sink (output latency = this many blocks)
+            synthesize: Build the effects with generate_sounds instead of reading the WAV files
+        """
+        super().__init__()
+        self.music_dir = music_dir or DEFAULT_SOUND_DIR
+        self.sound_dir = sound_dir or DEFAULT_SOUND_DIR
+        self.mixer = Mixer(block_frames=block_frames, polyphony=polyphony)
+        self.mixer.group_gain[MUSIC] = 0.5  # Same default as AudioPlayer
+        self.current_track = None
+        self.next_track: Optional[str] = None
+        self._music_voice = None
+        self._prefetch: Optional[Future] = None
+        self._loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix='music-prefetch')
+        self._prefetch_started = 0.0
+        # Handover metrics: gapless switches, switches that waited for decoding, decode times (s)
+        self.handovers = 0
+        self.late_handovers = 0
+        self.prefetch_times = deque(maxlen=100)
+        self._load_effects(synthesize)
+
+        audio_format = QAudioFormat()
+        audio_format.setSampleRate(SAMPLE_RATE)
+        audio_format.setChannelCount(1)
+        audio_format.setSampleFormat(QAudioFormat.SampleFormat.Int16)
+        self.block_bytes = block_frames * 2
+        self.sink = QAudioSink(QMediaDevices.defaultAudioOutput(), audio_format, self)
+        self.sink.setBufferSize(self.block_bytes * buffered_blocks)
+        self.device = self.sink.start()
+
+        # Refill the sink twice per block so it never runs dry
+        self.pump_timer = QTimer(self)
+        self.pump_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.pump_timer.timeout.connect(self._pump)
+        self.pump_timer.start(max(1, int(self.mixer.latency * 500)))
+
+    @property
+    def latency(self) -> float:
+        """Worst-case seconds from play() to the sound reaching the device buffer"""
+        return self.sink.bufferSize() / 2 / SAMPLE_RATE + self.mixer.latency
+
+    def _load_effects(self, synthesize: bool):
+        """Preload every effect, synthesized or from the sound directory"""
+        if synthesize:
+            try:
+                from generate_sounds import SYNTHESIZERS
+                for name, synthesize_sound in SYNTHESIZERS.items():
+                    self.mixer.add_sound(name, synthesize_sound())
+                return
+            except ImportError as e:
+                print(f"Cannot synthesize sounds ({e}); loading WAV files instead")
+        if not os.path.isdir(self.sound_dir):
+            print(f"Sound directory not found: {self.sound_dir}")
+            return
+        for file_name in os.listdir(self.sound_dir):
+            name, extension = os.path.splitext(file_name)
+            if extension.lower() == '.wav':
+                self._load(name, os.path.join(self.sound_dir, file_name))
+
+    def _load(self, name: str, path: str) -> bool:
+        try:
+            self.mixer.load_sound(name, path)
+            return True
+        except Exception as e:
+            print(f"Error loading {path}: {e}")
+            return False
+
+    @property
+    def tracks(self) -> list[str]:
+        """WAV tracks in the music directory (cached until the directory changes)"""
+        return sorted(track_index(self.music_dir, ('.wav',)))
+
+    def _track_key(self, track: str) -> str:
+        # Keyed by mtime so an edited file is decoded again
+        return f"{MUSIC}:{track}:{track_index(self.music_dir, ('.wav',)).get(track)}"
+
+    def _pump(self):
+        """Write mixed blocks while the sink has room for them"""
+        self._queue_prefetched()
+        while self.sink.bytesFree() >= self.block_bytes:
+            self.device.write(self.mixer.mix_block())
+
+    def play_random_track(self):
+        """Play a random music track, or skip to the next one if music is playing"""
+        track = pick_track(self.tracks, self.current_track)
+        if track is None:
+            print("No music tracks found in", self.music_dir)
+            return
+        key = self._track_key(track)
+        if key not in self.mixer.sounds and not self._load(key, track):
+            return
+        self.mixer.stop(MUSIC)
+        self._cancel_prefetch()
+        self.current_track = track
+        self._music_voice = self.mixer.play(key, group=MUSIC, on_end=self._on_track_end)
+        self._start_prefetch()
+
+    def _start_prefetch(self):
+        """Decode the next random track on the loader thread"""
+        track = pick_track(self.tracks, self.current_track)
+        if track is None:
+            return
+        self.next_track = track
+        self._prefetch_started = time.perf_counter()
+        if self._track_key(track) in self.mixer.sounds:
+            self._prefetch = Future()
+            self._prefetch.set_result(None)
+        else:
+            self._prefetch = self._loader.submit(load_wav, track, self.mixer.sample_rate)
+
+    def _cancel_prefetch(self):
+        if self._prefetch is not None:
+            self._prefetch.cancel()
+        self._prefetch = None
+        self.next_track = None
+
+    def _queue_prefetched(self):
+        """Queue the decoded next track behind the current one (runs on the UI thread)"""
+        prefetch = self._prefetch
+        if prefetch is None or not prefetch.done():
+            return
+        self._prefetch = None
+        key = self._track_key(self.next_track)
+        try:
+            samples = prefetch.result()
+        except Exception as e:
+            print(f"Error loading {self.next_track}: {e}")
+            self.next_track = None
+            return
+        if samples is not None:
+            self.mixer.sounds[key] = samples
+        self.prefetch_times.append(time.perf_counter() - self._prefetch_started)
+
+        if self._music_voice is not None:
+            self.mixer.queue_next(self._music_voice, key)
+        else:
+            # The current track ended before its successor was decoded
+            self.late_handovers += 1
+            self.current_track, self.next_track = self.next_track, None
+            self._music_voice = self.mixer.play(key, group=MUSIC, on_end=self._on_track_end)
+            self._start_prefetch()
+
+    def _on_track_end(self):
+        """The music voice finished a track and either moved on to the queued one or stopped"""
+        voice = self._music_voice
+        if voice is None or voice not in self.mixer.voices:
+            self._music_voice = None
+            if self._prefetch is None:
+                self.current_track = None
+                self.music_ended.emit()
+            return
+        # Continued sample-exact with the queued track; only it and the next one stay decoded
+        finished = self._track_key(self.current_track)
+        self.current_track, self.next_track = self.next_track, None
+        if finished != self._track_key(self.current_track):
+            self.mixer.sounds.pop(finished, None)
+        self.handovers += 1
+        self._start_prefetch()
+
+    def stop(self):
+        """Stop the current music track"""
+        self.mixer.stop(MUSIC)
+        self._cancel_prefetch()
+        self._music_voice = None
+
+    def set_volume(self, volume: int):
+        """Set the music volume (0-100)"""
+        self.mixer.group_gain[MUSIC] = volume / 100
+
+    def play_sound_effect(self, sound: str) -> bool:
+        """Play a sound effect by name or file path (non-blocking)"""
+        return self.mixer.play(Path(sound).stem, group=EFFECTS) is not None
+
+    def bind_metrics(self, registry):
+        """Report dropped effects, mixed blocks and music handovers to a MetricsRegistry"""
+        mixer = self.mixer
+        registry.counter('sound_effects_total', 'Sound effect requests by outcome', {'result': 'dropped'},
+                         read=lambda: mixer.dropped)
+        registry.counter('mixer_blocks_total', 'Audio blocks mixed', read=lambda: mixer.blocks)
+        registry.counter('music_handovers_total', 'Switches to the next music track', read=lambda: self.handovers)
+        registry.counter('music_late_handovers_total', 'Track switches that waited for decoding',
+                         read=lambda: self.late_handovers)
+
+    def close(self):
+        """Stop the output stream"""
+        self.pump_timer.stop()
+        self.sink.stop()
+        self._loader.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,247 @@
+import os
+import random
+import time
+from collections import deque
+from statistics import median
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
+from PyQt6.QtCore import QUrl, QObject, QTimer, pyqtSignal
+
+MUSIC_EXTENSIONS = ('.mp3', '.wav', '.ogg', '.m4a')
+
+# directory -> (directory mtime in ns, {track path: file mtime in ns})
+_track_index: Dict[Tuple[str, tuple], Tuple[int, Dict[str, int]]] = {}
+
+def track_index(directory: str, extensions: tuple = MUSIC_EXTENSIONS) -> Dict[str, int]:
+    """Music files in a directory with their mtimes
+
+    The listing is cached and only rebuilt when the directory's own mtime
+    changes, i.e. when a track is added, removed or renamed.
+    """
+    try:
+        directory_mtime = os.stat(directory).st_mtime_ns
+    except OSError:
+        return {}
+    key = (directory, extensions)
+    cached = _track_index.get(key)
+    if cached is not None and cached[0] == directory_mtime:
+        return cached[1]
+
+    tracks = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.lower().endswith(extensions):
+                tracks[entry.path] = entry.stat().st_mtime_ns
+    _track_index[key] = (directory_mtime, tracks)
+    return tracks
+
+def pick_track(tracks, previous: Optional[str] = None) -> Optional[str]:
+    """Pick a random track, avoiding the previous one when there is a choice"""
+    available = [t for t in tracks if t != previous] or list(tracks)
+    return random.choice(available) if available else None
+
+class Handover(NamedTuple):
+    """Timing of one switch from the current track to the prefetched one (milliseconds)"""
+    track: str
+    prefetch_ms: float   # setSource() until the next track was loaded
+    start_ms: float      # Handover triggered until the next track reported playing
+    gap_ms: float        # Current track ended until the next one played (0 when they overlapped)
+
+class _Deck:
+    """One player/output pair"""
+
+    def __init__(self, parent: QObject):
+        self.player = QMediaPlayer(parent)
+        self.output = QAudioOutput(parent)
+        self.player.setAudioOutput(self.output)
+        self.track: Optional[str] = None
+        self.requested = 0.0  # When setSource() was called
+        self.loaded: Optional[float] = None  # When the media finished loading
+
+class GaplessMusicPlayer(QObject):
+    """Plays random tracks back to back on two alternating players
+
+    While one deck plays, the next randomly chosen track is already loaded
+    on the other, so the handover never waits for decoding. With a
+    crossfade the next deck starts `crossfade_ms` before the current track
+    ends and the two volumes are ramped; without one the next deck starts
+    the moment the current track reaches its end.
+    """
+    track_started = pyqtSignal(str)
+    playback_stopped = pyqtSignal()  # Playback ended with no next track to play
+
+    FADE_STEPS = 20
+    HANDOVER_SAMPLES = 100
+
+    def __init__(self, music_dir: str, crossfade_ms: int = 1500, volume: float = 0.5, parent=None):
+        """Create both decks
+
+        Args:
+            music_dir: Directory of music tracks
+            crossfade_ms: Overlap between tracks (0 switches at the end of the track)
+            volume: Music volume (0.0-1.0)
+        """
+        super().__init__(parent)
+        self.music_dir = music_dir
+        self.crossfade_ms = crossfade_ms
+        self.volume = volume
+        self.decks = [_Deck(self), _Deck(self)]
+        self.active = 0
+        self.handovers = deque(maxlen=self.HANDOVER_SAMPLES)
+        self._handover_at: Optional[float] = None  # When the current handover was triggered
+        self._ended_at: Optional[float] = None     # When the outgoing track ended
+        self._fading = False
+
+        self._fade_timer = QTimer(self)
+        self._fade_timer.timeout.connect(self._fade_step)
+        self._fade_step_index = 0
+
+        for deck in self.decks:
+            deck.player.mediaStatusChanged.connect(lambda status, d=deck: self._on_media_status(d, status))
+            deck.player.positionChanged.connect(lambda position, d=deck: self._on_position(d, position))
+            deck.player.playbackStateChanged.connect(lambda state, d=deck: self._on_state(d, state))
+
+    @property
+    def tracks(self) -> List[str]:
+        return sorted(track_index(self.music_dir))
+
+    @property
+    def current(self) -> _Deck:
+        return self.decks[self.active]
+
+    @property
+    def next(self) -> _Deck:
+        return self.decks[1 - self.active]
+
+    @property
+    def current_track(self) -> Optional[str]:
+        return self.current.track
+
+    def _load(self, deck: _Deck, track: Optional[str]):
+        deck.track = track
+        deck.loaded = None
+        deck.requested = time.perf_counter()
+        deck.player.setSource(QUrl.fromLocalFile(track) if track else QUrl())
+
+    def prefetch(self):
+        """Load the next random track on the idle deck"""
+        track = pick_track(self.tracks, self.current.track)
+        if track is not None and track != self.next.track:
+            self._load(self.next, track)
+
+    def play(self):
+        """Start playing, or skip to the prefetched track if already playing"""
+        if self.current.player.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
+            if not self._fading:
+                self._hand_over()
+            return
+        track = pick_track(self.tracks, self.current.track)
+        if track is None:
+            print("No music tracks found in", self.music_dir)
+            return
+        self._load(self.current, track)
+        self.current.output.setVolume(self.volume)
+        self.current.player.play()
+        self.track_started.emit(track)
+        self.prefetch()
+
+    def stop(self):
+        """Stop both decks"""
+        self._fade_timer.stop()
+        self._fading = False
+        self._handover_at = None
+        for deck in self.decks:
+            deck.player.stop()
+
+    def set_volume(self, volume: float):
+        """Set the music volume (0.0-1.0)"""
+        self.volume = volume
+        if not self._fading:
+            self.current.output.setVolume(volume)
+
+    def _on_media_status(self, deck: _Deck, status):
+        if status == QMediaPlayer.MediaStatus.LoadedMedia and deck.loaded is None:
+            deck.loaded = time.perf_counter()
+        elif status == QMediaPlayer.MediaStatus.EndOfMedia and deck is self.current and not self._fading:
+            # Ending mid-crossfade is expected; ending otherwise means the handover must happen now
+            self._ended_at = time.perf_counter()
+            if self._handover_at is None:
+                self._hand_over()
+        elif status == QMediaPlayer.MediaStatus.InvalidMedia:
+            print(f"Cannot play music track: {deck.track}")
+            if deck is self.next:
+                self.next.track = None
+
+    def _on_position(self, deck: _Deck, position: int):
+        """Start the crossfade once the current track is close enough to its end"""
+        if deck is not self.current or self._handover_at is not None or self._fading or self.crossfade_ms <= 0:
+            return
+        duration = deck.player.duration()
+        if duration > 0 and duration - position <= self.crossfade_ms:
+            self._hand_over()
+
+    def _hand_over(self):
+        """Start the prefetched track on the idle deck"""
+        incoming = self.next
+        if incoming.track is None:
+            self.prefetch()
+            incoming = self.next
+            if incoming.track is None:
+                self.stop()
+                self.playback_stopped.emit()
+                return
+        self._handover_at = time.perf_counter()
+        fade = self.crossfade_ms > 0 and self._ended_at is None
+        incoming.output.setVolume(0.0 if fade else self.volume)
+        incoming.player.play()
+        if fade:
+            self._fading = True
+            self._fade_step_index = 0
+            self._fade_timer.start(max(1, self.crossfade_ms // self.FADE_STEPS))
+        else:
+            self._finish_handover()
+
+    def _fade_step(self):
+        self._fade_step_index += 1
+        level = min(1.0, self._fade_step_index / self.FADE_STEPS)
+        self.current.output.setVolume(self.volume * (1.0 - level))
+        self.next.output.setVolume(self.volume * level)
+        if level >= 1.0:
+            self._fade_timer.stop()
+            self._fading = False
+            self._finish_handover()
+
+    def _finish_handover(self):
+        """Retire the outgoing deck and prefetch the track after the new one"""
+        outgoing = self.current
+        self.active = 1 - self.active
+        outgoing.player.stop()
+        self.track_started.emit(self.current.track)
+        self.prefetch()
+
+    def _on_state(self, deck: _Deck, state):
+        if state != QMediaPlayer.PlaybackState.PlayingState or self._handover_at is None:
+            return
+        if deck is not self.current and deck is not self.next:
+            return
+        # The incoming deck is audible: record how the handover went
+        now = time.perf_counter()
+        prefetch_ms = (deck.loaded - deck.requested) * 1000 if deck.loaded is not None else float('nan')
+        gap_ms = (now - self._ended_at) * 1000 if self._ended_at is not None else 0.0
+        self.handovers.append(Handover(deck.track, prefetch_ms, (now - self._handover_at) * 1000, gap_ms))
+        self._handover_at = None
+        self._ended_at = None
+
+    def handover_stats(self) -> dict:
+        """Median and worst handover timings in milliseconds"""
+        if not self.handovers:
+            return {'handovers': 0}
+        starts = [h.start_ms for h in self.handovers]
+        gaps = [h.gap_ms for h in self.handovers]
+        prefetches = [h.prefetch_ms for h in self.handovers if h.prefetch_ms == h.prefetch_ms]
+        return {
+            'handovers': len(self.handovers),
+            'start_ms_median': median(starts), 'start_ms_max': max(starts),
+            'gap_ms_median': median(gaps), 'gap_ms_max': max(gaps),
+            'prefetch_ms_median': median(prefetches) if prefetches else None,
+        }
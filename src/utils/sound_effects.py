@@ -0,0 +1,146 @@
+import os
+import time
+from collections import deque
+from pathlib import Path
+from statistics import quantiles
+from typing import Callable, Dict, List, Optional
+from PyQt6.QtMultimedia import QSoundEffect
+from PyQt6.QtCore import QUrl, QObject
+
+DEFAULT_SOUND_DIR = str(Path(__file__).parent.parent.parent / "assets" / "sounds")
+
+class _Voice:
+    """One preloaded QSoundEffect and the trigger time of its pending playback"""
+
+    def __init__(self, effect: QSoundEffect):
+        self.effect = effect
+        self.triggered: Optional[float] = None  # Set from play() until playback starts
+
+    @property
+    def busy(self) -> bool:
+        return self.triggered is not None or self.effect.isPlaying()
+
+class SoundEffectEngine(QObject):
+    """Plays short sound effects without blocking the Qt event loop
+
+    Every WAV file in the sound directory is loaded once into a few reusable
+    QSoundEffect voices, so triggering an effect only starts an idle voice.
+    At most `polyphony` effects sound at once. Under load a repeat of an
+    effect within `merge_window` seconds is merged into the one already
+    playing, and an effect with no free voice is dropped.
+    """
+
+    LATENCY_SAMPLES = 1000
+
+    def __init__(self, sound_dir: str = None, polyphony: int = 8, voices_per_sound: int = 3,
+                 merge_window: float = 0.03, clock: Callable[[], float] = time.perf_counter, parent=None):
+        """Preload the sound effects
+
+        Args:
+            sound_dir: Directory of .wav effects, keyed by file name without extension
+            polyphony: Maximum number of effects playing at the same time
+            voices_per_sound: Players kept per effect (the effect's own polyphony)
+            merge_window: Seconds within which repeats of one effect are merged
+            clock: Time source for merging and latency measurement
+        """
+        super().__init__(parent)
+        self.sound_dir = sound_dir or DEFAULT_SOUND_DIR
+        self.polyphony = polyphony
+        self.voices_per_sound = voices_per_sound
+        self.merge_window = merge_window
+        self.clock = clock
+        self.volume = 1.0
+        self.voices: Dict[str, List[_Voice]] = {}
+        self._last_trigger: Dict[str, float] = {}
+        self.latencies = deque(maxlen=self.LATENCY_SAMPLES)  # Seconds from play() to playback start
+        self.played = 0
+        self.merged = 0
+        self.dropped = 0
+        self._preload()
+
+    def _preload(self):
+        """Create and load the voices for every effect in the sound directory"""
+        if not os.path.isdir(self.sound_dir):
+            print(f"Sound directory not found: {self.sound_dir}")
+            return
+        for file_name in sorted(os.listdir(self.sound_dir)):
+            name, extension = os.path.splitext(file_name)
+            if extension.lower() != '.wav':
+                continue
+            url = QUrl.fromLocalFile(os.path.join(self.sound_dir, file_name))
+            self.voices[name] = [self._create_voice(url) for _ in range(self.voices_per_sound)]
+
+    def _create_voice(self, url: QUrl) -> _Voice:
+        effect = QSoundEffect(self)
+        effect.setSource(url)
+        effect.setVolume(self.volume)
+        voice = _Voice(effect)
+        effect.playingChanged.connect(lambda: self._on_playing_changed(voice))
+        effect.statusChanged.connect(lambda: self._on_status_changed(voice))
+        return voice
+
+    def play(self, sound: str) -> bool:
+        """Start an effect by name (a file path is reduced to its name)
+
+        Returns:
+            bool: True if a voice was started, False if the effect was merged or dropped
+        """
+        name = Path(sound).stem
+        voices = self.voices.get(name)
+        if voices is None:
+            print(f"Unknown sound effect: {sound}")
+            return False
+
+        now = self.clock()
+        last = self._last_trigger.get(name)
+        if last is not None and now - last < self.merge_window:
+            self.merged += 1
+            return False
+
+        voice = next((v for v in voices if not v.busy), None)
+        if voice is None or self.active_voices() >= self.polyphony:
+            self.dropped += 1
+            return False
+
+        self._last_trigger[name] = now
+        voice.triggered = now
+        voice.effect.play()
+        self.played += 1
+        return True
+
+    def _on_playing_changed(self, voice: _Voice):
+        if voice.effect.isPlaying() and voice.triggered is not None:
+            self.latencies.append(self.clock() - voice.triggered)
+        voice.triggered = None
+
+    def _on_status_changed(self, voice: _Voice):
+        if voice.effect.status() == QSoundEffect.Status.Error:
+            print(f"Error loading sound effect: {voice.effect.source().toLocalFile()}")
+            voice.triggered = None  # A voice that failed to load never starts, so free it
+
+    def active_voices(self) -> int:
+        """Number of effects playing or about to start"""
+        return sum(voice.busy for voices in self.voices.values() for voice in voices)
+
+    def set_volume(self, volume: float):
+        """Set the effect volume (0.0-1.0)"""
+        self.volume = volume
+        for voices in self.voices.values():
+            for voice in voices:
+                voice.effect.setVolume(volume)
+
+    def stop(self):
+        """Silence every effect"""
+        for voices in self.voices.values():
+            for voice in voices:
+                voice.effect.stop()
+                voice.triggered = None
+
+    def latency_stats(self) -> dict:
+        """Trigger-to-playback latency in milliseconds, plus play/merge/drop counts"""
+        stats = {'played': self.played, 'merged': self.merged, 'dropped': self.dropped,
+                 'samples': len(self.latencies)}
+        if len(self.latencies) >= 2:
+            cuts = quantiles(self.latencies, n=100)
+            stats.update(p50_ms=cuts[49] * 1000, p95_ms=cuts[94] * 1000, max_ms=max(self.latencies) * 1000)
+        return stats
@@ -1,6 +1,22 @@
+from typing import Optional
 from PyQt6.QtCore import QObject, pyqtSignal, QTimer, QTime
-from models.game_model import GameModel
+from models.game_model import GameModel, GameSettings
+from models.game_journal import GameJournal
 from models.network_model import NetworkModel
+from models.async_network_model import AsyncNetworkModel
+from models.game_session import GameSession
+from models.result_writer import ResultWriter, shared_result_writer
+from models.latency import LatencyTracer
+from viewmodels.update_coalescer import UpdateCoalescer
+
+# Network engines selectable through PlayActionViewModel(network_engine=...)
+NETWORK_ENGINES = {
+    'thread': NetworkModel,
+    'asyncio': AsyncNetworkModel,
+}
+
+# Every game is journaled here so it can be recovered if the station crashes
+JOURNAL_PATH = 'data/current_game.journal'
 
 class PlayActionViewModel(QObject):
     """View model for the Play Action Screen"""
@@ -12,142 +28,192 @@ class PlayActionViewModel(QObject):
     game_ended = pyqtSignal()  # When the game ends
     warning_time = pyqtSignal()  # When warning time is reached
     
-    def __init__(self, red_team: list, green_team: list):
+    # Sounds whose events should reach the scoreboard without waiting for the next frame
+    URGENT_SOUNDS = {'base_hit'}
+    
+    def __init__(self, red_team: list, green_team: list, network_engine: str = 'thread',
+                 update_rate_hz: float = 20, journal_path: Optional[str] = JOURNAL_PATH,
+                 game_model: Optional[GameModel] = None, result_writer: Optional[ResultWriter] = None,
+                 port: int = 7501, tracer: Optional[LatencyTracer] = None, metrics=None):
+        """Create the view model
+        
+        Args:
+            network_engine: Key into NETWORK_ENGINES
+            update_rate_hz: Maximum score/log refreshes pushed to the view per second
+            journal_path: Where to journal the game (None disables journaling)
+            game_model: An already running game to continue, e.g. one recovered from its journal
+            result_writer: Where finished games are saved (default: the shared writer for the player database)
+            port: UDP port used for both receiving and transmitting
+            tracer: Records per-stage hit-to-screen latency of v2 events (None disables tracing)
+            metrics: MetricsRegistry the network, game, session and result writer report to (optional)
+        """
         super().__init__()
-        self.game_model = GameModel(red_team, green_team)
-        # Use the same port (7501) for both receiving and transmitting
-        self.network = NetworkModel(host='127.0.0.1', tx_port=7501, rx_port=7501)
+        self.game_model = game_model or GameModel(red_team, green_team, GameSettings(journal_path=journal_path))
+        # Use the same port (7501 by default) for both receiving and transmitting. Batch mode
+        # drains bursts in one wakeup so the UI thread sees one event per burst.
+        engine = NETWORK_ENGINES[network_engine]
+        self.network = engine(host='127.0.0.1', tx_port=port, rx_port=port, batch_mode=True)
+        self.tracer = tracer
+        self.network.tracer = tracer
+        
+        # Game rules and countdown live in the Qt-free session; this class only adapts it to Qt
+        self.session = GameSession(self.game_model, self.network)
+        self.session.on_tick = self._on_tick
+        self.session.on_warning = self.warning_time.emit
+        self.session.on_change = self._schedule_update
+        self.session.on_game_end = self._on_game_end
+        
+        # Finished games are written to the database off the UI thread
+        self.result_writer = result_writer or shared_result_writer()
+        self._result_saved = False
+        
+        self.metrics = metrics
+        if metrics is not None:
+            self.session.bind_metrics(metrics)
+            self.result_writer.bind_metrics(metrics)
         
         # Set up timer for game updates
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_game_state)
         self.timer.setInterval(1000)  # Update every second
         
+        # Score and log pushes are coalesced to at most one per frame
+        self.scoreboard = UpdateCoalescer(self._emit_game_update, parent=self)
+        self.scoreboard.set_frame_rate(update_rate_hz)
+        
         # Connect network signals
         self.network.data_received.connect(self.handle_network_data)
+        self.network.batch_received.connect(self.handle_network_batch)
         self.network.error_occurred.connect(self.handle_network_error)
         
         # Sound signals
         self.play_sound = None  # Will be connected by the view
     
+    @staticmethod
+    def has_unfinished_game(journal_path: str = JOURNAL_PATH) -> bool:
+        """Whether a previous game was interrupted before it ended"""
+        return GameJournal.is_unfinished(journal_path)
+    
+    @classmethod
+    def recover_unfinished_game(cls, journal_path: str = JOURNAL_PATH, **kwargs) -> Optional['PlayActionViewModel']:
+        """Rebuild an interrupted game from its journal
+        
+        Returns:
+            PlayActionViewModel: A view model continuing the game, or None if there is nothing to recover
+        """
+        if not GameJournal.is_unfinished(journal_path):
+            return None
+        try:
+            game_model = GameModel.from_journal(journal_path, resume=True)
+        except Exception as e:
+            print(f"Error recovering game from {journal_path}: {e}")
+            return None
+        return cls(game_model.red_team, game_model.green_team, journal_path=journal_path,
+                   game_model=game_model, **kwargs)
+    
     def start_game(self):
         """Start the game and network service"""
-        self.game_model.start_game()
-        self.network.start()
+        # A recovered game is resumed on its original clock
+        self.session.start()
         self.timer.start()
         
-        # Broadcast game start
-        self.network.broadcast_game_start()
-        
         # Initial update
         self.update_game_state()
+        self.scoreboard.flush_now()
     
     def end_game(self):
         """End the game and clean up"""
         self.timer.stop()
-        self.game_model.end_game()
-        self.network.broadcast_game_end()
+        self.session.end()
+        self._save_result()
+        self.scoreboard.flush_now()
         self.game_ended.emit()
     
     def update_game_state(self):
         """Update the game state and emit signals"""
         if not self.game_model.is_running:
             return
-            
-        # Update timer
-        remaining = self.game_model.get_remaining_time()
+        
+        self.session.tick()
+        
+        # Scores and log are only pushed when something changed (see UpdateCoalescer)
+        if self.game_model.is_running:
+            self.scoreboard.flush_if_dirty()
+    
+    def _on_tick(self, remaining: int):
+        """Show the remaining time"""
         minutes = remaining // 60
         seconds = remaining % 60
-        time_str = f"{minutes:02d}:{seconds:02d}"
-        self.update_timer.emit(time_str)
-        
-        # Check for warning time (last 30 seconds)
-        if remaining == 30:
-            self.warning_time.emit()
-            
-        # Check for game end
-        if remaining <= 0:
-            self.game_model.end_game()
-            self.game_ended.emit()
+        self.update_timer.emit(f"{minutes:02d}:{seconds:02d}")
+    
+    def _on_game_end(self):
+        """Show the final scores and tell the view the game is over"""
+        self._save_result()
+        self.scoreboard.flush_now()
+        self.game_ended.emit()
+    
+    def _save_result(self):
+        """Queue the finished game for the database (once)"""
+        if self._result_saved or self.game_model.is_running or self.game_model.start_time is None:
             return
-            
-        # Update scores and team states
-        self.update_scores.emit({
-            'red_score': self.game_model.red_score,
-            'green_score': self.game_model.green_score,
-            **self.game_model.get_team_states()
-        })
-        
-        # Update game log
-        self.update_log.emit(self.game_model.get_recent_events(5))
+        self._result_saved = True
+        try:
+            self.result_writer.record_game(self.game_model)
+        except Exception as e:
+            print(f"Error saving game result: {e}")
     
     def handle_network_data(self, data):
         """Handle incoming network data
         
         Args:
-            data: Either a string (legacy) or a dict with 'type' key
+            data: A NetworkEvent, a dict with 'type' key, or a string (legacy)
         """
+        tracer = self.tracer
+        if tracer is not None:
+            delivered = tracer.clock()
         try:
-            # Handle dictionary format from NetworkModel
-            if isinstance(data, dict):
-                data_type = data.get('type')
-                if data_type == 'player_hit':
-                    shooter_id = data.get('shooter_id')
-                    target_id = data.get('target_id')
-                    if shooter_id is not None and target_id is not None:
-                        success, message = self.game_model.register_hit(shooter_id, target_id)
-                        if success:
-                            self.update_scores.emit(self.game_model.get_scores())
-                            self.update_log.emit([message])
-                            if hasattr(self, 'play_sound'):
-                                self.play_sound.emit('hit')
-                elif data_type == 'base_hit':
-                    base_team = data.get('base_team')
-                    if base_team in ['red', 'green']:
-                        success, message = self.game_model.register_base_hit(base_team)
-                        if success:
-                            self.update_scores.emit(self.game_model.get_scores())
-                            self.update_log.emit([message])
-                            if hasattr(self, 'play_sound'):
-                                self.play_sound.emit('base_hit')
-                elif data_type == 'game_start' and not self.game_model.is_running:
-                    self.game_model.start_game()
-                elif data_type == 'game_end' and self.game_model.is_running:
-                    self.game_model.end_game()
-            # Handle legacy string format (for backward compatibility)
-            elif isinstance(data, str):
-                # Handle base hits (53 for red base, 43 for green base)
-                if data == "53":  # Red base hit
-                    success, message = self.game_model.register_base_hit('red')
-                    if success:
-                        self.update_scores.emit(self.game_model.get_scores())
-                        self.update_log.emit([message])
-                        if hasattr(self, 'play_sound'):
-                            self.play_sound.emit('base_hit')
-                elif data == "43":  # Green base hit
-                    success, message = self.game_model.register_base_hit('green')
-                    if success:
-                        self.update_scores.emit(self.game_model.get_scores())
-                        self.update_log.emit([message])
-                        if hasattr(self, 'play_sound'):
-                            self.play_sound.emit('base_hit')
-                # Handle hit events (format: "shooter_id:target_id")
-                elif ":" in data:
-                    shooter_id, target_id = map(int, data.split(":"))
-                    success, message = self.game_model.register_hit(shooter_id, target_id)
-                    if success:
-                        self.update_scores.emit(self.game_model.get_scores())
-                        self.update_log.emit([message])
-                        if hasattr(self, 'play_sound'):
-                            self.play_sound.emit('hit')
-                # Handle game control commands
-                elif data == "202" and not self.game_model.is_running:  # Start game
-                    self.game_model.start_game()
-                elif data == "221" and self.game_model.is_running:  # End game
-                    self.game_model.end_game()
-                    self.game_ended.emit()
+            sound = self.session.apply_event(data)
+            if tracer is not None:
+                tracer.applied((data,), delivered)
+            if sound:
+                self._schedule_update(sound in self.URGENT_SOUNDS)
+                self._play_sound(sound)
         except Exception as e:
-            print(f"Error handling network data: {e}")
+            self.session.report_error(e)
+    
+    def handle_network_batch(self, events: list):
+        """Apply a batch of network events and refresh the UI once"""
+        tracer = self.tracer
+        if tracer is not None:
+            delivered = tracer.clock()
+        sounds = self.session.apply_batch(events)
+        if tracer is not None:
+            tracer.applied(events, delivered)
+        if sounds:
+            self._schedule_update(not sounds.isdisjoint(self.URGENT_SOUNDS))
+            for sound in sounds:
+                self._play_sound(sound)
+    
+    def _schedule_update(self, urgent: bool = False):
+        """Mark the scoreboard dirty, flushing at once for urgent events"""
+        if urgent:
+            self.scoreboard.flush_now()
+        else:
+            self.scoreboard.mark_dirty()
+    
+    def _emit_game_update(self):
+        """Push the current scores and recent events to the view"""
+        self.update_scores.emit(self.game_model.get_scores())
+        self.update_log.emit(self.game_model.get_recent_events(5))
+    
+    def _play_sound(self, sound: str):
+        """Trigger a sound effect through whatever the view connected"""
+        if self.play_sound is None:
+            return
+        if hasattr(self.play_sound, 'emit'):
+            self.play_sound.emit(sound)
+        else:
+            self.play_sound(sound)
     
     def handle_network_error(self, message: str):
         """Handle network errors"""
@@ -156,7 +222,10 @@ class PlayActionViewModel(QObject):
     def cleanup(self):
         """Clean up resources"""
         self.timer.stop()
+        self.scoreboard.cancel()
+        self._save_result()
         self.network.stop()
+        self.game_model.close_journal()
         
     def get_winning_team(self) -> str:
         """Get the winning team or 'tie' if scores are equal"""
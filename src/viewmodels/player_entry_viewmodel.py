@@ -10,6 +10,7 @@ if str(src_path) not in sys.path:
 
 from src.models.player_model import Player
 from src.models.database_model import DatabaseModel
+from src.utils.metrics import configured_registry
 
 class PlayerEntryViewModel(QObject):
     MAX_PLAYERS_PER_TEAM = 15
@@ -18,9 +19,12 @@ class PlayerEntryViewModel(QObject):
     error_occurred = pyqtSignal(str)  # Error message
     start_game = pyqtSignal(list, list)  # Signal to start game with red_team and green_team
     
-    def __init__(self):
+    def __init__(self, database: DatabaseModel = None):
         super().__init__()
-        self.database = DatabaseModel()
+        self.database = database or DatabaseModel()
+        metrics = configured_registry()
+        if metrics is not None:
+            self.database.bind_metrics(metrics)
         self.red_team = []
         self.green_team = []
     
@@ -32,6 +36,49 @@ class PlayerEntryViewModel(QObject):
             self.error_occurred.emit(f"Database error: {str(e)}")
             return None
     
+    def get_players_by_ids(self, player_ids: list[int]) -> dict[int, str]:
+        """Look up a whole squad in one query. Returns {player_id: code_name} for known players (None on a database error)"""
+        try:
+            return self.database.get_players(player_ids)
+        except Exception as e:
+            self.error_occurred.emit(f"Database error: {str(e)}")
+            return None
+    
+    def add_squad(self, entries: list[tuple[int, int]], team: str) -> tuple[bool, str]:
+        """
+        Check in a squad of registered players with one database lookup
+        entries holds (player_id, equipment_id) pairs; either all of them are added or none
+        Returns (success: bool, message: str)
+        """
+        team = team.lower()
+        if team not in ['red', 'green']:
+            return False, "Invalid team. Must be 'Red' or 'Green'"
+        if not entries:
+            return False, "Squad is empty"
+        
+        roster = self.red_team if team == 'red' else self.green_team
+        if len(roster) + len(entries) > self.MAX_PLAYERS_PER_TEAM:
+            return False, f"{team.capitalize()} team has room for {self.MAX_PLAYERS_PER_TEAM - len(roster)} more players"
+        
+        player_ids = [player_id for player_id, _ in entries]
+        in_use = {p.player_id for p in self.red_team + self.green_team}
+        duplicates = sorted({player_id for player_id in player_ids if player_id in in_use or player_ids.count(player_id) > 1})
+        if duplicates:
+            return False, f"Player IDs already in use: {', '.join(map(str, duplicates))}"
+        
+        code_names = self.get_players_by_ids(player_ids)
+        if code_names is None:
+            return False, "Could not look up the squad"
+        unknown = [player_id for player_id in player_ids if player_id not in code_names]
+        if unknown:
+            return False, f"Unknown player IDs: {', '.join(map(str, unknown))}"
+        
+        for player_id, equipment_id in entries:
+            player = Player(player_id, code_names[player_id], equipment_id, team)
+            roster.append(player)
+            self.player_added.emit(player, team)
+        return True, f"{len(entries)} players added to {team.capitalize()} team"
+    
     def add_player(self, player_id: int, code_name: str, team: str, equipment_id: int) -> tuple[bool, str]:
         """
         Add a new player to the specified team
@@ -99,6 +146,12 @@ class PlayerEntryViewModel(QObject):
         """Handle start game button click"""
         can_start, message = self.can_start_game()
         if can_start:
+            # Remember who played so their code names are cached at the next startup
+            try:
+                self.database.mark_active(p.player_id for p in self.get_all_players() if p.player_id is not None)
+            except Exception as e:
+                print(f"Error recording active players: {e}")
+            
             # Emit signal to start game with current teams
             self.start_game.emit(self.red_team.copy(), self.green_team.copy())
         return can_start, message
@@ -10,16 +10,28 @@ if str(src_path) not in sys.path:
 
 from src.views.player_entry_screen import PlayerEntryScreen
 from src.viewmodels.player_entry_viewmodel import PlayerEntryViewModel
+from src.utils.metrics import configured_registry
 
 class SplashScreenViewModel(QObject):
     def __init__(self):
         super().__init__()
         self.player_entry_vm = None
         self.player_entry_screen = None
+        self.play_action_screen = None
     
     def splash_complete(self):
         # This method is called when the splash screen is done
         # Initialize and show the player entry screen
         self.player_entry_vm = PlayerEntryViewModel()
         self.player_entry_screen = PlayerEntryScreen(self.player_entry_vm)
+        
+        # Go straight back into a game that was interrupted by a crash
+        from src.viewmodels.play_action_viewmodel import PlayActionViewModel
+        recovered = PlayActionViewModel.recover_unfinished_game(metrics=configured_registry())
+        if recovered is not None:
+            from src.views.play_action_screen import PlayActionScreen
+            self.play_action_screen = PlayActionScreen(recovered)
+            self.play_action_screen.show()
+            return
+        
         self.player_entry_screen.show()
@@ -0,0 +1,111 @@
+from typing import Dict, List
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+from PyQt6.QtGui import QColor
+
+class TeamListModel(QAbstractListModel):
+    """List model over one team's player states, ordered by score (highest first)
+
+    update_players() diffs the incoming states against the current rows and
+    emits dataChanged only for rows whose score, base flag or highlight
+    changed, and beginMoveRows/endMoveRows for players whose rank changed,
+    so the view repaints only what moved.
+    """
+
+    PlayerIdRole = Qt.ItemDataRole.UserRole + 1
+    ScoreRole = Qt.ItemDataRole.UserRole + 2
+    BaseHitRole = Qt.ItemDataRole.UserRole + 3
+
+    def __init__(self, highlight: QColor = None, parent=None):
+        super().__init__(parent)
+        self.highlight = highlight
+        # Each row is [id, name, score, base_hit, recently_scored, roster_index]
+        self._rows: List[list] = []
+        self._row_of: Dict[int, int] = {}
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+
+        player_id, name, score, base_hit, recently_scored, _ = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            base_indicator = " (B)" if base_hit else ""
+            return f"{name}: {score}{base_indicator}"
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return self.highlight if recently_scored and self.highlight is not None else None
+        if role == self.PlayerIdRole:
+            return player_id
+        if role == self.ScoreRole:
+            return score
+        if role == self.BaseHitRole:
+            return base_hit
+        return None
+
+    def roleNames(self):
+        names = super().roleNames()
+        names[self.PlayerIdRole] = b'playerId'
+        names[self.ScoreRole] = b'score'
+        names[self.BaseHitRole] = b'baseHit'
+        return names
+
+    def player_ids(self) -> List[int]:
+        """Player IDs in display order"""
+        return [row[0] for row in self._rows]
+
+    def update_players(self, players: List[dict]):
+        """Apply a list of player state dicts (as produced by GameModel.get_team_states)
+
+        The incoming dicts are not modified.
+        """
+        if len(players) != len(self._rows) or any(p['id'] not in self._row_of for p in players):
+            self._reset(players)
+            return
+
+        # Update values in place and notify only the rows that changed
+        for player in players:
+            row = self._row_of[player['id']]
+            record = self._rows[row]
+            state = (player['name'], player['score'], bool(player.get('base_hit')),
+                     bool(player.get('recently_scored')))
+            if (record[1], record[2], record[3], record[4]) != state:
+                record[1], record[2], record[3], record[4] = state
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+
+        self._restore_order()
+
+    def _reset(self, players: List[dict]):
+        """Rebuild every row; used when the roster itself changes"""
+        self.beginResetModel()
+        self._rows = [
+            [p['id'], p['name'], p['score'], bool(p.get('base_hit')), bool(p.get('recently_scored')), i]
+            for i, p in enumerate(players)
+        ]
+        self._rows.sort(key=self._sort_key)
+        self._row_of = {row[0]: i for i, row in enumerate(self._rows)}
+        self.endResetModel()
+
+    @staticmethod
+    def _sort_key(row: list):
+        # Highest score first; ties keep roster order
+        return (-row[2], row[5])
+
+    def _restore_order(self):
+        """Move rows whose rank changed into place, one beginMoveRows per player"""
+        target = sorted(self._rows, key=self._sort_key)
+        for position, wanted in enumerate(target):
+            current = self._row_of[wanted[0]]
+            if current == position:
+                continue
+            # current > position: everything before `position` is already settled
+            self.beginMoveRows(QModelIndex(), current, current, QModelIndex(), position)
+            self._rows.insert(position, self._rows.pop(current))
+            self.endMoveRows()
+            self._reindex(position, current + 1)
+
+    def _reindex(self, start: int, stop: int):
+        """Refresh the id -> row map for rows[start:stop]"""
+        for row in range(start, stop):
+            self._row_of[self._rows[row][0]] = row
@@ -0,0 +1,61 @@
+from typing import Callable
+from PyQt6.QtCore import QObject, QTimer
+
+class UpdateCoalescer(QObject):
+    """Coalesces UI refreshes to at most one per frame interval
+
+    Callers mark the state dirty on every change; the flush callback runs once
+    at the end of the current frame no matter how many changes arrived. Urgent
+    changes can bypass the frame with flush_now().
+    """
+
+    def __init__(self, flush: Callable[[], None], frame_interval_ms: int = 50, parent: QObject = None):
+        super().__init__(parent)
+        self._flush = flush
+        self._dirty = False
+
+        # Single-shot so an idle game costs no timer wakeups
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.setInterval(frame_interval_ms)
+        self._frame_timer.timeout.connect(self._on_frame)
+
+    @property
+    def dirty(self) -> bool:
+        """Whether a change is waiting to be flushed"""
+        return self._dirty
+
+    @property
+    def frame_interval_ms(self) -> int:
+        return self._frame_timer.interval()
+
+    def set_frame_rate(self, hz: float):
+        """Set the maximum number of flushes per second"""
+        self._frame_timer.setInterval(max(1, int(1000 / hz)))
+
+    def mark_dirty(self):
+        """Record a change; it will be flushed at the end of the current frame"""
+        self._dirty = True
+        if not self._frame_timer.isActive():
+            self._frame_timer.start()
+
+    def flush_now(self):
+        """Flush immediately, cancelling the pending frame"""
+        self._frame_timer.stop()
+        self._dirty = False
+        self._flush()
+
+    def flush_if_dirty(self):
+        """Flush immediately if there is a pending change"""
+        if self._dirty:
+            self.flush_now()
+
+    def cancel(self):
+        """Drop any pending change without flushing"""
+        self._frame_timer.stop()
+        self._dirty = False
+
+    def _on_frame(self):
+        if self._dirty:
+            self._dirty = False
+            self._flush()
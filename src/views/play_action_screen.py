@@ -1,16 +1,20 @@
+import time
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-    QPushButton, QListWidget, QListWidgetItem, QFrame, QMessageBox, QSlider, QGroupBox
+    QPushButton, QListWidget, QListView, QFrame, QMessageBox, QSlider, QGroupBox
 )
 from PyQt6.QtCore import Qt, pyqtSlot, QTimer, QTime
 from PyQt6.QtGui import QFont, QColor, QPalette
-from src.utils.audio import AudioPlayer
+from src.utils.audio import create_audio_player
 from viewmodels.play_action_viewmodel import PlayActionViewModel
+from viewmodels.team_list_model import TeamListModel
 
 class PlayActionScreen(QMainWindow):
-    def __init__(self, viewmodel: PlayActionViewModel):
+    def __init__(self, viewmodel: PlayActionViewModel, audio_backend: str = 'media'):
         super().__init__()
         self.viewmodel = viewmodel
+        self.audio_backend = audio_backend
+        self.render_seconds = None  # Histogram of scoreboard updates when the view model has metrics
         self.setup_ui()
         self.connect_signals()
         
@@ -92,7 +96,10 @@ class PlayActionScreen(QMainWindow):
         red_team_header.setAlignment(Qt.AlignmentFlag.AlignCenter)
         red_team_header.setStyleSheet("font-weight: bold; font-size: 18px; color: red;")
         
-        self.red_team_list = QListWidget()
+        self.red_team_model = TeamListModel(QColor(255, 230, 230), self)  # Light red highlight
+        self.red_team_list = QListView()
+        self.red_team_list.setUniformItemSizes(True)
+        self.red_team_list.setModel(self.red_team_model)
         
         red_team_layout.addWidget(red_team_header)
         red_team_layout.addWidget(self.red_team_list)
@@ -106,7 +113,10 @@ class PlayActionScreen(QMainWindow):
         green_team_header.setAlignment(Qt.AlignmentFlag.AlignCenter)
         green_team_header.setStyleSheet("font-weight: bold; font-size: 18px; color: green;")
         
-        self.green_team_list = QListWidget()
+        self.green_team_model = TeamListModel(QColor(230, 255, 230), self)  # Light green highlight
+        self.green_team_list = QListView()
+        self.green_team_list.setUniformItemSizes(True)
+        self.green_team_list.setModel(self.green_team_model)
         
         green_team_layout.addWidget(green_team_header)
         green_team_layout.addWidget(self.green_team_list)
@@ -136,17 +146,17 @@ class PlayActionScreen(QMainWindow):
         
         # Set styles
         self.setStyleSheet("""
-            QListWidget {
+            QListWidget, QListView {
                 font-size: 14px;
                 border: 1px solid #ccc;
                 border-radius: 5px;
                 padding: 5px;
             }
-            QListWidget::item {
+            QListWidget::item, QListView::item {
                 padding: 5px;
                 border-bottom: 1px solid #eee;
             }
-            QListWidget::item:last-child {
+            QListWidget::item:last-child, QListView::item:last-child {
                 border-bottom: none;
             }
             QFrame {
@@ -157,9 +167,14 @@ class PlayActionScreen(QMainWindow):
         """)
         
         # Initialize audio player
-        self.audio_player = AudioPlayer()
+        self.audio_player = create_audio_player(self.audio_backend)
         self.audio_player.music_ended.connect(self.on_music_ended)
         
+        metrics = self.viewmodel.metrics
+        if metrics is not None:
+            self.audio_player.bind_metrics(metrics)
+            self.render_seconds = metrics.histogram('render_seconds', 'Time to update the scoreboard')
+        
         # Connect viewmodel's play_sound signal
         self.viewmodel.play_sound = self.play_sound_effect
         
@@ -238,34 +253,21 @@ class PlayActionScreen(QMainWindow):
     @pyqtSlot(dict)
     def update_scores(self, scores):
         """Update the score displays"""
+        render_seconds = self.render_seconds
+        if render_seconds is not None:
+            begin = time.perf_counter()
         self.red_score_label.setText(f"Red: {scores['red_score']}")
         self.green_score_label.setText(f"Green: {scores['green_score']}")
         
-        # Update red team list
-        self.red_team_list.clear()
-        for player in scores.get('red_players', []):
-            base_indicator = " (B)" if player.get('base_hit') else ""
-            item = QListWidgetItem(f"{player['name']}: {player['score']}{base_indicator}")
-            
-            # Highlight the player if they recently scored
-            if player.get('recently_scored'):
-                item.setBackground(QColor(255, 230, 230))  # Light red
-                player['recently_scored'] = False
-                
-            self.red_team_list.addItem(item)
-        
-        # Update green team list
-        self.green_team_list.clear()
-        for player in scores.get('green_players', []):
-            base_indicator = " (B)" if player.get('base_hit') else ""
-            item = QListWidgetItem(f"{player['name']}: {player['score']}{base_indicator}")
-            
-            # Highlight the player if they recently scored
-            if player.get('recently_scored'):
-                item.setBackground(QColor(230, 255, 230))  # Light green
-                player['recently_scored'] = False
-                
-            self.green_team_list.addItem(item)
+        # Team models repaint only the rows that changed or moved
+        self.red_team_model.update_players(scores.get('red_players', []))
+        self.green_team_model.update_players(scores.get('green_players', []))
+        
+        # Everything applied so far is now on screen
+        if self.viewmodel.tracer is not None:
+            self.viewmodel.tracer.rendered()
+        if render_seconds is not None:
+            render_seconds.observe(time.perf_counter() - begin)
     
     @pyqtSlot(list)
     def update_log(self, log_entries):
@@ -1,7 +1,7 @@
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QLineEdit, QPushButton, QMessageBox, QGroupBox, QFormLayout,
-    QTabWidget, QListWidget, QListWidgetItem, QFrame, QComboBox
+    QTabWidget, QListWidget, QListWidgetItem, QFrame, QComboBox, QInputDialog
 )
 from PyQt6.QtCore import Qt, pyqtSlot
 from PyQt6.QtGui import QIntValidator
@@ -55,6 +55,10 @@ class PlayerEntryScreen(QMainWindow):
         self.add_button = QPushButton("Add Player")
         form_layout.addRow(self.add_button)
         
+        # Add a squad of registered players at once
+        self.add_squad_button = QPushButton("Add Squad")
+        form_layout.addRow(self.add_squad_button)
+        
         # Clear all button
         self.clear_button = QPushButton("Clear All Players (F12)")
         form_layout.addRow(self.clear_button)
@@ -100,6 +104,7 @@ class PlayerEntryScreen(QMainWindow):
     def connect_signals(self):
         """Connect UI signals to viewmodel and slots"""
         self.add_button.clicked.connect(self.add_player)
+        self.add_squad_button.clicked.connect(self.add_squad)
         self.clear_button.clicked.connect(self.clear_players)
         self.start_button.clicked.connect(self.start_game)
         self.viewmodel.player_added.connect(self.on_player_added)
@@ -127,6 +132,29 @@ class PlayerEntryScreen(QMainWindow):
         except ValueError:
             QMessageBox.warning(self, "Error", "Please enter valid numbers for ID and Equipment ID")
     
+    def add_squad(self):
+        """Handle the add squad button click: one "player ID, equipment ID" pair per line"""
+        team = self.team_combo.currentText()
+        text, accepted = QInputDialog.getMultiLineText(
+            self, "Add Squad", f"Registered players for the {team} team, one \"player ID, equipment ID\" per line:"
+        )
+        if not accepted:
+            return
+        try:
+            entries = []
+            for line in text.splitlines():
+                if line.strip():
+                    player_id, equipment_id = line.replace(',', ' ').split()
+                    entries.append((int(player_id), int(equipment_id)))
+        except ValueError:
+            QMessageBox.warning(self, "Error", "Each line needs a player ID and an equipment ID")
+            return
+        
+        success, message = self.viewmodel.add_squad(entries, team)
+        if success:
+            self.update_team_lists()
+        QMessageBox.information(self, "Success" if success else "Error", message)
+    
     def clear_form(self):
         """Clear the input form"""
         self.player_id_edit.clear()
@@ -184,9 +212,10 @@ class PlayerEntryScreen(QMainWindow):
         """Handle game start signal"""
         from src.views.play_action_screen import PlayActionScreen
         from src.viewmodels.play_action_viewmodel import PlayActionViewModel
+        from src.utils.metrics import configured_registry
         
         # Create and show the play action screen
-        play_action_vm = PlayActionViewModel(red_team, green_team)
+        play_action_vm = PlayActionViewModel(red_team, green_team, metrics=configured_registry())
         self.play_action_screen = PlayActionScreen(play_action_vm)
         self.play_action_screen.show()
         
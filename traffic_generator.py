@@ -3,10 +3,19 @@ import time
 import random
 import threading
 import argparse
-from dataclasses import dataclass
-from typing import List, Tuple
+import json
+import math
+import multiprocessing
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 import sys
 
+from src.models.protocol import (
+    CODE_GAME_START, CODE_GAME_END, CODE_RED_BASE, CODE_GREEN_BASE, OP_PLAYER_HIT,
+    DEVICE_GENERATOR, PROTOCOL_V1, PROTOCOL_V2, encode_v1, pack_v2
+)
+
 @dataclass
 class Player:
     id: int
@@ -14,12 +23,23 @@ class Player:
     team: str
     equipment_id: int
 
+def make_players(count: int, teams: Tuple[str, ...] = ('red', 'green'), first_equipment_id: int = 1) -> List[Player]:
+    """Synthetic players dealt round-robin onto the teams, with consecutive equipment IDs"""
+    players = []
+    for i in range(count):
+        team = teams[i % len(teams)]
+        players.append(Player(i + 1, f"{team.capitalize()}-{i // len(teams) + 1}", team, first_equipment_id + i))
+    return players
+
 class TrafficGenerator:
-    def __init__(self, host: str = '127.0.0.1', port: int = 7501):
+    def __init__(self, host: str = '127.0.0.1', port: int = 7501, protocol: str = PROTOCOL_V1,
+                 players: Optional[List[Player]] = None):
         self.host = host
         self.port = port
+        self.protocol = protocol
         self.running = False
-        self.players = [
+        self.sequence = {}  # Next v2 sequence number per sending device
+        self.players = players if players is not None else [
             Player(1, "Red-1", "red", 1),
             Player(2, "Red-2", "red", 2),
             Player(3, "Green-1", "green", 3),
@@ -28,20 +48,29 @@ class TrafficGenerator:
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.sock.settimeout(1)
     
+    def encode(self, opcode: int, shooter: int = 0, target: int = 0) -> bytes:
+        """Encode one event in the selected wire format"""
+        if self.protocol == PROTOCOL_V2:
+            # The shooter field doubles as the device ID for sequence numbering
+            seq = self.sequence.get(shooter, 0)
+            self.sequence[shooter] = seq + 1
+            return pack_v2(opcode, shooter, target, seq)
+        return encode_v1(opcode, shooter, target)
+    
     def send_hit(self, shooter_id: int, target_id: int):
         """Send a hit message"""
         message = f"{shooter_id}:{target_id}"
         try:
-            self.sock.sendto(message.encode('utf-8'), (self.host, self.port))
+            self.sock.sendto(self.encode(OP_PLAYER_HIT, shooter_id, target_id), (self.host, self.port))
             print(f"Sent: {message}")
         except Exception as e:
             print(f"Error sending hit: {e}")
     
-    def send_base_hit(self, team: str):
+    def send_base_hit(self, team: str, player_id: int = 0):
         """Send a base hit message"""
-        code = "53" if team.lower() == 'red' else "43"
+        code = CODE_RED_BASE if team.lower() == 'red' else CODE_GREEN_BASE
         try:
-            self.sock.sendto(code.encode('utf-8'), (self.host, self.port))
+            self.sock.sendto(self.encode(code, player_id), (self.host, self.port))
             print(f"Sent base hit: {code} ({'Red' if team.lower() == 'red' else 'Green'})")
         except Exception as e:
             print(f"Error sending base hit: {e}")
@@ -49,17 +78,17 @@ class TrafficGenerator:
     def send_game_control(self, command: str):
         """Send game control commands"""
         commands = {
-            'start': '202',
-            'end': '221'
+            'start': CODE_GAME_START,
+            'end': CODE_GAME_END
         }
         if command in commands:
             try:
-                self.sock.sendto(commands[command].encode('utf-8'), (self.host, self.port))
+                self.sock.sendto(self.encode(commands[command], DEVICE_GENERATOR), (self.host, self.port))
                 print(f"Sent command: {command.upper()} ({commands[command]})")
                 # For game end, send it 3 times as per protocol
                 if command == 'end':
                     for _ in range(2):
-                        self.sock.sendto(commands[command].encode('utf-8'), (self.host, self.port))
+                        self.sock.sendto(self.encode(commands[command], DEVICE_GENERATOR), (self.host, self.port))
             except Exception as e:
                 print(f"Error sending command: {e}")
     
@@ -74,7 +103,10 @@ class TrafficGenerator:
     def random_base_hit(self):
         """Generate a random base hit"""
         team = random.choice(['red', 'green'])
-        self.send_base_hit(team)
+        # Bases are scored by a player from the opposing team
+        scorers = [p for p in self.players if p.team != team]
+        player_id = random.choice(scorers).equipment_id if scorers else 0
+        self.send_base_hit(team, player_id)
     
     def interactive_mode(self):
         """Run in interactive mode"""
@@ -159,16 +191,292 @@ class TrafficGenerator:
         except Exception as e:
             print(f"Error: {e}")
 
+LOAD_PROFILES = ('constant', 'ramp', 'burst')
+
+@dataclass
+class LoadConfig:
+    """What a load run sends, how fast and from how many workers"""
+    rate: float = 1000.0        # Target packets per second over all workers
+    duration: float = 10.0      # Seconds
+    players: int = 20
+    teams: Tuple[str, ...] = ('red', 'green')
+    first_equipment_id: int = 1
+    mix: Tuple[float, float, float] = (0.98, 0.02, 0.0)  # Relative weights of hits, base hits and control codes
+    profile: str = 'constant'
+    ramp_from: float = 0.0      # ramp: starting rate as a fraction of `rate`
+    burst_factor: float = 5.0   # burst: rate multiplier during a burst
+    burst_every: float = 2.0    # burst: seconds from one burst to the next
+    burst_length: float = 0.2   # burst: seconds each burst lasts
+    seed: int = 1
+    workers: int = 1
+    processes: bool = False     # Run workers as processes instead of threads
+    host: str = '127.0.0.1'
+    port: int = 7501
+    protocol: str = PROTOCOL_V2
+    # v2: next sequence number per device, carried over from the previous stage so the
+    # receiver does not mistake a new stage for a restarted device
+    sequence: Dict[int, int] = field(default_factory=dict)
+
+    def packets_by(self, elapsed: float) -> float:
+        """Packets the profile asks for (over all workers) in the first `elapsed` seconds"""
+        rate = self.rate
+        if self.profile == 'ramp':
+            ramp_time = min(elapsed, self.duration)
+            ramped = rate * (self.ramp_from * ramp_time + (1.0 - self.ramp_from) * ramp_time ** 2 / (2 * self.duration))
+            return ramped + rate * max(0.0, elapsed - self.duration)
+        if self.profile == 'burst':
+            periods, into = divmod(elapsed, self.burst_every)
+            burst_time = periods * self.burst_length + min(into, self.burst_length)
+            return rate * (elapsed + burst_time * (self.burst_factor - 1))
+        return rate * elapsed
+
+    def time_of(self, count: float) -> float:
+        """Seconds into the run at which the profile has asked for `count` packets"""
+        rate = self.rate
+        if self.profile == 'ramp':
+            ramped = self.packets_by(self.duration)
+            if count > ramped:
+                return self.duration + (count - ramped) / rate
+            a = rate * (1.0 - self.ramp_from) / (2 * self.duration)
+            b = rate * self.ramp_from
+            if a == 0:
+                return count / b
+            return (-b + math.sqrt(b * b + 4 * a * count)) / (2 * a)
+        if self.profile == 'burst':
+            burst_packets = rate * self.burst_factor * self.burst_length
+            periods, into = divmod(count, burst_packets + rate * (self.burst_every - self.burst_length))
+            if into < burst_packets:
+                return periods * self.burst_every + into / (rate * self.burst_factor)
+            return periods * self.burst_every + self.burst_length + (into - burst_packets) / rate
+        return count / rate
+
+@dataclass
+class LoadResult:
+    """What one worker sent and how far behind schedule each send was"""
+    sent: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+    hits: int = 0
+    base_hits: int = 0
+    controls: int = 0
+    lateness: List[float] = field(default_factory=list)  # Seconds behind schedule (sampled)
+    sequence: Dict[int, int] = field(default_factory=dict)  # Next v2 sequence number of this worker's devices
+
+LATENESS_SAMPLES = 50000  # Per worker, to bound memory on long runs
+SPIN_THRESHOLD = 0.001    # Sleep until this close to a send, then spin
+
+def _wait_until(deadline: float):
+    remaining = deadline - time.perf_counter()
+    if remaining > SPIN_THRESHOLD:
+        time.sleep(remaining - SPIN_THRESHOLD)
+    while time.perf_counter() < deadline:
+        time.sleep(0)  # Yield so other sender threads get the GIL
+
+def run_load_worker(config: LoadConfig, index: int) -> LoadResult:
+    """Send one worker's share of the load, paced against an absolute schedule
+
+    Each worker owns every `workers`-th player as its shooters, so v2
+    sequence numbers of a device never come from two workers. Only worker 0
+    sends control codes (device DEVICE_GENERATOR).
+    """
+    players = make_players(config.players, config.teams, config.first_equipment_id)
+    shooters = players[index::config.workers]
+    generator = TrafficGenerator(config.host, config.port, config.protocol, players)
+    generator.sequence = dict(config.sequence)
+    sock, address, encode = generator.sock, (generator.host, generator.port), generator.encode
+    rng = random.Random(config.seed * 1000003 + index)
+    hit_weight, base_weight, control_weight = config.mix
+    if index != 0:
+        control_weight = 0.0
+    total = hit_weight + base_weight + control_weight
+    hit_below = hit_weight / total
+    base_below = (hit_weight + base_weight) / total
+
+    result = LoadResult()
+    lateness = array('d')
+    start = time.perf_counter()
+    end = start + config.duration
+    # Workers interleave: this one sends packets index, index + workers, index + 2 * workers, ...
+    count = index
+    due = start + config.time_of(count)
+    while due < end:
+        _wait_until(due)
+        now = time.perf_counter()
+        if now >= end:
+            break  # Too far behind schedule to catch up before the run ends
+        lateness.append(now - due)
+
+        shooter = rng.choice(shooters)
+        pick = rng.random()
+        if pick < hit_below:
+            target = rng.choice(players)
+            while target is shooter:
+                target = rng.choice(players)
+            packet = encode(OP_PLAYER_HIT, shooter.equipment_id, target.equipment_id)
+            result.hits += 1
+        elif pick < base_below:
+            # A player scores the other team's base
+            packet = encode(CODE_GREEN_BASE if shooter.team == 'red' else CODE_RED_BASE, shooter.equipment_id)
+            result.base_hits += 1
+        else:
+            # Only start codes: they are ignored while a game runs, an end code would stop it
+            packet = encode(CODE_GAME_START, DEVICE_GENERATOR)
+            result.controls += 1
+        try:
+            sock.sendto(packet, address)
+            result.sent += 1
+        except OSError:
+            result.errors += 1
+
+        count += config.workers
+        due = start + config.time_of(count)
+    result.elapsed = time.perf_counter() - start
+    result.sequence = generator.sequence
+    sock.close()
+
+    stride = max(1, len(lateness) // LATENESS_SAMPLES)
+    result.lateness = lateness[::stride].tolist()
+    return result
+
+def _thread_worker(config: LoadConfig, index: int, results: List[LoadResult]):
+    results[index] = run_load_worker(config, index)
+
+def run_load(config: LoadConfig) -> dict:
+    """Run the load on all workers and summarize what was achieved"""
+    if config.rate <= 0 or config.duration <= 0:
+        raise ValueError("Rate and duration must be positive")
+    if config.players < 2:
+        raise ValueError("Load mode needs at least 2 players")
+    if not 1 <= config.workers <= config.players:
+        raise ValueError("Need between 1 worker and one worker per player")
+
+    begin = time.perf_counter()
+    if config.processes:
+        # Spawned rather than forked: the caller may be running Qt or other threads
+        with multiprocessing.get_context('spawn').Pool(config.workers) as pool:
+            results = pool.starmap(run_load_worker, [(config, i) for i in range(config.workers)])
+    else:
+        results = [None] * config.workers
+        threads = [threading.Thread(target=_thread_worker, args=(config, i, results), name=f'load-{i}')
+                   for i in range(config.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    elapsed = max(max(r.elapsed for r in results), 1e-9) if results else time.perf_counter() - begin
+
+    lateness = sorted(value for r in results for value in r.lateness)
+
+    def percentile(fraction):
+        return lateness[min(len(lateness) - 1, int(fraction * len(lateness)))] * 1e6 if lateness else 0.0
+
+    sent = sum(r.sent for r in results)
+    scheduled = round(config.packets_by(config.duration))
+    # Workers own disjoint devices, so their sequence maps merge without conflicts
+    sequence = dict(config.sequence)
+    for r in results:
+        sequence.update(r.sequence)
+    return {
+        'profile': config.profile, 'target_rate': config.rate, 'duration': config.duration,
+        'workers': config.workers, 'processes': config.processes, 'players': config.players,
+        'scheduled': scheduled, 'sent': sent, 'errors': sum(r.errors for r in results),
+        'achieved_rate': sent / elapsed, 'delivered_fraction': sent / scheduled if scheduled else 0.0,
+        'hits': sum(r.hits for r in results), 'base_hits': sum(r.base_hits for r in results),
+        'controls': sum(r.controls for r in results),
+        'lateness_us_p50': percentile(0.50), 'lateness_us_p99': percentile(0.99),
+        'lateness_us_max': lateness[-1] * 1e6 if lateness else 0.0,
+        'next_sequence': sequence,
+    }
+
+def print_load_report(reports: List[dict]):
+    """One line per load stage; lateness is how far sends fell behind their schedule"""
+    print(f"\n{'profile':>8} {'target/s':>10} {'achieved/s':>11} {'sent':>9} {'of sched':>9} {'errors':>7} "
+          f"{'late p50 us':>12} {'late p99 us':>12} {'late max us':>12}")
+    for r in reports:
+        print(f"{r['profile']:>8} {r['target_rate']:>10.0f} {r['achieved_rate']:>11.0f} {r['sent']:>9} "
+              f"{r['delivered_fraction']:>8.1%} {r['errors']:>7} {r['lateness_us_p50']:>12.0f} "
+              f"{r['lateness_us_p99']:>12.0f} {r['lateness_us_max']:>12.0f}")
+
+def load_mode(args) -> int:
+    """Run one load stage per requested rate and report each"""
+    mix = tuple(float(weight) for weight in args.mix.split(','))
+    if len(mix) != 3 or min(mix) < 0 or sum(mix) <= 0:
+        print("--mix takes three non-negative weights: hits,base_hits,control")
+        return 1
+    teams = tuple(team.strip().lower() for team in args.teams.split(','))
+
+    if args.roster_out:
+        players = make_players(args.players, teams, args.first_equipment_id)
+        with open(args.roster_out, 'w', encoding='utf-8') as f:
+            json.dump([{'team': p.team, 'equipment_id': p.equipment_id, 'code_name': p.name, 'player_id': p.id}
+                       for p in players], f, indent=2)
+        print(f"Wrote roster of {len(players)} players to {args.roster_out}")
+
+    reports = []
+    sequence = {}
+    for stage, rate in enumerate(args.rate):
+        if stage and args.pause > 0:
+            time.sleep(args.pause)
+        config = LoadConfig(rate=rate, duration=args.duration, players=args.players, teams=teams,
+                            first_equipment_id=args.first_equipment_id, mix=mix, profile=args.profile,
+                            ramp_from=args.ramp_from, burst_factor=args.burst_factor,
+                            burst_every=args.burst_every, burst_length=args.burst_length,
+                            seed=args.seed + stage, workers=args.workers, processes=args.processes,
+                            host=args.host, port=args.port, protocol=args.protocol, sequence=sequence)
+        print(f"Sending {config.profile} load at {rate:.0f} pkt/s for {config.duration:g} s "
+              f"({config.workers} {'process' if config.processes else 'thread'} worker(s), "
+              f"{config.players} players, {config.protocol}) to {config.host}:{config.port}", flush=True)
+        try:
+            report = run_load(config)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+        sequence = report.pop('next_sequence')
+        reports.append(report)
+    print_load_report(reports)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, indent=2)
+    return 0
+
 def main():
     parser = argparse.ArgumentParser(description='Laser Tag Traffic Generator')
     parser.add_argument('--host', default='127.0.0.1', help='Target host (default: 127.0.0.1)')
     parser.add_argument('--port', type=int, default=7501, help='Target port (default: 7501)')
-    
+    parser.add_argument('--protocol', choices=[PROTOCOL_V1, PROTOCOL_V2], default=PROTOCOL_V1,
+                        help='Wire format: v1 text or v2 binary (default: v1)')
+
+    load = parser.add_argument_group('load mode', 'Send a paced stream of random events instead of the menu')
+    load.add_argument('--load', action='store_true', help='Run non-interactively and report the achieved rate')
+    load.add_argument('--rate', type=float, nargs='+', default=[1000.0],
+                      help='Target packets per second; several rates run one after another (default: 1000)')
+    load.add_argument('--duration', type=float, default=10.0, help='Seconds per rate (default: 10)')
+    load.add_argument('--pause', type=float, default=2.0, help='Seconds between rates (default: 2)')
+    load.add_argument('--players', type=int, default=20, help='Synthetic players (default: 20)')
+    load.add_argument('--teams', default='red,green', help='Teams the players are dealt onto (default: red,green)')
+    load.add_argument('--first-equipment-id', type=int, default=1, help='Equipment ID of the first player (default: 1)')
+    load.add_argument('--mix', default='0.98,0.02,0',
+                      help='Weights of hits,base hits,control codes (default: 0.98,0.02,0)')
+    load.add_argument('--profile', choices=LOAD_PROFILES, default='constant', help='Rate over time (default: constant)')
+    load.add_argument('--ramp-from', type=float, default=0.0,
+                      help='ramp: starting rate as a fraction of --rate (default: 0)')
+    load.add_argument('--burst-factor', type=float, default=5.0, help='burst: rate multiplier (default: 5)')
+    load.add_argument('--burst-every', type=float, default=2.0, help='burst: seconds between bursts (default: 2)')
+    load.add_argument('--burst-length', type=float, default=0.2, help='burst: seconds per burst (default: 0.2)')
+    load.add_argument('--seed', type=int, default=1, help='Random seed (default: 1)')
+    load.add_argument('--workers', type=int, default=1, help='Sending threads or processes (default: 1)')
+    load.add_argument('--processes', action='store_true', help='Run workers as processes instead of threads')
+    load.add_argument('--roster-out', help='Write the synthetic players as a roster JSON for the server')
+    load.add_argument('--report', help='Write the per-rate results as JSON')
+
     args = parser.parse_args()
-    
+
+    if args.load:
+        return load_mode(args)
+
     try:
-        generator = TrafficGenerator(host=args.host, port=args.port)
-        print(f"Traffic Generator started. Sending to {args.host}:{args.port}")
+        generator = TrafficGenerator(host=args.host, port=args.port, protocol=args.protocol)
+        print(f"Traffic Generator started. Sending {args.protocol} to {args.host}:{args.port}")
         generator.interactive_mode()
     except Exception as e:
         print(f"Error: {e}")